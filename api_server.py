@@ -0,0 +1,425 @@
+"""
+RoboTest local HTTP API - the generators as a service for CI and test-management tools.
+
+Usage:
+    python api_server.py serve --port 8600 --workers 8
+    python api_server.py bench --endpoint bug-report --requests 500 --concurrency 32
+
+Endpoints (POST, JSON body):
+    /api/test-cases   {"requirements", "num_cases", "priority", "severity", "language", "learned_rules"}
+    /api/automation   {"framework": "selenium"|"rest_assured", "test_cases": [...], "combined", "options": {...}}
+    /api/unit-specs   {"test_cases": [...]}
+    /api/test-plan    {"requirements", "timeline", "testers": [...], "custom_instructions"}
+    /api/bug-report   {"description", "env", "browser", "language", "screenshots": [{"data": base64, "mime_type"}]}
+    GET /api/health   worker, queue and cache statistics
+
+Responses are {"results": {key: value}, "errors": {key: message}, ...}. With ?stream=1
+the response is NDJSON: one {"event": "result"|"error", "key", ...} line per result as
+it completes, then {"event": "done"}. Multi-case requests run one AI call per test case;
+separate automation also returns the project skeleton once, under "framework".
+
+Generation runs on a bounded worker pool; requests beyond --queue-size waiting units
+get 503. Results are cached in memory by endpoint + input + provider (?cache=0 skips
+the lookup). Uses the same provider layer as the app and CLI: --provider replay
+answers without network calls (see ai_providers.call_replay) to measure requests/sec.
+The service binds to 127.0.0.1; set ROBOTEST_API_TOKEN to require a bearer token.
+"""
+import os
+import sys
+import json
+import base64
+import time
+import asyncio
+import hashlib
+import argparse
+import threading
+from functools import partial
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import tornado.web
+import tornado.ioloop
+from dotenv import load_dotenv
+
+import generation
+from ai_providers import PROVIDERS, call_ai, supports_vision
+from scaffold import scaffold_files
+
+DEFAULT_PORT = 8600
+DEFAULT_WORKERS = 8
+DEFAULT_QUEUE_SIZE = 256
+DEFAULT_CACHE_SIZE = 2048
+
+
+class QueueFull(Exception):
+    """More units are waiting for a worker than the queue allows"""
+
+
+class BadRequest(Exception):
+    """Invalid request payload"""
+
+
+def _require(payload, field, kind=str):
+    value = payload.get(field)
+    if not value or not isinstance(value, kind):
+        raise BadRequest(f"'{field}' is required")
+    return value
+
+
+def _test_cases(payload):
+    test_cases = _require(payload, "test_cases", list)
+    for tc in test_cases:
+        if not isinstance(tc, dict) or not tc.get("id") or not tc.get("title"):
+            raise BadRequest("every test case needs 'id' and 'title'")
+        tc.setdefault("test_steps", [])
+        tc.setdefault("expected_results", [])
+    return test_cases
+
+
+# --- Endpoints: payload -> [(result key, unit input, fn(ai, unit input))] ---
+def test_cases_units(payload):
+    requirements = _require(payload, "requirements")
+    args = dict(
+        prompt=requirements,
+        num_cases=int(payload.get("num_cases", 10)),
+        priority=payload.get("priority", "Medium"),
+        severity=payload.get("severity", "Major"),
+        language=payload.get("language", "English"),
+    )
+    if payload.get("learned_rules"):
+        args["learned_rules"] = payload["learned_rules"]
+        return [("test_cases", args, lambda ai, a: generation.generate_test_cases_with_rules(ai=ai, **a)[0])]
+    return [("test_cases", args, lambda ai, a: generation.generate_test_cases_from_prompt(ai=ai, **a))]
+
+
+def automation_units(payload):
+    framework = payload.get("framework", "selenium")
+    if framework not in ("selenium", "rest_assured"):
+        raise BadRequest("'framework' must be 'selenium' or 'rest_assured'")
+    test_cases = _test_cases(payload)
+    options = payload.get("options") or {}
+    if payload.get("combined"):
+        unit = {"framework": framework, "test_cases": test_cases, "options": options}
+        return [("combined", unit,
+                 lambda ai, u: generation.generate_automation_suite(u["framework"], u["test_cases"], True, u["options"], ai=ai).get("combined", {}))]
+    # The project skeleton once under FRAMEWORK_KEY (no AI call); each case unit returns only its own files
+    return [(generation.FRAMEWORK_KEY, {"framework": framework, "options": options},
+             lambda ai, u: scaffold_files(u["framework"], u["options"]))] + [
+        (tc["id"], {"framework": framework, "test_case": tc, "options": options},
+         lambda ai, u: generation.generate_automation_suite(u["framework"], [u["test_case"]], False, u["options"], ai=ai)[u["test_case"]["id"]])
+        for tc in test_cases
+    ]
+
+
+def unit_specs_units(payload):
+    return [(tc["id"], tc, lambda ai, t: generation.generate_unit_test_specifications(t, ai=ai)) for tc in _test_cases(payload)]
+
+
+def test_plan_units(payload):
+    args = dict(
+        requirements_content=_require(payload, "requirements"),
+        timeline_str=payload.get("timeline") or "Not specified",
+        testers=payload.get("testers") or [{"specialization": "Manual", "experience": 2}],
+        custom_instructions=payload.get("custom_instructions", ""),
+    )
+    return [("test_plan", args, lambda ai, a: generation.generate_test_plan(ai=ai, **a))]
+
+
+def _supports_vision(ai):
+    """Whether the service's provider (ai = partial(call_ai, provider=...)) can read screenshots"""
+    return supports_vision(getattr(ai, "keywords", {}).get("provider", "auto"))
+
+
+def bug_report_units(payload):
+    screenshots = payload.get("screenshots") or []
+    if not isinstance(screenshots, list) or not all(isinstance(shot, dict) and shot.get("data") for shot in screenshots):
+        raise BadRequest("'screenshots' must be a list of {\"data\": base64, \"mime_type\"} objects")
+    args = dict(
+        bug_description=_require(payload, "description"),
+        env=payload.get("env", "QA / Staging"),
+        browser=payload.get("browser", "Chrome"),
+        report_lang=payload.get("language", "English"),
+        screenshots=[{"data": shot["data"], "mime_type": shot.get("mime_type", "image/png")} for shot in screenshots],
+    )
+
+    def run(ai, a):
+        # Screenshots stay base64 in the unit input so it can be hashed for the result cache
+        shots = [{"data": base64.b64decode(shot["data"]), "mime_type": shot["mime_type"]} for shot in a["screenshots"]]
+        return generation.generate_bug_report(ai=ai, vision=_supports_vision(ai), **dict(a, screenshots=shots))
+
+    return [("bug_report", args, run)]
+
+
+ENDPOINTS = {
+    "test-cases": test_cases_units,
+    "automation": automation_units,
+    "unit-specs": unit_specs_units,
+    "test-plan": test_plan_units,
+    "bug-report": bug_report_units,
+}
+
+
+class ResultCache:
+    """Bounded LRU of generation results, safe to use from the event loop and workers"""
+
+    def __init__(self, max_entries=DEFAULT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(*parts):
+        return hashlib.sha256(json.dumps(parts, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+class GenerationService:
+    """Bounded async worker pool in front of the generation core"""
+
+    def __init__(self, provider="auto", workers=DEFAULT_WORKERS, queue_size=DEFAULT_QUEUE_SIZE, cache_size=DEFAULT_CACHE_SIZE):
+        self.provider = provider
+        self.workers = workers
+        self.queue_size = queue_size
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="robotest-api")
+        self.cache = ResultCache(cache_size)
+        self.ai = partial(call_ai, provider=provider)
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self._slots = None
+
+    def stats(self):
+        return {
+            "provider": self.provider, "workers": self.workers, "queue_size": self.queue_size,
+            "waiting": self.waiting, "running": self.running, "completed": self.completed,
+            "cache": self.cache.stats(),
+        }
+
+    def check_capacity(self, units):
+        if self.waiting + len(units) > self.queue_size:
+            raise QueueFull()
+
+    async def run_unit(self, endpoint, key, unit_input, fn, use_cache=True):
+        """Returns (key, value, cached)"""
+        cache_key = ResultCache.key(endpoint, unit_input, self.provider)
+        if use_cache:
+            hit, value = self.cache.get(cache_key)
+            if hit:
+                return key, value, True
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.workers)
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        self.running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            value = await loop.run_in_executor(self.executor, fn, self.ai, unit_input)
+        finally:
+            self.running -= 1
+            self._slots.release()
+        self.completed += 1
+        self.cache.put(cache_key, value)
+        return key, value, False
+
+
+class BaseHandler(tornado.web.RequestHandler):
+    def initialize(self, service):
+        self.service = service
+
+    def prepare(self):
+        token = os.getenv("ROBOTEST_API_TOKEN")
+        if token and self.request.headers.get("Authorization") != f"Bearer {token}":
+            self.send_json(401, {"error": "unauthorized"})
+
+    def send_json(self, status, body):
+        self.set_status(status)
+        self.set_header("Content-Type", "application/json; charset=utf-8")
+        self.finish(json.dumps(body, ensure_ascii=False))
+
+
+class HealthHandler(BaseHandler):
+    def get(self):
+        self.send_json(200, {"status": "ok", **self.service.stats()})
+
+
+class GenerateHandler(BaseHandler):
+    async def post(self, endpoint):
+        if endpoint not in ENDPOINTS:
+            return self.send_json(404, {"error": f"unknown endpoint: {endpoint}"})
+        started = time.time()
+        try:
+            payload = json.loads(self.request.body or b"{}")
+            if not isinstance(payload, dict):
+                raise BadRequest("request body must be a JSON object")
+            units = ENDPOINTS[endpoint](payload)
+            self.service.check_capacity(units)
+        except (BadRequest, ValueError) as e:
+            return self.send_json(400, {"error": str(e)})
+        except QueueFull:
+            self.set_header("Retry-After", "5")
+            return self.send_json(503, {"error": "server busy, queue is full"})
+
+        use_cache = self.get_query_argument("cache", "1") != "0"
+        tasks = [asyncio.ensure_future(self.run_unit_safely(endpoint, key, unit_input, fn, use_cache))
+                 for key, unit_input, fn in units]
+        self._tasks = tasks
+        stream = self.get_query_argument("stream", "0") == "1"
+        if stream:
+            self.set_header("Content-Type", "application/x-ndjson; charset=utf-8")
+
+        results, errors, cached = {}, {}, 0
+        for task in asyncio.as_completed(tasks):
+            try:
+                key, value, from_cache, error = await task
+            except asyncio.CancelledError:
+                return
+            if error is None:
+                results[key] = value
+                cached += from_cache
+                event = {"event": "result", "key": key, "value": value, "cached": from_cache}
+            else:
+                errors[key] = error
+                event = {"event": "error", "key": key, "error": error}
+            if stream:
+                self.write(json.dumps(event, ensure_ascii=False) + "\n")
+                await self.flush()
+
+        elapsed = round(time.time() - started, 3)
+        if stream:
+            self.finish(json.dumps({"event": "done", "count": len(results), "errors": len(errors), "elapsed": elapsed}) + "\n")
+        else:
+            status = 502 if errors and not results else 200
+            self.send_json(status, {"endpoint": endpoint, "results": results, "errors": errors,
+                                    "cached": cached, "elapsed": elapsed})
+
+    async def run_unit_safely(self, endpoint, key, unit_input, fn, use_cache):
+        """(key, value, cached, error message or None)"""
+        try:
+            key, value, cached = await self.service.run_unit(endpoint, key, unit_input, fn, use_cache)
+            return key, value, cached, None
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            return key, None, False, str(e)
+
+    def on_connection_close(self):
+        # Client went away - drop its units that have not started
+        for task in getattr(self, "_tasks", []):
+            task.cancel()
+
+
+def make_app(service):
+    return tornado.web.Application([
+        (r"/api/health", HealthHandler, {"service": service}),
+        (r"/api/([a-z\-]+)", GenerateHandler, {"service": service}),
+    ])
+
+
+def serve(args):
+    service = GenerationService(args.provider, args.workers, args.queue_size, args.cache_size)
+    make_app(service).listen(args.port, address=args.host)
+    print(f"RoboTest API listening on http://{args.host}:{args.port} (provider={args.provider}, workers={args.workers})", file=sys.stderr)
+    tornado.ioloop.IOLoop.current().start()
+
+
+# --- Benchmark client ---
+BENCH_PAYLOADS = {
+    "test-cases": {"requirements": "Users can log in with email and password.", "num_cases": 5},
+    "automation": {"framework": "rest_assured", "test_cases": [
+        {"id": f"TC_{i}", "title": f"Get user {i}", "test_steps": ["GET /users/1"], "expected_results": ["200 OK"]}
+        for i in range(4)]},
+    "unit-specs": {"test_cases": [{"id": "TC_1", "title": "Validate email", "test_steps": ["Call validate()"], "expected_results": ["True"]}]},
+    "test-plan": {"requirements": "Users can log in with email and password."},
+    "bug-report": {"description": "Login button does nothing on Safari."},
+}
+
+
+def bench(args):
+    """Fire requests at a running service and report requests/sec and latency percentiles"""
+    import urllib.request
+
+    if args.payload:
+        with open(args.payload, encoding="utf-8") as f:
+            payload = json.load(f)
+    else:
+        payload = BENCH_PAYLOADS[args.endpoint]
+    url = f"{args.url.rstrip('/')}/api/{args.endpoint}" + ("" if args.cache else "?cache=0")
+    headers = {"Content-Type": "application/json"}
+    if os.getenv("ROBOTEST_API_TOKEN"):
+        headers["Authorization"] = f"Bearer {os.getenv('ROBOTEST_API_TOKEN')}"
+
+    def one(_):
+        request = urllib.request.Request(url, data=json.dumps(payload).encode("utf-8"), headers=headers)
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=600) as response:
+                response.read()
+                ok = response.status == 200
+        except Exception:
+            ok = False
+        return ok, time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        outcomes = list(pool.map(one, range(args.requests)))
+    wall = time.perf_counter() - started
+    latencies = sorted(latency for _, latency in outcomes)
+    failures = sum(1 for ok, _ in outcomes if not ok)
+    percentile = lambda p: latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+    print(f"{args.requests} requests to /api/{args.endpoint}, concurrency {args.concurrency}: "
+          f"{args.requests / wall:.1f} req/s, p50 {percentile(0.5):.0f} ms, p95 {percentile(0.95):.0f} ms, "
+          f"{failures} failed")
+
+
+def main(argv=None):
+    load_dotenv()
+    parser = argparse.ArgumentParser(prog="api_server", description="RoboTest AI Suite - local HTTP API")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("serve", help="Run the API service")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=DEFAULT_PORT)
+    p.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Concurrent AI requests")
+    p.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE, help="Max units waiting for a worker")
+    p.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE, help="Cached results kept in memory")
+    p.add_argument("--provider", choices=PROVIDERS, default="auto")
+    p.set_defaults(handler=serve)
+
+    p = sub.add_parser("bench", help="Measure requests/sec against a running service")
+    p.add_argument("--url", default=f"http://127.0.0.1:{DEFAULT_PORT}")
+    p.add_argument("--endpoint", choices=list(ENDPOINTS), default="bug-report")
+    p.add_argument("--payload", help="JSON file with the request body")
+    p.add_argument("--requests", type=int, default=200)
+    p.add_argument("--concurrency", type=int, default=16)
+    p.add_argument("--cache", action="store_true", help="Allow cache hits (default measures generation)")
+    p.set_defaults(handler=bench)
+
+    args = parser.parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+"""
+API specification index for REST Assured generation.
+
+Parses OpenAPI 3 / Swagger 2 (JSON or YAML) and Postman collections into a
+flat endpoint index - method, path, parameters and request/response schemas
+with local $refs resolved - and renders only the endpoints relevant to the
+test cases being automated, instead of pasting the first 3000 characters of
+the spec. Indexes are cached by spec content hash.
+
+Text that is not a recognizable spec (Markdown/PDF API docs) yields no
+index; callers fall back to the raw text.
+"""
+import re
+import json
+import math
+import hashlib
+import threading
+from collections import Counter, OrderedDict
+
+try:
+    import yaml
+except ImportError:  # YAML specs need PyYAML; JSON specs and Postman work without it
+    yaml = None
+
+HTTP_METHODS = ("get", "post", "put", "patch", "delete", "head", "options")
+MAX_SCHEMA_DEPTH = 3
+MAX_SCHEMA_PROPERTIES = 25
+DEFAULT_TOP_K = 6
+MIN_RELATIVE_SCORE = 0.35
+DEFAULT_MAX_CHARS = 6000
+INDEX_CACHE_SIZE = 32
+
+# Words in a test case that hint at the HTTP method under test
+METHOD_HINTS = {
+    "get": ("get", "retrieve", "fetch", "view", "list", "search", "read", "find", "show", "query"),
+    "post": ("create", "add", "register", "submit", "post", "upload", "login", "send", "new"),
+    "put": ("update", "replace", "edit", "modify", "put", "change"),
+    "patch": ("update", "patch", "modify", "partial", "change"),
+    "delete": ("delete", "remove", "cancel", "deactivate", "destroy"),
+}
+
+TOKEN_PATTERN = re.compile(r"[A-Za-z][a-z]+|[A-Z]+(?![a-z])|\d+")
+STOPWORDS = {"the", "and", "with", "for", "that", "this", "from", "are", "should", "shall", "then", "when",
+             "given", "user", "verify", "valid", "invalid", "request", "response", "api", "endpoint", "test"}
+
+
+def _stem(token):
+    """Singular form, so "orders" in a path matches "order" in a test case"""
+    if token.endswith("ies") and len(token) > 4:
+        return token[:-3] + "y"
+    if token.endswith("s") and not token.endswith("ss") and len(token) > 3:
+        return token[:-1]
+    return token
+
+
+def tokenize(text):
+    """Lower-case, singularized word tokens, splitting camelCase, snake_case and path segments"""
+    return [_stem(token.lower()) for token in TOKEN_PATTERN.findall(text or "")
+            if len(token) > 2 and token.lower() not in STOPWORDS]
+
+
+def load_spec_document(text):
+    """JSON or YAML text -> dict, or None"""
+    text = (text or "").strip()
+    if not text:
+        return None
+    if text[0] in "{[":
+        try:
+            document = json.loads(text)
+            return document if isinstance(document, dict) else None
+        except ValueError:
+            pass
+    if yaml is not None:
+        try:
+            document = yaml.safe_load(text)
+            return document if isinstance(document, dict) else None
+        except yaml.YAMLError:
+            return None
+    return None
+
+
+class SchemaRenderer:
+    """Compact one-line rendering of JSON schemas with local $ref resolution"""
+
+    def __init__(self, document):
+        self.document = document
+
+    def resolve(self, node, seen=()):
+        """Follow "#/..." references; returns (node, ref name or None)"""
+        name = None
+        while isinstance(node, dict) and isinstance(node.get("$ref"), str):
+            ref = node["$ref"]
+            if not ref.startswith("#/") or ref in seen:
+                return {}, ref.rsplit("/", 1)[-1]
+            seen = seen + (ref,)
+            name = ref.rsplit("/", 1)[-1]
+            target = self.document
+            for part in ref[2:].split("/"):
+                part = part.replace("~1", "/").replace("~0", "~")
+                target = target.get(part) if isinstance(target, dict) else None
+                if target is None:
+                    return {}, name
+            node = target
+        return node, name
+
+    def render(self, schema, depth=0, seen=()):
+        schema, name = self.resolve(schema, seen)
+        if name and f"#{name}" in seen:
+            return name  # recursive model
+        if name:
+            seen = seen + (f"#{name}",)
+        if not isinstance(schema, dict) or not schema:
+            return name or "any"
+        for combinator in ("allOf", "oneOf", "anyOf"):
+            if combinator in schema:
+                parts = [self.render(part, depth, seen) for part in schema[combinator][:5]]
+                return (" & " if combinator == "allOf" else " | ").join(parts)
+        schema_type = schema.get("type") or ("object" if "properties" in schema else None)
+        if schema_type == "array":
+            return f"[{self.render(schema.get('items', {}), depth, seen)}]"
+        if schema_type == "object" or "properties" in schema:
+            if depth >= MAX_SCHEMA_DEPTH:
+                return name or "object"
+            required = set(schema.get("required") or [])
+            properties = list((schema.get("properties") or {}).items())
+            fields = [f"{prop}{'*' if prop in required else ''}: {self.render(value, depth + 1, seen)}"
+                      for prop, value in properties[:MAX_SCHEMA_PROPERTIES]]
+            if len(properties) > MAX_SCHEMA_PROPERTIES:
+                fields.append("...")
+            return (f"{name} " if name and depth == 0 else "") + "{" + ", ".join(fields) + "}"
+        rendered = schema_type or name or "any"
+        if schema.get("format"):
+            rendered += f"({schema['format']})"
+        if schema.get("enum"):
+            rendered += " enum[" + ", ".join(str(value) for value in schema["enum"][:8]) + "]"
+        return rendered
+
+
+def _endpoint(method, path, summary="", operation_id="", tags=(), params=(), body="", responses=()):
+    return {
+        "method": method.upper(),
+        "path": path,
+        "summary": " ".join(str(summary or "").split())[:200],
+        "operation_id": operation_id or "",
+        "tags": list(tags or []),
+        "params": list(params),
+        "body": body,
+        "responses": list(responses),
+    }
+
+
+def parse_openapi(document):
+    """OpenAPI 3 / Swagger 2 document -> (endpoints, base URL)"""
+    renderer = SchemaRenderer(document)
+    swagger2 = str(document.get("swagger", "")).startswith("2")
+    if swagger2:
+        scheme = (document.get("schemes") or ["https"])[0]
+        base_url = f"{scheme}://{document['host']}{document.get('basePath', '')}" if document.get("host") else document.get("basePath", "")
+    else:
+        base_url = ((document.get("servers") or [{}])[0] or {}).get("url", "")
+
+    endpoints = []
+    for path, path_item in (document.get("paths") or {}).items():
+        path_item, _ = renderer.resolve(path_item)
+        if not isinstance(path_item, dict):
+            continue
+        shared_params = path_item.get("parameters") or []
+        for method in HTTP_METHODS:
+            operation = path_item.get(method)
+            if not isinstance(operation, dict):
+                continue
+            params = []
+            body = ""
+            for param in shared_params + (operation.get("parameters") or []):
+                param, _ = renderer.resolve(param)
+                if not isinstance(param, dict):
+                    continue
+                if param.get("in") == "body":  # Swagger 2 body parameter
+                    body = renderer.render(param.get("schema", {}))
+                    continue
+                schema = param.get("schema") or {"type": param.get("type"), "format": param.get("format"), "enum": param.get("enum")}
+                params.append(f"{param.get('in', '?')} {param.get('name', '?')}{'*' if param.get('required') else ''}: "
+                              f"{renderer.render(schema)}")
+            request_body, _ = renderer.resolve(operation.get("requestBody") or {})
+            for content_type, media in ((request_body or {}).get("content") or {}).items():
+                body = f"({content_type}) {renderer.render((media or {}).get('schema', {}))}"
+                break
+            responses = []
+            for code, response in (operation.get("responses") or {}).items():
+                response, _ = renderer.resolve(response)
+                response = response if isinstance(response, dict) else {}
+                schema = response.get("schema")  # Swagger 2
+                for media in (response.get("content") or {}).values():
+                    schema = (media or {}).get("schema")
+                    break
+                responses.append(f"{code} {renderer.render(schema) if schema else (response.get('description') or '').strip()[:60]}".strip())
+            endpoints.append(_endpoint(method, path, operation.get("summary") or operation.get("description"),
+                                       operation.get("operationId"), operation.get("tags"), params, body, responses))
+    return endpoints, base_url
+
+
+def parse_postman(collection):
+    """Postman v2 collection -> (endpoints, base URL)"""
+    variables = {var.get("key"): var.get("value") for var in collection.get("variable") or [] if isinstance(var, dict)}
+    endpoints = []
+
+    def walk(items, folders):
+        for item in items or []:
+            if "item" in item:
+                walk(item["item"], folders + [item.get("name", "")])
+                continue
+            request = item.get("request")
+            if not isinstance(request, dict):
+                continue
+            url = request.get("url") or ""
+            if isinstance(url, dict):
+                raw_path = url.get("path") or []
+                path = "/" + "/".join(str(part) for part in raw_path) if raw_path else url.get("raw", "")
+                query = [f"query {q.get('key')}: {q.get('value') or 'string'}" for q in url.get("query") or [] if isinstance(q, dict)]
+            else:
+                path, query = url, []
+            path = re.sub(r"^\{\{[^}]+\}\}", "", re.sub(r"^https?://[^/]+", "", path)) or "/"
+            path = re.sub(r"/:(\w+)", r"/{\1}", path.split("?")[0])  # :id -> {id}
+            headers = [f"header {h.get('key')}" for h in request.get("header") or [] if isinstance(h, dict) and h.get("key")]
+            body = request.get("body") or {}
+            body_text = " ".join(str(body.get("raw", "")).split())[:400] if body.get("mode") == "raw" else body.get("mode", "")
+            description = request.get("description")
+            if isinstance(description, dict):
+                description = description.get("content")
+            endpoints.append(_endpoint(request.get("method", "GET"), path, item.get("name") or description,
+                                       item.get("name", ""), [folder for folder in folders if folder],
+                                       query + headers, body_text))
+
+    walk(collection.get("item"), [])
+    return endpoints, variables.get("baseUrl") or variables.get("base_url") or ""
+
+
+class SpecIndex:
+    """Endpoints of one API spec with lexical relevance search"""
+
+    def __init__(self, endpoints, base_url="", title="", spec_format=""):
+        self.endpoints = endpoints
+        self.base_url = base_url
+        self.title = title
+        self.format = spec_format
+        self._documents = [Counter(tokenize(" ".join([e["path"], e["summary"], e["operation_id"], " ".join(e["tags"])])))
+                           for e in endpoints]
+        document_frequency = Counter(token for document in self._documents for token in document)
+        self._idf = {token: math.log(1 + len(endpoints) / count) for token, count in document_frequency.items()}
+
+    def __len__(self):
+        return len(self.endpoints)
+
+    def search(self, text, top_k=DEFAULT_TOP_K):
+        """Endpoints most relevant to a piece of text (e.g. a test case), best first"""
+        query = Counter(tokenize(text))
+        lowered = (text or "").lower()
+        hinted = {method.upper() for method, words in METHOD_HINTS.items() if any(re.search(rf"\b{w}", lowered) for w in words)}
+        scored = []
+        for position, (endpoint, document) in enumerate(zip(self.endpoints, self._documents)):
+            score = sum(self._idf[token] * min(count, 2) for token, count in query.items() if token in document)
+            if not score:
+                continue
+            literal = re.sub(r"\{[^}]+\}", "", endpoint["path"]).rstrip("/").lower()
+            if len(literal) > 1 and literal in lowered:
+                score *= 2  # the test case names the path itself
+            if endpoint["method"] in hinted:
+                score *= 1.5
+            scored.append((score, -position, endpoint))
+        scored.sort(key=lambda item: (item[0], item[1]), reverse=True)
+        # Drop weak matches (e.g. a shared verb only) once there is a clearly better one
+        cutoff = scored[0][0] * MIN_RELATIVE_SCORE if scored else 0
+        return [endpoint for score, _, endpoint in scored[:top_k] if score >= cutoff]
+
+    def relevant(self, texts, top_k=DEFAULT_TOP_K):
+        """Union of the relevant endpoints of several texts, best matches of each text first"""
+        chosen = {}
+        for text in texts:
+            for endpoint in self.search(text, top_k):
+                chosen.setdefault(id(endpoint), endpoint)
+        return list(chosen.values())
+
+    @staticmethod
+    def render_endpoint(endpoint):
+        lines = [f"{endpoint['method']} {endpoint['path']}"
+                 + (f" - {endpoint['summary']}" if endpoint["summary"] else "")
+                 + (f" [operationId: {endpoint['operation_id']}]" if endpoint["operation_id"] and endpoint["operation_id"] != endpoint["summary"] else "")]
+        if endpoint["params"]:
+            lines.append("  params: " + "; ".join(endpoint["params"]))
+        if endpoint["body"]:
+            lines.append(f"  body: {endpoint['body']}")
+        if endpoint["responses"]:
+            lines.append("  responses: " + "; ".join(endpoint["responses"]))
+        return "\n".join(lines)
+
+    def render(self, endpoints, max_chars=DEFAULT_MAX_CHARS):
+        """Prompt block for the given endpoints, cut at max_chars on endpoint boundaries"""
+        blocks = [line for line in (f"API: {self.title}" if self.title else "",
+                                    f"Base URL: {self.base_url}" if self.base_url else "") if line]
+        used = sum(len(block) for block in blocks)
+        for rendered, endpoint in enumerate(endpoints):
+            block = self.render_endpoint(endpoint)
+            if used + len(block) > max_chars:
+                blocks.append(f"... ({len(endpoints) - rendered} more endpoints omitted)")
+                break
+            blocks.append(block)
+            used += len(block)
+        return "\n".join(blocks)
+
+    def context_for(self, texts, top_k=DEFAULT_TOP_K, max_chars=DEFAULT_MAX_CHARS):
+        """Rendered endpoints relevant to the texts; all endpoints if none match"""
+        endpoints = self.relevant(texts, top_k) or self.endpoints
+        return self.render(endpoints, max_chars)
+
+
+def build_spec_index(text):
+    """Parse spec text into a SpecIndex, or None if it is not an OpenAPI/Swagger/Postman document"""
+    document = load_spec_document(text)
+    if document is None:
+        return None
+    info = document.get("info") or {}
+    if "openapi" in document or "swagger" in document:
+        endpoints, base_url = parse_openapi(document)
+        spec_format = f"OpenAPI {document.get('openapi') or document.get('swagger')}"
+    elif "item" in document and ("_postman_id" in info or "postman" in str(info.get("schema", ""))
+                                 or isinstance(document.get("item"), list)):
+        endpoints, base_url = parse_postman(document)
+        spec_format = "Postman collection"
+    else:
+        return None
+    if not endpoints:
+        return None
+    return SpecIndex(endpoints, base_url, info.get("title") or info.get("name", ""), spec_format)
+
+
+_index_cache = OrderedDict()
+_index_cache_lock = threading.Lock()
+
+
+def get_spec_index(text):
+    """build_spec_index() cached by spec content hash (None is cached too)"""
+    key = hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+    with _index_cache_lock:
+        if key in _index_cache:
+            _index_cache.move_to_end(key)
+            return _index_cache[key]
+    index = build_spec_index(text)
+    with _index_cache_lock:
+        _index_cache[key] = index
+        while len(_index_cache) > INDEX_CACHE_SIZE:
+            _index_cache.popitem(last=False)
+    return index
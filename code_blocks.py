@@ -0,0 +1,177 @@
+"""
+Parsing of generated code into files, and the project-level file map that
+collects the files of several generations (framework layer, test cases,
+batches).
+
+CodeBlockParser consumes a response in chunks as they arrive and understands
+"// FILE: path" markers and their variants ("//FILE:", "# File:",
+"<!-- FILE: -->", "**FILE: `path`**"), markdown fences with or without a
+marker inside, paths in the fence info (```java title="LoginPage.java"``` or
+```java:LoginPage.java```), and unnamed fences whose Java type or XML root
+names the file. Lines are collected in lists and joined once per file.
+
+ProjectFileMap keys files by path and content hash: an identical file from
+several sources is stored once, different contents at one path are
+conflicts.
+"""
+import re
+import hashlib
+
+FILE_MARKER_PATTERN = re.compile(
+    r"^\s*(?:(?://+|#+|--|<!--|/\*+|\*+)\s*)*FILE\s*:\s*\**\s*`?(?P<path>[\w.@$/\\-]+\.[A-Za-z0-9]+)`?\s*\**\s*(?:-->|\*+/)?\s*$",
+    re.IGNORECASE)
+FENCE_PATTERN = re.compile(r"^\s*(?P<fence>`{3,}|~{3,})\s*(?P<info>.*?)\s*$")
+FENCE_PATH_PATTERN = re.compile(
+    r"""(?:\b(?:title|file|filename|path)\s*=\s*["']?|^\w*:)(?P<path>[\w.@$/\\-]+\.[A-Za-z0-9]+)""", re.IGNORECASE)
+BARE_PATH_PATTERN = re.compile(r"^[\w.@$-]*[/\\][\w.@$/\\-]*\.[A-Za-z0-9]+$|^[\w@$-]+\.(?:java|xml|properties|feature|json|md)$")
+JAVA_TYPE_NAME_PATTERN = re.compile(r"^\s*(?:public\s+)?(?:(?:abstract|final|sealed)\s+)*(?:class|interface|enum|record|@interface)\s+(\w+)",
+                                    re.MULTILINE)
+XML_ROOT_FILES = (("<project", "pom.xml"), ("<suite", "testng.xml"), ("<Configuration", "log4j2.xml"))
+
+
+def _fence_path(info):
+    """File path named in a fence info string, or None"""
+    if BARE_PATH_PATTERN.match(info):
+        return info
+    match = FENCE_PATH_PATTERN.search(info)
+    return match.group("path") if match else None
+
+
+def infer_file_name(content):
+    """File name for an unnamed code block: its Java type or known XML root, else None"""
+    match = JAVA_TYPE_NAME_PATTERN.search(content)
+    if match:
+        return f"{match.group(1)}.java"
+    head = content.lstrip()[:500]
+    for root, name in XML_ROOT_FILES:
+        if root in head:
+            return name
+    return None
+
+
+class CodeBlockParser:
+    """
+    Incremental parser: feed(chunk) as text arrives, close() for the {path: content} result.
+    files() and current_path show the files parsed so far (e.g. to fill a file tree live).
+    """
+
+    def __init__(self):
+        self._pending = ""       # incomplete last line
+        self._files = {}         # path -> list of lines
+        self.current_path = None
+        self._fence = None       # opening fence of the block we are in
+        self._fenced = False     # current file's content came from a fence (prose after it is ignored)
+        self._done = False       # current file ended with its fence
+        self._unnamed = None     # lines of a fence without a path yet
+
+    def feed(self, chunk):
+        lines = (self._pending + chunk).split("\n")
+        self._pending = lines.pop()
+        for line in lines:
+            self._line(line[:-1] if line.endswith("\r") else line)
+        return self
+
+    def close(self):
+        """Finish the stream; returns {path: content}"""
+        if self._pending:
+            self._line(self._pending.rstrip("\r"))
+            self._pending = ""
+        self._end_unnamed()
+        return self.files()
+
+    def files(self):
+        return {path: "\n".join(lines).strip("\n") for path, lines in self._files.items()}
+
+    def _open(self, path, fenced):
+        self.current_path = path.strip()
+        self._files[self.current_path] = []
+        self._fenced, self._done, self._unnamed = fenced, False, None
+
+    def _end_unnamed(self):
+        if self._unnamed:
+            name = infer_file_name("\n".join(self._unnamed))
+            if name:
+                self._files[name] = self._unnamed
+        self._unnamed = None
+
+    def _line(self, line):
+        # Markdown files written after a bare marker keep their own fences as content
+        literal = self.current_path is not None and self.current_path.endswith(".md") and not self._fenced and not self._fence
+        fence = None if literal else FENCE_PATTERN.match(line)
+        if fence and self._fence:
+            closing = fence.group("fence")
+            if closing[0] == self._fence[0] and len(closing) >= len(self._fence) and not fence.group("info"):
+                self._fence = None
+                self._end_unnamed()
+                if self._fenced:
+                    self._done = True
+                return
+            fence = None  # a fence-like line inside the block is content
+        elif fence:
+            self._fence = fence.group("fence")
+            path = _fence_path(fence.group("info"))
+            if path:
+                self._open(path, True)
+            elif self.current_path is not None and not self._done and not self._fenced:
+                # "// FILE: x" then a fence: the fence holds the file, drop the prose before it
+                self._files[self.current_path] = []
+                self._fenced = True
+            else:
+                self.current_path, self._unnamed = None, []
+            return
+
+        marker = FILE_MARKER_PATTERN.match(line)
+        if marker:
+            self._open(marker.group("path"), self._fence is not None)
+            return
+        if self._unnamed is not None:
+            self._unnamed.append(line)
+        elif self.current_path is not None and not self._done:
+            self._files[self.current_path].append(line)
+
+
+def parse_code_blocks(code):
+    """Generated code -> {path: content}"""
+    return CodeBlockParser().feed(code).close()
+
+
+def content_digest(content):
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+class ProjectFileMap:
+    """
+    One project's files from several sources, keyed by path and content hash.
+    variants[path] = {digest: [sources]}; the first content seen for a path is files[path].
+    """
+
+    def __init__(self):
+        self.files = {}
+        self.variants = {}
+
+    def add(self, source, files):
+        for path, content in files.items():
+            variants = self.variants.setdefault(path, {})
+            if not variants:
+                self.files[path] = content
+            variants.setdefault(content_digest(content), []).append(source)
+
+    def shared_paths(self, min_sources=2):
+        """Paths every source wrote identically, by at least min_sources sources"""
+        return {path for path, variants in self.variants.items()
+                if len(variants) == 1 and len(next(iter(variants.values()))) >= min_sources}
+
+    def conflicts(self):
+        """{path: [[sources of one content], ...]} for paths written with different contents"""
+        return {path: list(variants.values()) for path, variants in self.variants.items() if len(variants) > 1}
+
+    def conflict_report(self, resolution=""):
+        """Markdown table of the conflicts ("" when there are none)"""
+        conflicts = self.conflicts()
+        if not conflicts:
+            return ""
+        rows = [f"| {path} | {len(groups)} | " + " / ".join(", ".join(sources) for sources in groups) + " |"
+                for path, groups in sorted(conflicts.items())]
+        return "\n".join(["# File Conflicts", "",
+                          f"{len(conflicts)} files were generated with different contents. {resolution}".rstrip(), "",
+                          "| File | Versions | Written by (one group per version) |", "|---|---|---|"] + rows) + "\n"
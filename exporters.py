@@ -0,0 +1,156 @@
+"""
+Exporters for generated artifacts (Excel, ZIP, JSONL) and the matching
+readers used by the CLI to load test cases back.
+
+ZIP archives are cached by a content hash of their file map, so Streamlit
+reruns reuse the bytes instead of compressing the code again; an archive
+that only gains files is extended from the cached one instead of rebuilt.
+"""
+import json
+import hashlib
+import zipfile
+import threading
+from io import BytesIO
+from collections import OrderedDict
+
+import pandas as pd
+
+# Excel column -> test case key; list-valued fields are newline-joined
+EXCEL_COLUMNS = {
+    'ID': 'id',
+    'Title': 'title',
+    'Priority': 'priority',
+    'Preconditions': 'preconditions',
+    'Test Data': 'test_data',
+    'Test Steps': 'test_steps',
+    'Expected Results': 'expected_results',
+}
+LIST_FIELDS = ('preconditions', 'test_data', 'test_steps', 'expected_results')
+
+ZIP_CACHE_MAX_BYTES = 64 << 20
+
+_zip_cache = OrderedDict()  # files digest -> ({path: content digest}, zip bytes)
+_zip_cache_bytes = 0
+_zip_cache_lock = threading.Lock()
+
+
+# Export to Excel function
+def export_test_cases_to_excel(test_cases):
+    """Convert test cases to Excel file"""
+    data = []
+    for tc in test_cases:
+        data.append({
+            'ID': tc['id'],
+            'Title': tc['title'],
+            'Priority': tc['priority'],
+            'Preconditions': '\n'.join(tc.get('preconditions', [])),
+            'Test Data': '\n'.join(tc.get('test_data', [])),
+            'Test Steps': '\n'.join(tc.get('test_steps', [])),
+            'Expected Results': '\n'.join(tc.get('expected_results', []))
+        })
+    df = pd.DataFrame(data)
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        df.to_excel(writer, index=False, sheet_name='Test Cases')
+    output.seek(0)
+    return output
+
+
+def write_zip(files, fileobj, mode='w'):
+    """Write {path: content} into a ZIP file object, one entry at a time ('a' appends to an existing archive)"""
+    with zipfile.ZipFile(fileobj, mode, zipfile.ZIP_DEFLATED, False) as zip_file:
+        for file_name, content in files.items():
+            zip_file.writestr(file_name, content)
+
+
+def _content_digest(content):
+    return hashlib.sha1(content.encode("utf-8") if isinstance(content, str) else content).hexdigest()
+
+
+def _files_digest(entries):
+    return hashlib.sha1("\n".join(f"{path}\0{digest}" for path, digest in sorted(entries.items())).encode("utf-8")).hexdigest()
+
+
+def cached_zip(files):
+    """The cached ZIP bytes for exactly this file map, or None if it was not built yet"""
+    key = _files_digest({path: _content_digest(content) for path, content in files.items()})
+    with _zip_cache_lock:
+        if key in _zip_cache:
+            _zip_cache.move_to_end(key)
+            return _zip_cache[key][1]
+    return None
+
+
+def files_to_zip(files):
+    """
+    {path: content} -> ZIP bytes, cached by content hash.
+    If a cached archive holds a subset of these files with the same contents,
+    only the new files are compressed and appended to a copy of it.
+    """
+    global _zip_cache_bytes
+    entries = {path: _content_digest(content) for path, content in files.items()}
+    key = _files_digest(entries)
+    with _zip_cache_lock:
+        if key in _zip_cache:
+            _zip_cache.move_to_end(key)
+            return _zip_cache[key][1]
+        base = None
+        for cached_entries, data in reversed(_zip_cache.values()):
+            if len(cached_entries) < len(entries) and all(entries.get(path) == digest for path, digest in cached_entries.items()):
+                if base is None or len(cached_entries) > len(base[0]):
+                    base = (cached_entries, data)
+
+    zip_buffer = BytesIO()
+    if base is None:
+        write_zip(files, zip_buffer)
+    else:
+        zip_buffer.write(base[1])
+        zip_buffer.seek(0)
+        write_zip({path: content for path, content in files.items() if path not in base[0]}, zip_buffer, 'a')
+    data = zip_buffer.getvalue()
+
+    with _zip_cache_lock:
+        if key not in _zip_cache:
+            _zip_cache[key] = (entries, data)
+            _zip_cache_bytes += len(data)
+        while _zip_cache_bytes > ZIP_CACHE_MAX_BYTES and len(_zip_cache) > 1:
+            _, (_, evicted) = _zip_cache.popitem(last=False)
+            _zip_cache_bytes -= len(evicted)
+    return data
+
+
+def save_zip(files, path):
+    """Stream {path: content} into a ZIP file on disk without building it in memory first"""
+    data = cached_zip(files)
+    with open(path, "wb") as f:
+        if data is not None:
+            f.write(data)
+        else:
+            write_zip(files, f)
+
+
+def to_jsonl(records):
+    """Records -> JSON Lines text (UTF-8, one object per line)"""
+    return "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+
+
+def read_test_cases(path):
+    """Load test cases from a .jsonl/.json export or an Excel sheet written by export_test_cases_to_excel"""
+    lower = path.lower()
+    if lower.endswith(".jsonl"):
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+    if lower.endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return data.get("test_cases", []) if isinstance(data, dict) else data
+    if lower.endswith(".xlsx"):
+        df = pd.read_excel(path).fillna("")
+        test_cases = []
+        for row in df.to_dict("records"):
+            tc = {key: str(row.get(column, "")) for column, key in EXCEL_COLUMNS.items()}
+            for field in LIST_FIELDS:
+                tc[field] = [line for line in tc[field].split("\n") if line.strip()]
+            test_cases.append(tc)
+        return test_cases
+    raise ValueError(f"Unsupported test case file: {path}")
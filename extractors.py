@@ -0,0 +1,699 @@
+"""
+Text extraction from uploaded requirement/specification files.
+
+Extractors take a binary file-like object (a Streamlit UploadedFile or an
+open file) and return plain text. FILE_PROCESSORS maps MIME types to
+extractors; extract_text_from_path() serves the CLI.
+
+PDFs are extracted page-wise: large documents are split into page chunks
+that run in parallel on a shared process pool (PyPDF2 text extraction is
+CPU-bound pure Python), completed chunks are reported as they arrive, and
+page texts are joined once at the end. A page selection such as "1-5, 12"
+limits extraction to the chapters that are needed.
+
+extract_bytes() fronts every extractor with an ExtractionCache keyed by the
+SHA-256 of the file bytes and the extractor's version, so the same upload is
+parsed once no matter how many pages, reruns or sessions read it. Bump the
+extractor's entry in EXTRACTOR_VERSIONS when its output changes.
+"""
+import os
+import re
+import sys
+import gzip
+import time
+import random
+import hashlib
+import tempfile
+import threading
+import multiprocessing
+from io import BytesIO
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+import PyPDF2
+import docx
+from docx.oxml.ns import qn
+from docx.table import Table
+from docx.text.paragraph import Paragraph
+import pandas as pd
+
+
+# File processing functions
+def extract_text_from_txt(file):
+    return file.read().decode("utf-8")
+
+def extract_text_from_pdf(file, pages=None):
+    return extract_pdf_text(file.read(), pages=pages)
+
+def extract_text_from_docx(file):
+    return "\n".join(iter_docx_blocks(docx.Document(file))).strip()
+
+def extract_text_from_csv(file, **table_options):
+    return extract_table_text(iter_csv_sheets(file), file_size(file), **table_options)
+
+def extract_text_from_xlsx(file, **table_options):
+    return extract_table_text(iter_xlsx_sheets(file), file_size(file), **table_options)
+
+FILE_PROCESSORS = {
+    "text/plain": extract_text_from_txt,
+    "application/pdf": extract_text_from_pdf,
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": extract_text_from_docx,
+    "text/csv": extract_text_from_csv,
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": extract_text_from_xlsx,
+    "text/markdown": extract_text_from_txt,  # Markdown is text
+    "application/octet-stream": extract_text_from_txt # Fallback for some md files type detection
+}
+
+# File extension -> MIME type, for files read from disk
+EXTENSION_TYPES = {
+    ".txt": "text/plain",
+    ".md": "text/markdown",
+    ".pdf": "application/pdf",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ".csv": "text/csv",
+    ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+# Bump an extractor's version when its output changes, to invalidate cached text
+EXTRACTOR_VERSIONS = {
+    "extract_text_from_txt": 1,
+    "extract_text_from_pdf": 2,
+    "extract_text_from_docx": 2,
+    "extract_text_from_csv": 2,
+    "extract_text_from_xlsx": 2,
+}
+
+
+def extract_bytes(data, mime_type, options=None, on_progress=None, use_cache=True, offload=False):
+    """
+    Extract text from file bytes through the shared extraction cache.
+    options: {"pages": ...} for PDFs (see extract_pdf_text), table options for
+    CSV/XLSX (see extract_table_text); on_progress applies to PDFs.
+    offload: run DOCX/CSV/XLSX parsing in the shared process pool (PDFs always
+    fan out page chunks there), so concurrent extractions don't contend for the GIL.
+    """
+    extractor = FILE_PROCESSORS[mime_type]
+    options = {name: value for name, value in (options or {}).items() if value not in (None, "", [])}
+    if extractor is extract_text_from_pdf:
+        def run():
+            return extract_pdf_text(data, pages=options.get("pages"), on_progress=on_progress)
+    elif offload and extractor is not extract_text_from_txt:
+        def run():
+            return _run_in_process_pool(extract_bytes, data, mime_type, options, use_cache=False)
+    elif extractor in (extract_text_from_csv, extract_text_from_xlsx):
+        def run():
+            return extractor(BytesIO(data), **options)
+    else:
+        def run():
+            return extractor(BytesIO(data))
+    if not use_cache:
+        return run()
+    if isinstance(options.get("pages"), str):
+        options["pages"] = re.sub(r"\s+", "", options["pages"])
+    cache = get_extraction_cache()
+    key = cache.key(data, extractor.__name__, EXTRACTOR_VERSIONS.get(extractor.__name__, 1), sorted(options.items()))
+    text = cache.get(key)
+    if text is None:
+        text = run()
+        cache.put(key, text)
+    return text
+
+
+def iter_extract_many(files, max_workers=None):
+    """
+    Extract several files concurrently. files: [(data, mime type, options)].
+    Yields (index, text, error) as each file completes; cache hits return at once.
+    With more than one worker process, parsing is offloaded to the process pool.
+    """
+    if not files:
+        return
+    with ThreadPoolExecutor(max_workers=max_workers or min(len(files), 2 * PDF_WORKERS), thread_name_prefix="robotest-extract") as pool:
+        futures = {pool.submit(extract_bytes, data, mime_type, options, offload=PDF_WORKERS > 1): index
+                   for index, (data, mime_type, options) in enumerate(files)}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except Exception as e:
+                yield futures[future], None, e
+
+
+def extract_text_from_path(path):
+    """Extract text from a file on disk, choosing the extractor by extension"""
+    mime_type = EXTENSION_TYPES.get(os.path.splitext(path)[1].lower())
+    if mime_type is None:
+        raise ValueError(f"Unsupported file type: {path}")
+    with open(path, "rb") as file:
+        return extract_bytes(file.read(), mime_type)
+
+
+# --- DOCX extraction ---
+HEADING_STYLE_PATTERN = re.compile(r"^(?:heading\s*(\d)|title)$", re.IGNORECASE)
+MARKDOWN_HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.+?)\s*$")
+
+
+def _docx_heading_level(style_name):
+    match = HEADING_STYLE_PATTERN.match(style_name.strip())
+    if not match:
+        return None
+    return int(match.group(1)) if match.group(1) else 1
+
+
+def _docx_table_lines(table):
+    """One "a | b | c" line per row; horizontally merged cells appear once"""
+    lines = []
+    for row in table.rows:
+        cells = []
+        previous = None
+        for cell in row.cells:
+            if cell._tc is previous:
+                continue
+            previous = cell._tc
+            cells.append(" ".join(cell.text.split()))
+            # Nested tables (common for acceptance criteria) are flattened into the cell
+            for nested in cell.tables:
+                cells[-1] += " [" + "; ".join(_docx_table_lines(nested)) + "]"
+        if any(cells):
+            lines.append(" | ".join(cells))
+    return lines
+
+
+def iter_docx_blocks(document):
+    """
+    Text blocks of a python-docx Document in body order: headings as markdown
+    "#" markers (by heading level), list items as "- ", tables row by row.
+    """
+    # paragraph.style looks styles up one by one (slow on long documents); map IDs once
+    style_names = {style.style_id: style.name or "" for style in document.styles}
+    for element in document.element.body.iterchildren():
+        if element.tag == qn("w:p"):
+            paragraph = Paragraph(element, document)
+            text = paragraph.text.strip()
+            if not text:
+                continue
+            style_name = style_names.get(element.style, "")
+            level = _docx_heading_level(style_name)
+            if level:
+                yield f"\n{'#' * min(level, 6)} {text}"
+            elif style_name.lower().startswith("list"):
+                yield f"- {text}"
+            else:
+                yield text
+        elif element.tag == qn("w:tbl"):
+            lines = _docx_table_lines(Table(element, document))
+            if lines:
+                yield "\n".join(lines)
+
+
+def split_sections(text, max_level=2):
+    """
+    Split markdown-headed text (DOCX/Markdown extraction output) into sections at
+    headings up to max_level. Returns [{"title": "Parent > Child", "level", "text"}];
+    text before the first heading becomes an untitled section.
+    """
+    sections = []
+    path = []
+    current = {"title": "", "level": 0, "lines": []}
+    for line in text.splitlines():
+        match = MARKDOWN_HEADING_PATTERN.match(line)
+        if match and len(match.group(1)) <= max_level:
+            level = len(match.group(1))
+            path = [(title_level, title) for title_level, title in path if title_level < level]
+            path.append((level, match.group(2)))
+            sections.append(current)
+            current = {"title": " > ".join(title for _, title in path), "level": level, "lines": [line]}
+        else:
+            current["lines"].append(line)
+    sections.append(current)
+    return [{"title": section["title"], "level": section["level"], "text": "\n".join(section["lines"]).strip()}
+            for section in sections if "\n".join(section["lines"]).strip()]
+
+
+# --- Tabular (CSV/XLSX) extraction ---
+TABLE_MAX_ROWS = int(os.getenv("ROBOTEST_TABLE_MAX_ROWS", "2000"))
+TABLE_CHUNK_ROWS = 10000
+TABLE_MAX_CELL_CHARS = 500
+TABLE_ROW_MODES = ("head", "sample", "group")
+GROUP_COLUMN_PATTERN = re.compile(r"req|story|feature|epic|^id$|\bid\b|key", re.IGNORECASE)
+
+
+def file_size(file):
+    position = file.tell()
+    file.seek(0, os.SEEK_END)
+    size = file.tell()
+    file.seek(position)
+    return size
+
+
+def _cell(value):
+    if value is None:
+        return ""
+    text = " ".join(str(value).split())
+    return text[:TABLE_MAX_CELL_CHARS] + "..." if len(text) > TABLE_MAX_CELL_CHARS else text
+
+
+def iter_csv_sheets(file):
+    """Yield one ("CSV", header, rows) sheet; rows are read in chunks of TABLE_CHUNK_ROWS"""
+    chunks = pd.read_csv(file, chunksize=TABLE_CHUNK_ROWS, dtype=str, keep_default_na=False,
+                         skip_blank_lines=True, on_bad_lines="skip")
+    first = next(chunks, None)
+    if first is None:
+        return
+    header = [_cell(column) for column in first.columns]
+
+    def rows():
+        yield from first.itertuples(index=False, name=None)
+        for chunk in chunks:
+            yield from chunk.itertuples(index=False, name=None)
+
+    yield "CSV", header, rows()
+
+
+def iter_xlsx_sheets(file):
+    """Yield (sheet name, header, rows) for every worksheet, streamed in openpyxl read-only mode"""
+    import openpyxl
+    workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    try:
+        for sheet in workbook.worksheets:
+            rows = sheet.iter_rows(values_only=True)
+            header = None
+            for row in rows:
+                if any(value not in (None, "") for value in row):
+                    header = [_cell(value) or f"Column {i + 1}" for i, value in enumerate(row)]
+                    break
+            if header is not None:
+                yield sheet.title, header, rows
+    finally:
+        workbook.close()
+
+
+def table_columns(data, mime_type):
+    """Column names of every sheet of a CSV/XLSX file (reads only the header rows)"""
+    sheets = iter_csv_sheets(BytesIO(data)) if mime_type == "text/csv" else iter_xlsx_sheets(BytesIO(data))
+    columns = []
+    for _, header, _ in sheets:
+        columns.extend(name for name in header if name and name not in columns)
+    return columns
+
+
+def extract_table_text(sheets, total_bytes=None, columns=None, max_rows=None, mode="head", group_by=None, stats=None):
+    """
+    Compact text for (name, header, rows) sheets without materializing them.
+    columns: keep only these columns (case-insensitive); max_rows: rows kept per sheet.
+    mode: "head" (first rows, stops reading early), "sample" (uniform reservoir sample
+    kept in original order) or "group" (first rows, grouped under their requirement
+    ID column - group_by or auto-detected).
+    The output ends with a line reporting rows/bytes processed; stats, if given, is filled too.
+    """
+    if mode not in TABLE_ROW_MODES:
+        raise ValueError(f"Unknown row mode: {mode}")
+    max_rows = int(max_rows or TABLE_MAX_ROWS)
+    wanted = {name.lower() for name in columns} if columns else None
+    sampler = random.Random(0)
+    stats = stats if stats is not None else {}
+    stats.update(sheets=0, rows_read=0, rows_kept=0, truncated=False, bytes=total_bytes)
+    sections = []
+
+    for name, header, rows in sheets:
+        stats["sheets"] += 1
+        keep = [i for i, column in enumerate(header) if wanted is None or column.lower() in wanted] or list(range(len(header)))
+        names = [header[i] for i in keep]
+        group_index = None
+        if mode == "group":
+            candidates = [i for i, column in enumerate(names)
+                          if (column.lower() == group_by.lower() if group_by else GROUP_COLUMN_PATTERN.search(column))]
+            group_index = candidates[0] if candidates else None
+
+        kept = []  # [(row number, cells)]
+        seen = 0
+        truncated = False
+        for row in rows:
+            values = [row[i] if i < len(row) else None for i in keep]
+            if all(value is None or value == "" for value in values):
+                continue
+            seen += 1
+            if len(kept) < max_rows:
+                kept.append((seen, [_cell(value) for value in values]))
+            elif mode == "sample":
+                # Reservoir sampling (Algorithm R): every row ends up kept with equal probability
+                slot = sampler.randrange(seen)
+                if slot < max_rows:
+                    kept[slot] = (seen, [_cell(value) for value in values])
+            else:
+                seen -= 1
+                truncated = True
+                break  # head/group: stop reading at the row limit
+        kept.sort(key=lambda item: item[0])
+        stats["rows_read"] += seen
+        stats["rows_kept"] += len(kept)
+        stats["truncated"] = stats["truncated"] or truncated
+
+        lines = [f"### Sheet: {name} ({len(kept):,} of {seen:,}{'+' if truncated else ''} rows)"]
+        if group_index is not None:
+            # One block per requirement, in first-seen order
+            groups = {}
+            for _, cells in kept:
+                groups.setdefault(cells[group_index] or "(no ID)", []).append(cells)
+            lines.append(" | ".join(column for i, column in enumerate(names) if i != group_index))
+            for group, members in groups.items():
+                lines.append(f"#### {names[group_index]}: {group}")
+                lines.extend("- " + " | ".join(c for i, c in enumerate(cells) if i != group_index) for cells in members)
+        else:
+            lines.append(" | ".join(names))
+            lines.extend(" | ".join(cells) for _, cells in kept)
+        sections.append("\n".join(lines))
+
+    size = f"; {stats['bytes'] / 1e6:.1f} MB file" if stats["bytes"] is not None else ""
+    more = "+ (reading stopped at the row limit)" if stats["truncated"] else ""
+    sections.append(f"[Rows: kept {stats['rows_kept']:,} of {stats['rows_read']:,}{more} read from "
+                    f"{stats['sheets']} sheet(s), mode={mode}{size}]")
+    return "\n\n".join(sections)
+
+
+# --- Extraction cache ---
+CACHE_DIR = os.getenv("ROBOTEST_EXTRACT_CACHE_DIR", os.path.join(".robotest_cache", "extracted"))
+CACHE_MEMORY_MB = int(os.getenv("ROBOTEST_EXTRACT_CACHE_MEMORY_MB", "128"))
+CACHE_DISK_MB = int(os.getenv("ROBOTEST_EXTRACT_CACHE_DISK_MB", "1024"))  # 0 disables the disk tier
+
+
+class ExtractionCache:
+    """
+    Two-tier cache of extracted text: a bounded in-memory LRU in front of
+    gzip files on disk (shared by all sessions and processes, also LRU-bounded).
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_memory_bytes=CACHE_MEMORY_MB << 20, max_disk_bytes=CACHE_DISK_MB << 20):
+        self.directory = directory
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._entries = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes = None  # scanned lazily
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(data, *parts):
+        digest = hashlib.sha256(data)
+        digest.update(repr(parts).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + ".txt.gz")
+
+    def get(self, key):
+        """Cached text or None"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+        text = self._read_disk(key)
+        with self._lock:
+            if text is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, text)
+        return text
+
+    def put(self, key, text):
+        with self._lock:
+            self._remember(key, text)
+        self._write_disk(key, text)
+
+    def _remember(self, key, text):
+        size = len(text) * 2  # rough in-memory size; enough for bounding
+        if size > self.max_memory_bytes:
+            return
+        if key in self._entries:
+            self._memory_bytes -= len(self._entries.pop(key)) * 2
+        self._entries[key] = text
+        self._memory_bytes += size
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._memory_bytes -= len(evicted) * 2
+
+    def _read_disk(self, key):
+        if not self.max_disk_bytes:
+            return None
+        path = self._path(key)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                text = f.read()
+            os.utime(path)  # mtime doubles as last-used time for eviction
+            return text
+        except (OSError, EOFError, UnicodeDecodeError):
+            return None
+
+    def _write_disk(self, key, text):
+        if not self.max_disk_bytes:
+            return
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename so concurrent readers never see a partial file
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=3) as f:
+                f.write(text)
+            os.replace(tmp, path)
+            size = os.path.getsize(path)
+        except OSError:
+            return
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(size for _, size, _ in self._disk_files())
+            else:
+                self._disk_bytes += size
+            if self._disk_bytes > self.max_disk_bytes:
+                self._evict_disk()
+
+    def _disk_files(self):
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith(".txt.gz"):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    files.append((path, stat.st_size, stat.st_mtime))
+        return files
+
+    def _evict_disk(self):
+        """Drop least recently used files until the disk tier is back under 90% of its limit"""
+        files = sorted(self._disk_files(), key=lambda f: f[2])
+        total = sum(size for _, size, _ in files)
+        for path, size, _ in files:
+            if total <= self.max_disk_bytes * 0.9:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        self._disk_bytes = total
+
+    def stats(self):
+        return {"entries": len(self._entries), "memory_bytes": self._memory_bytes,
+                "hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses}
+
+
+_extraction_cache = None
+
+
+def get_extraction_cache():
+    """Process-wide extraction cache"""
+    global _extraction_cache
+    if _extraction_cache is None:
+        _extraction_cache = ExtractionCache()
+    return _extraction_cache
+
+
+# --- PDF page-wise extraction ---
+PDF_PARALLEL_MIN_PAGES = 24  # below this, process start-up costs more than it saves
+PDF_CHUNKS_PER_WORKER = 4    # smaller chunks balance load and report progress more often
+PDF_WORKERS = int(os.getenv("ROBOTEST_PDF_WORKERS", str(os.cpu_count() or 2)))
+
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+
+def _get_process_pool():
+    """Process pool shared by all CPU-bound extraction (spawned once, reused across reruns)"""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(max_workers=PDF_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _process_pool
+
+
+def _reset_process_pool():
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+
+
+def _run_in_process_pool(fn, *args, **kwargs):
+    """fn(*args, **kwargs) in the shared process pool, or in this process if no pool can be started"""
+    try:
+        return _get_process_pool().submit(fn, *args, **kwargs).result()
+    except (OSError, BrokenProcessPool):
+        _reset_process_pool()
+        return fn(*args, **kwargs)
+
+
+def parse_page_ranges(spec, page_count):
+    """
+    "1-5, 8, 10-" -> sorted 0-based page indices (1-based, inclusive, open-ended ranges allowed).
+    An empty spec selects all pages; a list of 1-based page numbers is also accepted.
+    """
+    if spec is None or (isinstance(spec, str) and not spec.strip()):
+        return list(range(page_count))
+    if not isinstance(spec, str):
+        return sorted({p - 1 for p in spec if 1 <= p <= page_count})
+    pages = set()
+    for part in spec.replace(";", ",").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        match = re.fullmatch(r"(\d*)\s*-\s*(\d*)|(\d+)", part)
+        if not match:
+            raise ValueError(f"Invalid page range: '{part}'")
+        if match.group(3):
+            start = end = int(match.group(3))
+        else:
+            start = int(match.group(1) or 1)
+            end = int(match.group(2) or page_count)
+        if start < 1 or start > end:
+            raise ValueError(f"Invalid page range: '{part}'")
+        pages.update(range(start - 1, min(end, page_count)))
+    return sorted(pages)
+
+
+def pdf_page_count(data):
+    cache = get_extraction_cache()
+    key = cache.key(data, "pdf_page_count")
+    count = cache.get(key)
+    if count is None:
+        count = str(len(PyPDF2.PdfReader(BytesIO(data)).pages))
+        cache.put(key, count)
+    return int(count)
+
+
+def _extract_pdf_chunk(source, indices):
+    """Worker: extract the given pages; source is a file path or PDF bytes"""
+    reader = PyPDF2.PdfReader(source if isinstance(source, str) else BytesIO(source))
+    return [(i, reader.pages[i].extract_text() or "") for i in indices]
+
+
+def iter_pdf_chunks(data, pages=None, workers=None):
+    """
+    Yield ([(page index, text), ...], selected page count) as page chunks complete.
+    Chunks arrive in completion order, not page order.
+    """
+    reader = PyPDF2.PdfReader(BytesIO(data))
+    indices = parse_page_ranges(pages, len(reader.pages))
+    total = len(indices)
+    workers = max(1, min(workers or PDF_WORKERS, total))
+
+    if total < PDF_PARALLEL_MIN_PAGES or workers == 1:
+        for i in indices:
+            yield [(i, reader.pages[i].extract_text() or "")], total
+        return
+
+    chunk_size = max(1, -(-total // (workers * PDF_CHUNKS_PER_WORKER)))
+    chunks = [indices[i:i + chunk_size] for i in range(0, total, chunk_size)]
+    # Workers read the PDF from a temp file instead of receiving a copy of the bytes per chunk
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+        tmp.write(data)
+        path = tmp.name
+    try:
+        done = set()
+        try:
+            pool = _get_process_pool()
+            futures = {pool.submit(_extract_pdf_chunk, path, chunk): n for n, chunk in enumerate(chunks)}
+            for future in as_completed(futures):
+                result = future.result()
+                done.add(futures[future])
+                yield result, total
+        except (OSError, BrokenProcessPool):
+            # No process pool available (e.g. restricted sandbox, killed worker) - finish in this process
+            _reset_process_pool()
+            for n, chunk in enumerate(chunks):
+                if n not in done:
+                    yield _extract_pdf_chunk(path, chunk), total
+    finally:
+        os.remove(path)
+
+
+def extract_pdf_text(data, pages=None, workers=None, on_progress=None):
+    """
+    Extract the selected pages of a PDF (bytes) in page order, joined once.
+    on_progress(pages done, pages selected, chunk) is called as chunks complete.
+    """
+    texts = {}
+    for chunk, total in iter_pdf_chunks(data, pages, workers):
+        texts.update(chunk)
+        if on_progress:
+            on_progress(len(texts), total, chunk)
+    return "\n".join(texts[i] for i in sorted(texts))
+
+
+# --- Benchmark ---
+def build_synthetic_pdf(page_count, lines_per_page=45):
+    """A text-only PDF with page_count pages of requirement-like lines (no extra dependencies)"""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in range(page_count):
+        lines = [f"REQ-{page + 1:04d}-{line + 1:02d} The system shall validate input field {line} on screen {page} "
+                 f"and display an error message within 2 seconds." for line in range(lines_per_page)]
+        stream = "BT /F1 9 Tf 11 TL 36 800 Td " + " ".join(f"({text}) '" for text in lines) + " ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream".encode("latin-1"))
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Contents {len(objects)} 0 R "
+                       f"/Resources << /Font << /F1 3 0 R >> >> >>".encode("latin-1"))
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {page_count} >>".encode("latin-1")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode("latin-1") + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    return bytes(out)
+
+
+def bench(page_counts=(100, 500, 1000), workers=None):
+    """Compare the old sequential `text +=` loop with page-wise parallel extraction"""
+    for page_count in page_counts:
+        data = build_synthetic_pdf(page_count)
+        started = time.perf_counter()
+        text = ""
+        for page in PyPDF2.PdfReader(BytesIO(data)).pages:
+            text += page.extract_text()
+        sequential = time.perf_counter() - started
+
+        extract_pdf_text(build_synthetic_pdf(PDF_PARALLEL_MIN_PAGES), workers=workers)  # warm up the pool
+        first = []
+        started = time.perf_counter()
+        parallel_text = extract_pdf_text(data, workers=workers,
+                                         on_progress=lambda done, total, chunk: first or first.append(time.perf_counter()))
+        parallel = time.perf_counter() - started
+        assert len(parallel_text) >= len(text)
+        print(f"{page_count:5d} pages ({len(data) / 1e6:.1f} MB): sequential {sequential:.2f}s, "
+              f"parallel {parallel:.2f}s ({sequential / parallel:.1f}x, first pages after {first[0] - started:.2f}s)")
+
+
+if __name__ == "__main__":
+    # python extractors.py [PAGES ...]
+    bench([int(arg) for arg in sys.argv[1:]] or (100, 500, 1000))
@@ -0,0 +1,1415 @@
+"""
+Generation core: prompt builders, response parsers and generators.
+
+Nothing here depends on Streamlit. Generators take an `ai` callable
+(prompt -> response text, defaulting to ai_providers.call_ai with keys from
+the environment) and raise on failure; the web app wraps them to report
+errors with st.error, the CLI reports them per input.
+"""
+import os
+import re
+import json
+import hashlib
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from ai_providers import MAX_OUTPUT_TOKENS, call_ai
+from api_specs import get_spec_index
+from code_blocks import ProjectFileMap, parse_code_blocks
+from java_syntax import add_imports, check_java
+from scaffold import JAVA_PACKAGE_PATTERN, merge_with_scaffold, normalize_path, scaffold_files
+from type_classifier import classify_test_type, classify_test_types
+from images import process_for_vision
+
+
+def _default_ai(ai):
+    return ai or call_ai
+
+
+def parse_json_object(response_text):
+    """First {...} block of an AI response as a dict, or None"""
+    json_match = re.search(r'\{[\s\S]*\}', response_text or "")
+    if json_match:
+        return json.loads(json_match.group())
+    return None
+
+
+# Function to parse generated code
+def parse_generated_code(code):
+    """{path: content} from "// FILE:" markers and markdown code blocks (see code_blocks.py)"""
+    return parse_code_blocks(code or "")
+
+
+# Function to detect test type from test case content
+def detect_test_type(test_case):
+    """
+    Auto-detect test type from title, steps, expected results and test data
+    Returns: 'ui', 'api', 'unit_spec', or 'mixed' (see type_classifier.py)
+    """
+    return classify_test_type(test_case)
+
+
+def format_test_cases_block(test_cases):
+    """Numbered title/steps/expected block used by the combined-suite prompts"""
+    return "\n\n".join(
+        [f"Test Case {idx+1}: {tc['title']}\n"
+         f"Steps:\n{chr(10).join(tc['test_steps'])}\n"
+         f"Expected Results:\n{chr(10).join(tc['expected_results'])}"
+         for idx, tc in enumerate(test_cases)]
+    )
+
+
+# --- Test cases ---
+def build_test_cases_prompt(prompt, num_cases, priority, severity="Major", language="English"):
+    # Language instruction
+    language_instruction = ""
+    if language == "Arabic":
+        language_instruction = "\n        - IMPORTANT: Generate all test case content (title, preconditions, test_data, test_steps, expected_results) in Arabic language.\n        - Use proper Arabic text and formatting.\n        - Keep only the JSON keys in English, but all values must be in Arabic."
+    else:
+        language_instruction = "\n        - Generate all content in English language."
+
+    return f"""
+        You are a senior QA engineer with 15+ years of experience.
+        Generate {num_cases} comprehensive test cases based on the following requirements:
+
+        {prompt}
+
+        Instructions:
+        - Default Priority: {priority}
+        - Default Severity: {severity} (Critical=System crash, Major=Feature broken, Normal=General severity, Minor=Minor issue){language_instruction}
+        - Format test cases in JSON with this structure:
+        {{
+            "test_cases": [
+                {{
+                    "id": "TC_001",
+                    "title": "Test case title",
+                    "preconditions": ["Precondition 1", "Precondition 2"],
+                    "test_data": ["Data 1", "Data 2"],
+                    "test_steps": ["Step 1", "Step 2", "Step 3"],
+                    "expected_results": ["Expected result 1", "Expected result 2"],
+                    "priority": "High/Medium/Low",
+                    "severity": "Critical/Major/Normal/Minor",
+                    "attachments": []
+                }}
+            ]
+        }}
+        """
+
+
+def generate_test_cases_from_prompt(prompt, num_cases, priority, severity="Major", language="English", ai=None):
+    """Generate test cases from requirements text; returns a list of test case dicts"""
+    response_text = _default_ai(ai)(build_test_cases_prompt(prompt, num_cases, priority, severity, language))
+    data = parse_json_object(response_text)
+    return data.get("test_cases", []) if data else []
+
+
+def build_rules_prompt(prompt, num_cases, priority, severity, language, learned_rules=None):
+    rules_instruction = ""
+    if learned_rules:
+        rules_instruction = f"""
+
+        IMPORTANT: Follow these learned patterns from the user's examples:
+        - ID Format: {learned_rules.get('id_format', 'TC_001')}
+        - Title Style: {learned_rules.get('title_style', 'Descriptive')}
+        - Steps Style: {learned_rules.get('steps_style', 'Numbered, imperative verbs')}
+        - Expected Results: {learned_rules.get('expected_results_style', 'Clear outcomes')}
+        - Tone: {learned_rules.get('tone', 'Professional')}
+        - Special Patterns: {', '.join(learned_rules.get('special_patterns', []))}
+        """
+
+    language_instruction = ""
+    if language == "Arabic":
+        language_instruction = "\n        - IMPORTANT: Generate all test case content in Arabic language. Keep only JSON keys in English."
+    else:
+        language_instruction = "\n        - Generate all content in English language."
+
+    return f"""
+        You are a senior QA engineer with 15+ years of experience.
+        Generate {num_cases} comprehensive test cases based on the following requirements:
+
+        {prompt}
+
+        Instructions:
+        - Default Priority: {priority}
+        - Default Severity: {severity}{language_instruction}{rules_instruction}
+        - Categorize each test case as: "positive", "negative", or "edge_case"
+        - Format test cases in JSON with this structure:
+        {{
+            "test_cases": [
+                {{
+                    "id": "TC_001",
+                    "title": "Test case title",
+                    "category": "positive/negative/edge_case",
+                    "test_type": "ui/api/unit_spec",
+                    "preconditions": ["Precondition 1", "Precondition 2"],
+                    "test_data": ["Data 1", "Data 2"],
+                    "test_steps": ["Step 1", "Step 2", "Step 3"],
+                    "expected_results": ["Expected result 1", "Expected result 2"],
+                    "priority": "High/Medium/Low",
+                    "severity": "Critical/Major/Normal/Minor",
+                    "attachments": []
+                }}
+            ],
+            "summary": {{
+                "total": 0,
+                "positive": 0,
+                "negative": 0,
+                "edge_cases": 0,
+                "ui_tests": 0,
+                "api_tests": 0,
+                "unit_specs": 0
+            }}
+        }}
+        """
+
+
+# Function to generate test cases with learned rules
+def generate_test_cases_with_rules(prompt, num_cases, priority, severity, language, learned_rules=None, ai=None):
+    """
+    Generate test cases using custom rules learned from examples
+    Returns (test_cases, summary)
+    """
+    response_text = _default_ai(ai)(build_rules_prompt(prompt, num_cases, priority, severity, language, learned_rules))
+    data = parse_json_object(response_text)
+    if data:
+        return data.get("test_cases", []), data.get("summary", {})
+    return [], {}
+
+
+# --- Learned styles ---
+# Function to learn patterns from example test cases
+def learn_from_examples(example_contents, ai=None):
+    """
+    Analyze test case examples and extract writing patterns
+    Returns learned rules as structured data
+    """
+    examples_text = "\n\n---\n\n".join(example_contents)
+
+    prompt = f"""
+        You are an expert QA analyst. Analyze the following test case examples and extract the writing patterns and style.
+
+        EXAMPLES:
+        {examples_text}
+
+        Analyze and return a JSON object with the following structure:
+        {{
+            "id_format": "The ID format pattern (e.g., TC-001, TC_MODULE_001)",
+            "title_style": "Description of title writing style",
+            "precondition_style": "How preconditions are written (numbered, bulleted, etc.)",
+            "steps_style": "How steps are written (verb usage, numbering, detail level)",
+            "expected_results_style": "How expected results are written",
+            "common_fields": ["List of common fields used"],
+            "priority_values": ["Priority values used"],
+            "tone": "Formal/Informal/Technical",
+            "special_patterns": ["Any unique patterns noticed"],
+            "summary": "Brief summary of the overall writing style"
+        }}
+
+        Return ONLY the JSON object, no additional text.
+        """
+
+    return parse_json_object(_default_ai(ai)(prompt))
+
+
+# Function to learn coding style from example REST Assured scripts
+def learn_rest_assured_style(script_contents, ai=None):
+    """
+    Analyze REST Assured example scripts and extract coding patterns
+    Returns learned style as structured data
+    """
+    learn_prompt = f"""
+        Analyze these REST Assured test scripts and extract the coding patterns and style:
+
+        {chr(10).join(['---SCRIPT---' + chr(10) + s for s in script_contents])}
+
+        Return a JSON with:
+        {{
+            "package_structure": "How packages are organized",
+            "class_naming": "Class naming convention",
+            "method_naming": "Method naming convention",
+            "assertion_style": "How assertions are written",
+            "request_style": "How requests are structured",
+            "response_handling": "How responses are validated",
+            "logging_approach": "Logging style used",
+            "special_patterns": ["List of unique patterns"]
+        }}
+        """
+
+    return parse_json_object(_default_ai(ai)(learn_prompt))
+
+
+# --- Selenium ---
+def build_design_instructions(use_pom=True, use_oop=True, use_data_driven=False, use_bdd=False, use_bot_style=False, combined=False,
+                              scaffolded=False):
+    """Design pattern bullet list shared by the Selenium prompts (scaffolded: ActionBot comes from scaffold.py)"""
+    design_instructions = []
+    if use_pom:
+        design_instructions.append("- Page Object Model with @FindBy annotations")
+        design_instructions.append("- Separate Page classes for each page")
+        design_instructions.append("- Use Selenium 'By' locators (id, name, cssSelector, xpath) for dynamic or computed elements")
+        design_instructions.append("- Combine @FindBy for static elements with By-based lookups in actions and waits")
+        design_instructions.append("- Prefer stable CSS/XPath strategies; avoid brittle absolute XPaths; include meaningful locator names")
+    if use_oop:
+        design_instructions.append("- Object-Oriented Programming (OOP) & SOLID Principles")
+        design_instructions.append("- Inheritance: Use BaseTest and BasePage classes")
+        design_instructions.append("- Component Objects: Create reusable components (Table, Navbar) extending BaseComponent")
+        design_instructions.append("- Fluent Interfaces: Method chaining for actions (e.g., login.enterUser().enterPass().clickSubmit())")
+        design_instructions.append("- Encapsulation: Private WebElements, public action methods")
+    if use_data_driven:
+        design_instructions.append("- Data-driven testing with @DataProvider")
+        design_instructions.append("- External test data from JSON/Excel files")
+    if use_bdd:
+        design_instructions.append("- BDD style with descriptive method names")
+        design_instructions.append("- Given-When-Then comments in test methods")
+    if use_bot_style:
+        design_instructions.append("- Action-Based Testing (Bot Style)")
+        if scaffolded:
+            design_instructions.append("- Use the project's existing ActionBot (see EXISTING FRAMEWORK) for every element interaction; do NOT write an ActionBot")
+            design_instructions.append("- Page classes call the bot, not WebDriver directly; tests focus on business logic")
+        elif combined:
+            design_instructions.append("- Create an ActionBot class that abstracts all WebDriver actions")
+            design_instructions.append("- Bot methods should be generic and handle waits/exceptions: bot.click(locator), bot.type(locator, text)")
+            design_instructions.append("- Use the ActionBot in Page classes to handle element interactions")
+            design_instructions.append("- Ensure Test classes focus on business logic, Page classes on element structure, and Bot on WebDriver commands")
+        else:
+            design_instructions.append("- Create an ActionBot class that abstracts all WebDriver actions")
+            design_instructions.append("- Bot methods should be generic: click(locator), type(locator, text), isDisplayed(locator), waitForElement(locator)")
+            design_instructions.append("- Page classes should use the Bot for all interactions, not WebDriver directly")
+            design_instructions.append("- This abstracts Selenium logic away from Page Objects")
+
+    # Critical Enhancements (From Enhancement Guide)
+    design_instructions.append("- Explicit Waits: Use WebDriverWait with ExpectedConditions. NEVER use Thread.sleep().")
+    design_instructions.append("- Logging: Use SLF4J/Log4j2. Log INFO for flow, DEBUG for actions, ERROR for failures.")
+    design_instructions.append("- Test Isolation: Use @BeforeMethod for setup and @AfterMethod for teardown. No shared state.")
+    design_instructions.append("- Exception Handling: Wrap actions in try-catch, capture screenshots on failure, log stack traces.")
+    design_instructions.append("- Locator Strategy: Priority ID > Name > CSS. Avoid absolute XPath. Use data-testid if available.")
+
+    if not use_pom and not use_oop and not use_bot_style:
+        design_instructions.append("- Simple linear test script without Page Object Model")
+        design_instructions.append("- All code in single test class")
+
+    return chr(10).join(design_instructions) if design_instructions else "- Simple script structure"
+
+
+def build_selenium_standards(framework_api=None):
+    """Enterprise standards bullets; with the scaffold's DriverFactory/ConfigReader the model uses them instead of writing its own"""
+    if framework_api and "DriverFactory" in framework_api:
+        infrastructure = """- WebDriver from the existing DriverFactory and settings from the existing ConfigReader
+          (see EXISTING FRAMEWORK - do NOT write a driver factory or configuration class)"""
+    else:
+        infrastructure = """- Factory Pattern for WebDriver
+        - Singleton for configuration"""
+    return f"""- Java 17
+        - Selenium WebDriver
+        - TestNG
+        {infrastructure}
+        - Log4j2 logging
+        - Allure reporting annotations
+        - Explicit waits with WebDriverWait
+        - Meaningful assertions
+        - Thread-safe implementation"""
+
+
+def page_locators_section(page_index, test_cases):
+    """Locators of the saved pages relevant to the test cases (page_locators.LocatorIndex), or "" """
+    if page_index is None:
+        return ""
+    context = page_index.context_for([format_test_cases_block([tc]) for tc in test_cases])
+    if not context:
+        return ""
+    return f"""
+        REAL PAGE LOCATORS (parsed from saved HTML of the application under test). Use these locators in the
+        page objects instead of inventing them - the first one of each element is the most stable:
+{context}"""
+
+
+def build_selenium_prompt(test_case, use_pom=True, use_oop=True, use_data_driven=False, use_bdd=False, use_bot_style=False, custom_prompt="", framework_api=None, page_index=None):
+    design_str = build_design_instructions(use_pom, use_oop, use_data_driven, use_bdd, use_bot_style,
+                                           scaffolded=bool(framework_api and "ActionBot" in framework_api))
+
+    # Custom prompt section
+    custom_section = f"\n\nAdditional Requirements:\n{custom_prompt}" if custom_prompt.strip() else ""
+    framework_section = build_framework_section(framework_api)
+    locators_section = page_locators_section(page_index, [test_case])
+
+    return f"""
+        You are a super senior QA automation engineer with over 30 years of enterprise experience.
+        Write complete, production-grade Selenium test automation code in Java using TestNG.
+
+        Based on the following test case:
+        - Title: {test_case['title']}
+        - Steps:
+        {chr(10).join(test_case['test_steps'])}
+        - Expected Results:
+        {chr(10).join(test_case['expected_results'])}
+
+        Design Pattern Requirements:
+{design_str}
+
+        Use the following enterprise standards:
+        {build_selenium_standards(framework_api)}
+        {framework_section}
+        {locators_section}
+        {custom_section}
+
+        Output the code in the following format:
+
+        // FILE: src/main/java/com/qa/pages/[PageName]Page.java
+        [Java code here]
+
+        // FILE: src/test/java/com/qa/tests/[TestName]Test.java
+        [Java code here]
+        """
+
+
+def build_combined_selenium_prompt(test_cases, use_pom=True, use_oop=True, use_data_driven=False, use_bdd=False, use_bot_style=False, custom_prompt="", framework_api=None, suite_name="GeneratedTestSuite", page_index=None):
+    test_cases_str = format_test_cases_block(test_cases)
+    design_str = build_design_instructions(use_pom, use_oop, use_data_driven, use_bdd, use_bot_style, combined=True,
+                                           scaffolded=bool(framework_api and "ActionBot" in framework_api))
+
+    # Custom prompt section
+    custom_section = f"\n\nAdditional Requirements:\n{custom_prompt}" if custom_prompt.strip() else ""
+    framework_section = build_framework_section(framework_api)
+    locators_section = page_locators_section(page_index, test_cases)
+
+    return f"""
+        You are a super senior QA automation engineer with over 30 years of enterprise experience.
+        Write complete, production-grade Selenium test automation code in Java using TestNG.
+
+        Create a SINGLE test class that includes test methods for the following test cases:
+
+        {test_cases_str}
+
+        Design Pattern Requirements:
+{design_str}
+
+        Use the following enterprise standards:
+        {build_selenium_standards(framework_api)}
+        {framework_section}
+        {locators_section}
+        {custom_section}
+
+        Output the code in the following format:
+
+        // FILE: src/main/java/com/qa/pages/[PageName]Page.java
+        [Java code here]
+
+        // FILE: src/test/java/com/qa/tests/{suite_name}.java
+        [Java code for the combined test suite]
+        """
+
+
+# Function to generate Java Selenium code for a test case
+def generate_test_case_automation_code(test_case, use_pom=True, use_oop=True, use_data_driven=False, use_bdd=False, use_bot_style=False, custom_prompt="", framework_api=None, page_index=None, ai=None):
+    prompt = build_selenium_prompt(test_case, use_pom, use_oop, use_data_driven, use_bdd, use_bot_style, custom_prompt, framework_api, page_index)
+    return _default_ai(ai)(prompt)
+
+
+# Function to generate combined Java Selenium code for multiple test cases
+def generate_combined_automation_code(test_cases, use_pom=True, use_oop=True, use_data_driven=False, use_bdd=False, use_bot_style=False, custom_prompt="", framework_api=None, suite_name="GeneratedTestSuite", page_index=None, ai=None):
+    prompt = build_combined_selenium_prompt(test_cases, use_pom, use_oop, use_data_driven, use_bdd, use_bot_style, custom_prompt, framework_api, suite_name, page_index)
+    return _default_ai(ai)(prompt)
+
+
+# --- REST Assured ---
+def api_spec_context(api_spec, test_cases):
+    """
+    Spec text for a prompt: the indexed endpoints relevant to the test cases for
+    OpenAPI/Swagger/Postman specs, the first 3000 characters for other API docs.
+    Returns (context, indexed).
+    """
+    index = get_spec_index(api_spec)
+    if index is None:
+        return api_spec[:3000], False
+    texts = [format_test_cases_block([tc]) for tc in test_cases]
+    return index.context_for(texts), True
+
+
+def build_rest_assured_prompt(test_case, use_bdd=True, custom_prompt="", api_spec="", learned_style=None, framework_api=None):
+    bdd_instruction = ""
+    if use_bdd:
+        bdd_instruction = """
+        - Use BDD style with given().when().then() pattern
+        - Add descriptive method chaining
+        - Use RequestSpecBuilder for reusable specs"""
+    else:
+        bdd_instruction = """
+        - Use standard RestAssured syntax
+        - Keep it simple and readable"""
+
+    custom_section = f"\n\nAdditional Requirements:\n{custom_prompt}" if custom_prompt.strip() else ""
+
+    # Add API spec context if provided
+    api_spec_section = ""
+    if api_spec:
+        spec_context, indexed = api_spec_context(api_spec, [test_case])
+        exact = "\n        Use only these endpoints, exactly as written (required fields are marked *)." if indexed else ""
+        api_spec_section = f"""
+
+        API SPECIFICATION CONTEXT:
+        Use the following API documentation to ensure accurate endpoint URLs, methods, request/response formats:{exact}
+
+        {spec_context}
+        """
+
+    # Add learned style instructions if available
+    style_section = ""
+    if learned_style:
+        style_section = f"""
+
+        CODING STYLE REQUIREMENTS (Learn from user's existing code):
+        - Class Naming: {learned_style.get('class_naming', 'Standard naming')}
+        - Method Naming: {learned_style.get('method_naming', 'Standard naming')}
+        - Assertion Style: {learned_style.get('assertion_style', 'Standard assertions')}
+        - Request Style: {learned_style.get('request_style', 'Standard requests')}
+        - Response Handling: {learned_style.get('response_handling', 'Standard handling')}
+        - Package Structure: {learned_style.get('package_structure', 'com.qa.api')}
+
+        IMPORTANT: Match the user's coding style as closely as possible.
+        """
+
+    framework_section = build_framework_section(framework_api)
+    specs_format = "" if framework_api and "RequestSpecs" in framework_api else """
+        // FILE: src/main/java/com/qa/api/specs/RequestSpecs.java
+        [Java code here]
+"""
+
+    return f"""
+        You are a senior QA automation engineer with expertise in REST API testing.
+        Write complete, production-grade REST Assured test code in Java using TestNG.
+
+        Based on the following test case:
+        - Title: {test_case['title']}
+        - Steps:
+        {chr(10).join(test_case['test_steps'])}
+        - Expected Results:
+        {chr(10).join(test_case['expected_results'])}
+
+        API Testing Requirements:{bdd_instruction}
+        {api_spec_section}
+        {style_section}
+        {framework_section}
+
+        Include:
+        Include:
+        - TestNG annotations (@Test, @BeforeMethod, @AfterMethod) for test isolation
+        - Request specifications (headers, content type, base URI)
+        - Response validation (status code, body, headers)
+        - JSON path assertions
+        - SLF4J/Log4j2 Logging: Log Request details and Response status
+        - Robust Error handling
+        - Allure reporting annotations
+        {custom_section}
+
+        Output the code in the following format:
+
+        // FILE: src/test/java/com/qa/api/tests/{test_case['id']}ApiTest.java
+        [Java code here]
+{specs_format}        """
+
+
+def build_combined_rest_assured_prompt(test_cases, use_bdd=True, custom_prompt="", api_spec="", learned_style=None, framework_api=None, suite_name="ApiTestSuite"):
+    test_cases_str = format_test_cases_block(test_cases)
+
+    bdd_instruction = "- Use BDD style with given().when().then() pattern" if use_bdd else "- Use standard RestAssured syntax"
+    custom_section = f"\n\nAdditional Requirements:\n{custom_prompt}" if custom_prompt.strip() else ""
+
+    # Add API spec context if provided
+    api_spec_section = ""
+    if api_spec:
+        spec_context, indexed = api_spec_context(api_spec, test_cases)
+        exact = "\n        Use only these endpoints, exactly as written (required fields are marked *)." if indexed else ""
+        api_spec_section = f"""
+
+        API SPECIFICATION:{exact}
+        {spec_context}
+        """
+
+    # Add learned style instructions if available
+    style_section = ""
+    if learned_style:
+        style_section = f"""
+
+        CODING STYLE (Match user's existing code):
+        - Class Naming: {learned_style.get('class_naming', 'Standard')}
+        - Method Naming: {learned_style.get('method_naming', 'Standard')}
+        - Assertion Style: {learned_style.get('assertion_style', 'Standard')}
+        - Request Style: {learned_style.get('request_style', 'Standard')}
+        """
+
+    # Base classes already generated for a batched suite are not written again
+    base_format = "" if framework_api and "BaseApiTest" in framework_api else """
+        // FILE: src/test/java/com/qa/api/base/BaseApiTest.java
+        [Java code]
+
+        // FILE: src/main/java/com/qa/api/specs/RequestSpecs.java
+        [Java code]
+"""
+
+    return f"""
+        You are a senior QA automation engineer. Write a complete REST Assured test suite.
+
+        Test Cases to automate:
+        {test_cases_str}
+
+        Requirements:
+        {bdd_instruction}
+        - TestNG annotations (@BeforeMethod/@AfterMethod for isolation)
+        - Response validation & JSON path assertions
+        - Allure reporting
+        - Base test class with common setup
+        - SLF4J/Log4j2 Logging (INFO for flows, DEBUG for requests)
+        - Robust Exception Handling
+        {api_spec_section}
+        {style_section}
+        {build_framework_section(framework_api)}
+        {custom_section}
+
+        Output format:
+
+        // FILE: src/test/java/com/qa/api/tests/{suite_name}.java
+        [Java code]
+{base_format}        """
+
+
+# Function to generate REST Assured API automation code
+def generate_rest_assured_code(test_case, use_bdd=True, custom_prompt="", api_spec="", learned_style=None, framework_api=None, ai=None):
+    """
+    Generate REST Assured API automation code
+    Supports BDD style (given/when/then)
+    Can use API spec documentation and learned coding style
+    """
+    return _default_ai(ai)(build_rest_assured_prompt(test_case, use_bdd, custom_prompt, api_spec, learned_style, framework_api))
+
+
+# Function to generate combined automation code for multiple test cases (REST Assured)
+def generate_combined_rest_assured_code(test_cases, use_bdd=True, custom_prompt="", api_spec="", learned_style=None, framework_api=None, suite_name="ApiTestSuite", ai=None):
+    """Generate REST Assured code for multiple test cases with optional API spec and learned style"""
+    return _default_ai(ai)(build_combined_rest_assured_prompt(test_cases, use_bdd, custom_prompt, api_spec, learned_style, framework_api, suite_name))
+
+
+# --- Shared framework layer (two-phase generation) ---
+FRAMEWORK_KEY = "framework"  # automation results key of the shared framework files
+
+JAVA_TYPE_PATTERN = re.compile(r"^\s*(?:public\s+)?(?:abstract\s+|final\s+)*(?:class|interface|enum)\s+\w+[^{]*", re.MULTILINE)
+JAVA_METHOD_PATTERN = re.compile(r"^\s*((?:public|protected)\s+[^;=(){}]*\([^)]*\)(?:\s*throws\s+[\w., ]+)?)\s*\{", re.MULTILINE)
+
+
+def build_framework_prompt(framework, options):
+    """Prompt for the shared layer every per-case test builds on (generated once per run)"""
+    custom_prompt = options.get("custom_prompt", "")
+    custom_section = f"\n\nAdditional Requirements:\n{custom_prompt}" if custom_prompt.strip() else ""
+    provided_section = build_framework_section(scaffold_api(framework, options))
+    if framework == "rest_assured":
+        style = options.get("learned_style") or {}
+        style_line = f"\n        - Match this style: {json.dumps(style, ensure_ascii=False)}" if style else ""
+        return f"""
+        You are a senior QA automation engineer. Write ONLY the shared framework layer of a REST Assured + TestNG
+        (Java 17) API test project. Test classes will be written separately against this API, so keep it generic:
+        - BaseApiTest with @BeforeClass setup (base URI from config, default request/response specifications, logging filters)
+        - RequestSpecs with reusable RequestSpecification builders (JSON content type, auth header hook)
+        - {"given().when().then() BDD helpers" if options.get("use_bdd", True) else "Plain RestAssured helpers"}
+        - SLF4J/Log4j2 logging and Allure annotations{style_line}
+        {provided_section}
+        {custom_section}
+
+        Do NOT write any test classes. Output format:
+
+        // FILE: src/test/java/com/qa/api/base/BaseApiTest.java
+        [Java code]
+
+        // FILE: src/main/java/com/qa/api/specs/RequestSpecs.java
+        [Java code]
+        """
+
+    use_oop = options.get("use_oop", True)
+    files = [
+        ("src/main/java/com/qa/base/BasePage.java", "BasePage: WebDriver + WebDriverWait, PageFactory init, generic wait/click/type/getText/isDisplayed helpers"),
+        ("src/test/java/com/qa/base/BaseTest.java", "BaseTest: @BeforeMethod driver setup via DriverFactory, @AfterMethod teardown with screenshot on failure"),
+    ]
+    if use_oop:
+        files.append(("src/main/java/com/qa/components/BaseComponent.java", "BaseComponent: root-element scoped base class for reusable components (Navbar, Table)"))
+    file_list = "\n".join(f"        - {description}" for _, description in files)
+    output_format = "\n\n".join(f"        // FILE: {path}\n        [code]" for path, _ in files)
+    return f"""
+        You are a super senior QA automation engineer. Write ONLY the shared framework layer of a Selenium + TestNG
+        (Java 17) project. Page objects and tests will be written separately against this API, so keep it generic:
+{file_list}
+
+        Standards: explicit waits only (never Thread.sleep), Log4j2 logging, Allure annotations, thread safety.
+        {provided_section}
+        {custom_section}
+
+        Do NOT write any page objects or test classes. Output format:
+
+{output_format}
+        """
+
+
+def summarize_framework_api(files):
+    """Package, type and public/protected method signatures of the framework files, for per-case prompts"""
+    lines = []
+    for path, content in files.items():
+        if path.endswith(".properties"):
+            keys = [line.split("=", 1)[0].strip() for line in content.splitlines() if "=" in line and not line.lstrip().startswith("#")]
+            lines.append(f"{path}: {', '.join(keys)}")
+            continue
+        if not path.endswith(".java"):
+            lines.append(f"{path}")
+            continue
+        package = JAVA_PACKAGE_PATTERN.search(content)
+        types = [" ".join(t.split()) for t in JAVA_TYPE_PATTERN.findall(content)]
+        lines.append(f"{package.group(1) + ': ' if package else ''}{types[0] if types else path}")
+        lines.extend(f"    {' '.join(method.split())}" for method in JAVA_METHOD_PATTERN.findall(content))
+    return "\n".join(lines)
+
+
+def build_framework_section(framework_api):
+    if not framework_api:
+        return ""
+    return f"""
+        EXISTING FRAMEWORK (already in the project - do NOT output these files again;
+        import, extend and call them exactly as declared):
+{framework_api}"""
+
+
+def scaffold_api(framework, options=None):
+    """API summary of the deterministic project skeleton (scaffold.py) the generated code runs in"""
+    return summarize_framework_api(scaffold_files(framework, options))
+
+
+def generate_framework_layer(framework, options=None, ai=None):
+    """Generate the shared framework files once; returns {path: content}"""
+    return parse_generated_code(_default_ai(ai)(build_framework_prompt(framework, options or {})))
+
+
+# --- Combined-suite batching ---
+# Output tokens a combined suite may use per request (headroom below the provider cap for truncation-free answers)
+BATCH_OUTPUT_TOKENS = int(os.getenv("ROBOTEST_BATCH_OUTPUT_TOKENS", str(int(MAX_OUTPUT_TOKENS * 0.75))))
+BATCH_OVERHEAD_TOKENS = 1200  # suite class, imports and page class skeletons
+# Estimated output tokens per test case: (fixed, per step) - test method, assertions and page object methods
+CASE_OUTPUT_TOKENS = {"selenium": (200, 90), "rest_assured": (250, 60)}
+
+JAVA_MEMBER_NAME_PATTERN = re.compile(r"(\w+)\s*(\(|=|;)")
+JAVA_ANNOTATION_PATTERN = re.compile(r"@\w+(?:\s*\([^)]*\))?")
+
+
+def estimate_output_tokens(test_case, framework):
+    """Rough size of the code generated for one test case"""
+    fixed, per_step = CASE_OUTPUT_TOKENS.get(framework, CASE_OUTPUT_TOKENS["selenium"])
+    data = "".join(test_case.get('test_data', []) or [])
+    return fixed + per_step * len(test_case.get('test_steps', [])) + len(data) // 4
+
+
+def pack_batches(test_cases, framework, budget=None):
+    """Split test cases, in order, into batches whose estimated output fits the budget (at least one case each)"""
+    budget = (budget or BATCH_OUTPUT_TOKENS) - BATCH_OVERHEAD_TOKENS
+    batches, batch, size = [], [], 0
+    for test_case in test_cases:
+        tokens = estimate_output_tokens(test_case, framework)
+        if batch and size + tokens > budget:
+            batches.append(batch)
+            batch, size = [], 0
+        batch.append(test_case)
+        size += tokens
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def _split_java_type(source):
+    """(head, members, tail) of the first top-level type: text up to its body's '{', top-level member texts, closing '}' on"""
+    declaration = JAVA_TYPE_PATTERN.search(source)
+    start = source.find("{", declaration.end()) if declaration else -1
+    if start < 0:
+        return None
+    members, depth, member_start, i = [], 0, start + 1, start
+    while i < len(source):
+        char = source[i]
+        if source.startswith("//", i):
+            i = source.find("\n", i)
+            i = len(source) if i < 0 else i
+        elif source.startswith("/*", i):
+            i = source.find("*/", i)
+            i = len(source) if i < 0 else i + 1
+        elif char in "\"'":
+            # Skip string and char literals (escapes included)
+            i += 1
+            while i < len(source) and source[i] != char:
+                i += 2 if source[i] == "\\" else 1
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                if source[member_start:i].strip():
+                    members.append(source[member_start:i])
+                return source[:start + 1], members, source[i:]
+            if depth == 1:
+                members.append(source[member_start:i + 1])
+                member_start = i + 1
+        elif char == ";" and depth == 1:
+            members.append(source[member_start:i + 1])
+            member_start = i + 1
+        i += 1
+    return None
+
+
+def _member_key(member):
+    """Name and parameter list of a method, name of a field (annotations and comments ignored)"""
+    text = re.sub(r"//[^\n]*|/\*.*?\*/", "", member, flags=re.DOTALL)
+    text = JAVA_ANNOTATION_PATTERN.sub("", text)
+    match = JAVA_MEMBER_NAME_PATTERN.search(text)
+    if not match:
+        return " ".join(text.split())
+    if match.group(2) == "(":
+        params = text[match.end():text.find(")", match.end())]
+        return f"{match.group(1)}({','.join(param.split()[-2] if len(param.split()) > 1 else param.strip() for param in params.split(','))})"
+    return match.group(1)
+
+
+def merge_java_sources(existing, new):
+    """
+    Merge two versions of the same Java class (a page object written by two batches):
+    members and imports of `new` missing from `existing` are added. Falls back to `existing`.
+    """
+    if existing == new:
+        return existing
+    old_parts, new_parts = _split_java_type(existing), _split_java_type(new)
+    if not old_parts or not new_parts:
+        return existing
+    head, members, tail = old_parts
+    keys = {_member_key(member) for member in members if member.strip()}
+    added = [member for member in new_parts[1] if member.strip() and _member_key(member) not in keys]
+    imports = [line for line in new_parts[0].splitlines() if line.startswith("import ") and line not in head]
+    if imports:
+        last_import = head.rfind("\nimport ")
+        insert_at = head.find("\n", last_import + 1) if last_import >= 0 else head.find("\n", head.find("package "))
+        head = head[:insert_at + 1] + "\n".join(imports) + "\n" + head[insert_at + 1:]
+    if not added and not imports:
+        return existing
+    body = "".join(members)
+    extra = "".join(member if member.startswith("\n") else "\n" + member for member in added)
+    return head + body.rstrip() + "\n" + extra.rstrip() + "\n" + tail
+
+
+def merge_batch_files(batch_results):
+    """Merge the {path: content} files of several batches; classes written by more than one batch are merged"""
+    merged = {}
+    for files in batch_results:
+        for path, content in files.items():
+            if path in merged and path.endswith(".java"):
+                merged[path] = merge_java_sources(merged[path], content)
+            else:
+                merged.setdefault(path, content)
+    return merged
+
+
+def _iter_concurrently(fn, items, max_workers):
+    """Run fn(item) for each item on a thread pool; yields (item, result, error) as they complete"""
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items)))) as pool:
+        futures = {pool.submit(fn, item): index for index, item in enumerate(items)}
+        try:
+            for future in as_completed(futures):
+                item = items[futures[future]]
+                try:
+                    yield item, future.result(), None
+                except Exception as e:
+                    yield item, None, e
+        except BaseException:
+            # Cancelled (or failed) - don't start the remaining items
+            for future in futures:
+                future.cancel()
+            raise
+
+
+# --- Java validation and targeted repair ---
+REPAIR_JAVA = os.getenv("ROBOTEST_REPAIR_JAVA", "1") != "0"  # 0: check and fix imports only, no repair calls
+VALIDATION_FILE = "JAVA_VALIDATION.md"
+
+
+def build_java_repair_prompt(path, content, errors):
+    """Prompt to fix one Java file: just the file and the parser's errors"""
+    problems = "\n".join(f"        - {error}" for error in errors)
+    return f"""
+        This generated Java 17 file does not compile. Fix ONLY these problems and keep everything else
+        (package, imports, names, logic, comments) exactly as it is. If the file was cut off, complete it.
+{problems}
+
+        Return the complete corrected file, starting with the line "// FILE: {path}", and nothing else.
+
+// FILE: {path}
+{content}
+        """
+
+
+def repair_java_file(path, content, errors, ai=None):
+    """(content, errors) after one targeted repair call; the original is kept unless the repair has fewer errors"""
+    repaired = parse_generated_code(_default_ai(ai)(build_java_repair_prompt(path, content, errors)))
+    candidates = [code for name, code in repaired.items() if os.path.basename(name) == os.path.basename(path)]
+    candidates = candidates or list(repaired.values())[:1]
+    if not candidates:
+        return content, errors
+    new_errors, missing = check_java(candidates[0])
+    if len(new_errors) >= len(errors):
+        return content, errors
+    return (add_imports(candidates[0], missing) if missing else candidates[0]), new_errors
+
+
+def java_type_names(paths):
+    return {os.path.basename(path)[:-len(".java")] for path in paths if path.endswith(".java")}
+
+
+def validate_java_files(groups, ai=None, on_progress=None, project_types=()):
+    """
+    Check every .java file in {owner: {path: content}} (java_syntax.check_java). Missing imports of
+    well-known classes are added locally; files that still have errors get one repair call each, concurrently.
+    project_types: names of project classes outside groups (scaffold, framework layer).
+    Returns (groups, rows) with rows [(owner, path, problems, outcome)] for the files that needed a fix.
+    """
+    progress = on_progress or (lambda fraction, message: None)
+    java = [(owner, path) for owner, files in groups.items() for path in files if path.endswith(".java")]
+    project_types = java_type_names(path for _, path in java) | set(project_types)
+    groups = {owner: dict(files) for owner, files in groups.items()}
+    rows, failing = [], []
+    for owner, path in java:
+        errors, missing = check_java(groups[owner][path], project_types)
+        if missing:
+            groups[owner][path] = add_imports(groups[owner][path], missing)
+            if not errors:
+                rows.append((owner, path, "missing " + ", ".join(missing), "imports added"))
+        if errors:
+            failing.append((owner, path, errors, missing))
+    if failing and REPAIR_JAVA:
+        progress(1.0, f"Repairing {len(failing)} Java files")
+
+        def repair(item):
+            owner, path, errors, _ = item
+            return repair_java_file(path, groups[owner][path], errors, ai=ai)
+
+        for (owner, path, errors, missing), result, error in _iter_concurrently(repair, failing, AUTOMATION_CONCURRENCY):
+            problems = "; ".join(errors + (["missing " + ", ".join(missing)] if missing else []))
+            if error:
+                rows.append((owner, path, problems, f"still invalid (repair failed: {error})"))
+                continue
+            content, left = result
+            groups[owner][path] = content
+            outcome = "repaired" if not left else ("still invalid" if left == errors else f"partly repaired, left: {'; '.join(left)}")
+            rows.append((owner, path, problems, outcome))
+    else:
+        rows.extend((owner, path, "; ".join(errors), "not repaired") for owner, path, errors, _ in failing)
+    return groups, rows
+
+
+def build_validation_report(checked, rows):
+    """JAVA_VALIDATION.md: what the local syntax check found and how it was fixed"""
+    invalid = sum(1 for row in rows if row[3].startswith(("still", "partly", "not")))
+    lines = ["# Java Validation", "",
+             f"{checked} Java files checked: {checked - len(rows)} valid as generated, "
+             f"{len(rows) - invalid} fixed, {invalid} still invalid.", ""]
+    if rows:
+        lines += ["| File | Problems | Outcome |", "|---|---|---|"]
+        lines += [f"| {owner + ': ' if owner else ''}{path} | {problems.replace('|', '/')} | {outcome.replace('|', '/')} |"
+                  for owner, path, problems, outcome in rows]
+    return "\n".join(lines) + "\n"
+
+
+def validate_suite_files(groups, ai=None, on_progress=None, project_types=()):
+    """validate_java_files plus its report, or (groups, None) if there was no Java to check"""
+    checked = sum(path.endswith(".java") for files in groups.values() for path in files)
+    if not checked:
+        return groups, None
+    groups, rows = validate_java_files(groups, ai=ai, on_progress=on_progress, project_types=project_types)
+    return groups, build_validation_report(checked, rows)
+
+
+# --- Automation suites ---
+AUTOMATION_FRAMEWORKS = ("selenium", "rest_assured", "unit_spec")
+AUTOMATION_CONCURRENCY = int(os.getenv("ROBOTEST_AUTOMATION_CONCURRENCY", "4"))
+CONFLICTS_FILE = "FILE_CONFLICTS.md"
+# Test case fields the generated code depends on (with the framework, mode and options)
+FINGERPRINT_FIELDS = ("id", "title", "preconditions", "test_data", "test_steps", "expected_results", "test_type")
+
+
+def _digest(value):
+    return hashlib.sha1(json.dumps(value, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()
+
+
+def suite_fingerprints(framework, test_cases, combined=False, options=None):
+    """
+    {results key: fingerprint} of what each key of a generate_automation_suite (or "auto") run depends on.
+    Stored next to the results, they tell which test cases changed since their code was generated.
+    """
+    settings = _digest([framework, bool(combined), options or {}])
+    case_digests = [_digest([settings, {field: tc.get(field) for field in FINGERPRINT_FIELDS}]) for tc in test_cases]
+    if framework == AUTO_KEY or (combined and framework != "unit_spec"):
+        return {AUTO_KEY if framework == AUTO_KEY else "combined": _digest(case_digests)}
+    fingerprints = {tc['id']: digest for tc, digest in zip(test_cases, case_digests)}
+    if framework != "unit_spec":
+        # The framework layer depends on the options, and on whether there was more than one test case
+        fingerprints[FRAMEWORK_KEY] = _digest([settings, len(test_cases) > 1])
+    return fingerprints
+
+
+def reusable_results(fingerprints, previous, previous_fingerprints):
+    """The previous results whose fingerprint still matches, for generate_automation_suite(reuse=...)"""
+    return {key: previous[key] for key, fingerprint in fingerprints.items()
+            if key in previous and (previous_fingerprints or {}).get(key) == fingerprint}
+
+
+def generate_automation_suite(framework, test_cases, combined=False, options=None, ai=None, on_progress=None, on_error=None,
+                              reuse=None, concurrency=None):
+    """
+    Generate automation for a selection of test cases.
+    framework: "selenium", "rest_assured" or "unit_spec"
+    options: keyword arguments for the framework's generator (design flags, custom_prompt, api_spec, ...)
+    on_progress(fraction, message) reports progress, on_error(message) each test case that failed.
+    Returns {"combined": files} for a combined suite (batched to BATCH_OUTPUT_TOKENS), {case_id: files} for separate classes and
+    {case_id: markdown} for unit specs. A failing test case does not discard the others.
+    Separate classes for several cases are generated in two phases: the shared framework layer once, then
+    thin per-case tests against its API, concurrency (default AUTOMATION_CONCURRENCY) at a time. Selenium and REST Assured results
+    include the scaffold.py project skeleton (in "combined", or under FRAMEWORK_KEY with the framework layer).
+    Generated Java is syntax-checked locally and broken files get targeted repair calls (VALIDATION_FILE).
+    Separate files go through one ProjectFileMap: re-emitted framework files are dropped, files several cases
+    wrote identically move to FRAMEWORK_KEY, and differing versions of a path are listed in CONFLICTS_FILE.
+    reuse: results that are still current (see reusable_results) - those test cases, the framework layer or the
+    whole combined suite are taken as they are instead of being generated again.
+    """
+    options = options or {}
+    progress = on_progress or (lambda fraction, message: None)
+    reuse = reuse or {}
+    concurrency = concurrency or AUTOMATION_CONCURRENCY
+
+    framework_api = scaffold_api(framework, options) if framework != "unit_spec" else None
+    if combined and framework != "unit_spec":
+        if "combined" in reuse:
+            return {"combined": reuse["combined"]}
+        return _generate_combined_suite(framework, test_cases, options, framework_api, ai, progress, on_error, concurrency)
+
+    results = {tc['id']: reuse[tc['id']] for tc in test_cases if tc['id'] in reuse}
+    stale = [tc for tc in test_cases if tc['id'] not in results]
+    total = len(stale)
+    errors = []
+    framework_files = {}
+    if FRAMEWORK_KEY in reuse and framework != "unit_spec":
+        # Generated for these options before: base classes and shared pages are the API the new tests build on
+        skeleton = scaffold_files(framework, options)
+        framework_files = {path: content for path, content in reuse[FRAMEWORK_KEY].items() if path not in (CONFLICTS_FILE, VALIDATION_FILE)}
+        framework_api += "\n" + summarize_framework_api({path: content for path, content in framework_files.items() if path not in skeleton})
+    elif framework != "unit_spec" and len(test_cases) > 1 and stale:
+        # Phase 1: the shared framework layer once, instead of again in every test case's output
+        progress(0.0, "Generating shared framework")
+        framework_files = generate_framework_layer(framework, options, ai=ai)
+        if framework_files:
+            framework_api += "\n" + summarize_framework_api(framework_files)
+    base_files = {normalize_path(path, content): content for path, content in {**scaffold_files(framework, options), **framework_files}.items()}
+    shared = {os.path.basename(path): path for path in base_files}
+    project = ProjectFileMap()
+    project.add(FRAMEWORK_KEY, base_files)
+
+    def generate_case(test_case):
+        if framework == "unit_spec":
+            return generate_unit_test_specifications(test_case, ai=ai)
+        if framework == "rest_assured":
+            files = parse_generated_code(generate_rest_assured_code(test_case, framework_api=framework_api, ai=ai, **options))
+        else:
+            files = parse_generated_code(generate_test_case_automation_code(test_case, framework_api=framework_api, ai=ai, **options))
+        # Scaffold and framework files the model re-emitted anyway land on the shared path (and are dropped below)
+        return {shared.get(os.path.basename(path), normalize_path(path, content)): content for path, content in files.items()}
+
+    # Phase 2: thin per-case tests, concurrently
+    offset = 1 if framework_files and FRAMEWORK_KEY not in reuse else 0
+    progress(offset / max(total + offset, 1), f"Generating {total} test cases" + (f" ({len(results)} unchanged)" if results else ""))
+    for done, (test_case, files, error) in enumerate(_iter_concurrently(generate_case, stale, concurrency), 1):
+        if error:
+            errors.append(f"{test_case['id']}: {error}")
+            if on_error:
+                on_error(f"⚠️ {test_case['id']} failed: {error}")
+        else:
+            results[test_case['id']] = files
+        progress((done + offset) / (total + offset), f"Generated {test_case['id']} ({done}/{total})")
+    if errors and not results:
+        raise Exception("; ".join(errors))
+    # Keep the selection order; the project skeleton goes with the shared framework files
+    ordered = {}
+    if framework != "unit_spec":
+        for test_case in test_cases:
+            project.add(test_case['id'], results.get(test_case['id'], {}))
+        promoted = {path: project.files[path] for path in project.shared_paths() if path not in base_files}
+        for case_id, files in results.items():
+            results[case_id] = {path: content for path, content in files.items() if path not in base_files and path not in promoted}
+        # Syntax check (and targeted repair) of what this run generated; reused files were checked before
+        generated = {FRAMEWORK_KEY: {**({} if FRAMEWORK_KEY in reuse else framework_files), **promoted}}
+        generated.update((tc['id'], results[tc['id']]) for tc in stale if tc['id'] in results)
+        generated, validation = validate_suite_files(generated, ai=ai, on_progress=progress,
+                                                     project_types=java_type_names(base_files))
+        shared_files = {**framework_files, **generated.pop(FRAMEWORK_KEY)}
+        results.update(generated)
+        case_files = {path: content for files in results.values() for path, content in files.items()}
+        ordered[FRAMEWORK_KEY] = merge_with_scaffold(framework, options, shared_files, {**shared_files, **case_files})
+        if validation:
+            ordered[FRAMEWORK_KEY][VALIDATION_FILE] = validation
+        report = project.conflict_report("Re-emitted framework files keep the shared version; each test case keeps its own version of the others.")
+        if report:
+            ordered[FRAMEWORK_KEY][CONFLICTS_FILE] = report
+            if on_error:
+                on_error(f"⚠️ {len(project.conflicts())} files were generated differently by different test cases - see {CONFLICTS_FILE}")
+    ordered.update((tc['id'], results[tc['id']]) for tc in test_cases if tc['id'] in results)
+    return ordered
+
+
+def _generate_combined_suite(framework, test_cases, options, framework_api, ai, progress, on_error, concurrency):
+    """
+    Combined suite in output-budget batches: one suite class per batch (GeneratedTestSuite1, ...),
+    generated concurrently after a shared framework layer, with page classes merged across batches.
+    """
+    generate = generate_combined_rest_assured_code if framework == "rest_assured" else generate_combined_automation_code
+    suite_name = "ApiTestSuite" if framework == "rest_assured" else "GeneratedTestSuite"
+    batches = pack_batches(test_cases, framework)
+    if len(batches) == 1:
+        progress(0.0, f"Generating combined suite for {len(test_cases)} test cases")
+        code = generate(test_cases, framework_api=framework_api, ai=ai, **options)
+        return _validated_combined(framework, options, parse_generated_code(code), ai, progress) if code else {}
+
+    # Base classes once, so batches don't each write (and disagree on) their own
+    progress(0.0, f"Generating shared framework for {len(batches)} batches")
+    framework_files = generate_framework_layer(framework, options, ai=ai)
+    if framework_files:
+        framework_api += "\n" + summarize_framework_api(framework_files)
+    shared = {os.path.basename(path) for path in {**scaffold_files(framework, options), **framework_files}}
+
+    def generate_batch(numbered_batch):
+        number, batch = numbered_batch
+        code = generate(batch, framework_api=framework_api, suite_name=f"{suite_name}{number}", ai=ai, **options)
+        return {normalize_path(path, content): content for path, content in parse_generated_code(code).items()
+                if os.path.basename(path) not in shared}
+
+    batch_results, errors = {}, []
+    numbered = list(enumerate(batches, 1))
+    for done, ((number, batch), files, error) in enumerate(_iter_concurrently(generate_batch, numbered, concurrency), 1):
+        label = f"batch {number} ({batch[0]['id']}..{batch[-1]['id']})"
+        if error:
+            errors.append(f"{label}: {error}")
+            if on_error:
+                on_error(f"⚠️ {label} failed: {error}")
+        else:
+            batch_results[number] = files
+        progress((done + 1) / (len(batches) + 1), f"Generated {label} ({done}/{len(batches)})")
+    if not batch_results:
+        raise Exception("; ".join(errors))
+    # Batch order, so merged page classes don't depend on which batch finished first
+    merged = merge_batch_files([framework_files] + [batch_results[number] for number in sorted(batch_results)])
+    return _validated_combined(framework, options, merged, ai, progress)
+
+
+def _validated_combined(framework, options, files, ai, progress):
+    """{"combined": project} after the Java syntax check and repair, with its report"""
+    checked, validation = validate_suite_files({"": files}, ai=ai, on_progress=progress,
+                                               project_types=java_type_names(scaffold_files(framework, options)))
+    combined = merge_with_scaffold(framework, options, checked[""])
+    if validation:
+        combined[VALIDATION_FILE] = validation
+    return {"combined": combined}
+
+
+# --- Auto routing (mixed selections) ---
+AUTO_KEY = "auto"  # automation results key of a routed run's single download
+TEST_TYPE_FRAMEWORKS = {"ui": "selenium", "api": "rest_assured", "unit_spec": "unit_spec", "mixed": "selenium"}
+AUTO_FOLDERS = {"selenium": "selenium", "rest_assured": "rest-assured", "unit_spec": "unit-specs"}
+
+
+def test_case_frameworks(test_cases):
+    """
+    (framework, source) per test case: the generator's test_type when it gave a known one,
+    else the classifier's (one batch for all undecided cases)
+    """
+    given = [str(tc.get('test_type') or "").strip().lower() for tc in test_cases]
+    undecided = [tc for tc, test_type in zip(test_cases, given) if test_type not in TEST_TYPE_FRAMEWORKS]
+    detected = iter(classify_test_types(undecided))
+    return [(TEST_TYPE_FRAMEWORKS[test_type], "test_type") if test_type in TEST_TYPE_FRAMEWORKS
+            else (TEST_TYPE_FRAMEWORKS[next(detected)], "detected") for test_type in given]
+
+
+def route_test_cases(test_cases):
+    """{framework: [test cases]} for the frameworks that got any, in AUTOMATION_FRAMEWORKS order"""
+    routed = {framework: [] for framework in AUTOMATION_FRAMEWORKS}
+    for test_case, (framework, _) in zip(test_cases, test_case_frameworks(test_cases)):
+        routed[framework].append(test_case)
+    return {framework: cases for framework, cases in routed.items() if cases}
+
+
+def suite_files(framework, results):
+    """One framework's generate_automation_suite results as a single {path: content} project"""
+    if framework == "unit_spec":
+        return {f"{case_id}_unit_spec.md": markdown for case_id, markdown in results.items()}
+    if "combined" in results:
+        return dict(results["combined"])
+    # Separate classes: skeleton and framework layer plus every case, pages written by several cases merged
+    return merge_batch_files([results.get(FRAMEWORK_KEY, {})] + [files for key, files in results.items() if key != FRAMEWORK_KEY])
+
+
+def build_routing_report(test_cases):
+    rows = [f"| {tc['id']} | {tc.get('title', '').replace('|', '/')} | {framework} | {source} |"
+            for tc, (framework, source) in zip(test_cases, test_case_frameworks(test_cases))]
+    return "# Automation Routing\n\n| Test Case | Title | Framework | Decided by |\n|---|---|---|---|\n" + "\n".join(rows) + "\n"
+
+
+def generate_auto_automation(test_cases, combined=False, options=None, ai=None, on_progress=None, on_error=None, reuse=None):
+    """
+    Route each test case to Selenium, REST Assured or unit specs (test_type, else type_classifier)
+    and run the three pipelines concurrently over their subsets.
+    options: {framework: options} for generate_automation_suite.
+    Returns {AUTO_KEY: files}: one download with a folder per framework (AUTO_FOLDERS) and ROUTING.md.
+    A failing framework does not discard the others. reuse: {AUTO_KEY: files} if nothing changed since they were generated.
+    """
+    if reuse and AUTO_KEY in reuse:
+        return {AUTO_KEY: reuse[AUTO_KEY]}
+    options = options or {}
+    progress = on_progress or (lambda fraction, message: None)
+    routed = route_test_cases(test_cases)
+    fractions = {framework: 0.0 for framework in routed}
+
+    def report(framework, fraction, message):
+        fractions[framework] = fraction
+        done = sum(fractions[fw] * len(routed[fw]) for fw in routed) / len(test_cases)
+        progress(done, f"{AUTO_FOLDERS[framework]}: {message}")
+
+    def run(framework):
+        return generate_automation_suite(
+            framework, routed[framework], combined, options.get(framework), ai=ai,
+            on_progress=partial(report, framework), on_error=on_error,
+        )
+
+    progress(0.0, ", ".join(f"{len(cases)} {AUTO_FOLDERS[framework]}" for framework, cases in routed.items()))
+    files, errors = {"ROUTING.md": build_routing_report(test_cases)}, []
+    outputs = {}
+    for framework, results, error in _iter_concurrently(run, list(routed), len(routed)):
+        # Report first: raises here if the job was cancelled
+        report(framework, 1.0, "failed" if error else "done")
+        if error:
+            errors.append(f"{AUTO_FOLDERS[framework]}: {error}")
+            if on_error:
+                on_error(f"⚠️ {AUTO_FOLDERS[framework]} failed: {error}")
+        else:
+            outputs[framework] = results
+    if not outputs:
+        raise Exception("; ".join(errors))
+    for framework in routed:
+        if framework in outputs:
+            files.update((f"{AUTO_FOLDERS[framework]}/{path}", content) for path, content in suite_files(framework, outputs[framework]).items())
+    return {AUTO_KEY: files}
+
+
+# --- Unit test specifications ---
+def build_unit_spec_prompt(test_case):
+    return f"""
+        You are a senior QA engineer creating unit test specifications for developers.
+
+        Based on the following test case:
+        - Title: {test_case['title']}
+        - Steps:
+        {chr(10).join(test_case['test_steps'])}
+        - Expected Results:
+        {chr(10).join(test_case['expected_results'])}
+        - Preconditions:
+        {chr(10).join(test_case.get('preconditions', []))}
+
+        Generate a detailed unit test specification document that developers can use to implement unit tests.
+
+        Include the following sections:
+
+        1. **Overview**
+           - Brief description of what needs to be tested
+           - Component/Module being tested
+
+        2. **Test Scenarios**
+           - List all test scenarios with clear descriptions
+           - Include positive, negative, and edge cases
+
+        3. **Input Parameters**
+           - List all input parameters for each scenario
+           - Include valid and invalid values
+           - Specify data types and constraints
+
+        4. **Expected Outputs**
+           - Expected return values
+           - Expected exceptions/errors
+           - State changes to verify
+
+        5. **Mock/Stub Requirements**
+           - External dependencies to mock
+           - Expected mock behavior
+
+        6. **Test Data**
+           - Sample test data for each scenario
+           - Boundary values
+
+        7. **Assertions**
+           - Specific assertions to implement
+           - Verification points
+
+        Format the output in clean, readable Markdown that developers can directly use.
+        """
+
+
+# Function to generate unit test specifications for developers
+def generate_unit_test_specifications(test_case, output_format="markdown", ai=None):
+    """
+    Generate detailed unit test specifications for developers
+    Provides clear requirements for what to test at component level
+    """
+    return _default_ai(ai)(build_unit_spec_prompt(test_case))
+
+
+# --- Test plans ---
+def build_test_plan_prompt(requirements_content, timeline_str, testers, custom_instructions=""):
+    """testers: [{"specialization": "Manual", "experience": 2}, ...]"""
+    # Build team string
+    team_str = "\n".join([
+        f"{t['specialization']} Tester {idx+1}: {t['experience']} years of experience"
+        for idx, t in enumerate(testers)
+    ])
+
+    # Build prompt
+    prompt = f"""You are an experienced QA Lead. Generate a comprehensive Test Plan based on the following requirements.
+
+REQUIREMENTS DOCUMENT:
+{requirements_content}
+
+EXECUTION TIMELINE:
+{timeline_str}
+
+TEST TEAM:
+{team_str}
+
+Please generate a detailed Test Plan in Markdown format that includes:
+
+1. **Test Plan Overview** - Brief introduction and purpose
+
+2. **Test Scope and Objectives** - What will be tested and goals
+
+3. **Test Strategy** - Overall approach and methodology
+
+4. **Test Environment Requirements** - Infrastructure and setup needs
+
+5. **Test Deliverables** - List of documents and artifacts
+
+6. **Resource Allocation** - Presented as a TABLE with columns:
+   - Tester Name/ID
+   - Years of Experience
+   - Specialization
+   - Assigned Tasks/Modules
+   - Estimated Effort
+   - Responsibilities
+
+7. **Task Allocation** - Presented as a TABLE with columns:
+   - Task ID
+   - Task Description
+   - Assigned Tester
+   - Priority
+   - Status
+   - Dependencies
+   - Estimated Duration
+
+8. **Test Schedule/Timeline** - Presented as a TABLE with columns:
+   - Phase/Milestone
+   - Start Date
+   - End Date
+   - Duration
+   - Responsible Tester
+   - Deliverables
+
+9. **Risk Assessment** - Presented as a TABLE with columns:
+   - Risk ID
+   - Risk Description
+   - Probability (High/Medium/Low)
+   - Impact (High/Medium/Low)
+   - Mitigation Strategy
+   - Owner
+
+10. **Entry and Exit Criteria** - Clear criteria for starting and completing testing
+
+IMPORTANT: Use proper Markdown formatting with tables, headers, and bullet points."""
+
+    # Add custom instructions if provided
+    if custom_instructions:
+        prompt += f"\n\nADDITIONAL CUSTOM INSTRUCTIONS:\n{custom_instructions}"
+    return prompt
+
+
+def generate_test_plan(requirements_content, timeline_str, testers, custom_instructions="", ai=None):
+    """Generate a Markdown test plan"""
+    return _default_ai(ai)(build_test_plan_prompt(requirements_content, timeline_str, testers, custom_instructions))
+
+
+# --- Bug reports ---
+def build_bug_report_prompt(bug_description, env, browser, report_lang, screenshot_count=0):
+    screenshot_section = ""
+    if screenshot_count:
+        screenshot_section = f"""
+                    SCREENSHOTS:
+                    {screenshot_count} screenshot(s) of the issue are attached. Use what they show (error messages,
+                    field values, UI state, URLs) in the Description and Actual Result, and mention anything
+                    visible that contradicts or adds to the notes.
+"""
+    return f"""
+                    Act as a Senior QA Engineer. Convert this unstructured bug description into a standard, professional Bug Report for JIRA/DevOps.
+
+                    CONTEXT:
+                    Environment: {env}
+                    Browser: {browser}
+                    Target Language: {report_lang}
+
+                    UNSTRUCTURED INPUT:
+                    {bug_description}
+{screenshot_section}
+                    INSTRUCTIONS:
+                    1. Create a clear, concise Title.
+                    2. Estimate Severity and Priority based on the context.
+                    3. Extract clear Steps to Reproduce.
+                    4. Clearly separate Expected and Actual results.
+                    5. Use professional technical language.
+                    6. LANGUAGE HANDLING:
+                       - If Target Language is English: TRANSLATE any non-English input (like Arabic) into professional English.
+                       - If Target Language is Arabic: Translate content to professional technical Arabic, keeping technical terms in English.
+
+                    OUTPUT FORMAT (Markdown):
+                    ### [Bug ID]: [Concise Title in Target Language]
+
+                    **Severity**: [Critical/High/Medium/Low] | **Priority**: [High/Medium/Low]
+
+                    **Description**:
+                    [Professional summary of the issue]
+
+                    **Preconditions**:
+                    [Any implied setup]
+
+                    **Steps to Reproduce**:
+                    1. [Step 1]
+                    2. [Step 2]
+                    ...
+
+                    **Actual Result**:
+                    [What happened]
+
+                    **Expected Result**:
+                    [What should have happened]
+
+                    **Environment details**:
+                    {env} | {browser}
+                    """
+
+
+def generate_bug_report(bug_description, env, browser, report_lang="English", screenshots=None, ai=None, vision=True):
+    """
+    Turn rough bug notes into a Markdown bug report.
+    screenshots: optional [{"data": bytes, "mime_type": str}], downscaled before sending to the model.
+    vision: False for text-only models (ai_providers.supports_vision) - screenshots are then left out of the request and the prompt.
+    """
+    if not vision:
+        screenshots = None
+    prompt = build_bug_report_prompt(bug_description, env, browser, report_lang, len(screenshots or []))
+    if not screenshots:
+        return _default_ai(ai)(prompt)
+    images = [process_for_vision(shot["data"], shot["mime_type"]) for shot in screenshots]
+    return _default_ai(ai)(prompt, images=images)
@@ -0,0 +1,108 @@
+"""
+Screenshot pipeline: downscale and recompress images before they are sent
+to vision-capable providers or stored as attachments.
+
+A full-resolution PNG screenshot is often several MB; vision models resize
+inputs to roughly 1-1.5k pixels on the long edge anyway, so sending more only
+costs upload time and input tokens. Processed images are cached by the hash
+of the original bytes and the settings.
+"""
+import hashlib
+import threading
+from io import BytesIO
+from collections import OrderedDict
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow ships with Streamlit; without it images pass through unchanged
+    Image = None
+
+# Sent to vision models with a bug report
+VISION_MAX_EDGE = 1280
+VISION_QUALITY = 70
+# Kept with manual test cases (viewed by people, so a little sharper)
+ATTACHMENT_MAX_EDGE = 1920
+ATTACHMENT_QUALITY = 85
+
+IMAGE_FORMAT = "WEBP"  # accepted by Gemini, Claude, OpenAI and GitHub Models; JPEG if Pillow lacks WebP
+CACHE_MAX_BYTES = 64 << 20
+PROCESSABLE_TYPES = ("image/png", "image/jpeg", "image/jpg", "image/webp", "image/bmp")  # not GIF: animation
+
+_cache = OrderedDict()
+_cache_bytes = 0
+_cache_lock = threading.Lock()
+
+
+def _output_format(image_format):
+    if image_format == "WEBP":
+        from PIL import features
+        if not features.check("webp"):
+            return "JPEG"
+    return image_format
+
+
+def process_image(data, mime_type="image/png", max_edge=VISION_MAX_EDGE, quality=VISION_QUALITY, image_format=IMAGE_FORMAT):
+    """
+    Downscale (longest edge <= max_edge) and recompress image bytes.
+    Returns {"data", "mime_type", "width", "height", "original_bytes", "bytes", "saved_bytes"};
+    the original is kept if recompressing would not make it smaller.
+    """
+    key = hashlib.sha256(data).hexdigest() + f":{max_edge}:{quality}:{image_format}"
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    result = {"data": data, "mime_type": mime_type, "width": None, "height": None,
+              "original_bytes": len(data), "bytes": len(data), "saved_bytes": 0}
+    image = None
+    if Image is not None and mime_type in PROCESSABLE_TYPES:
+        try:
+            image = Image.open(BytesIO(data))
+            image = ImageOps.exif_transpose(image)  # phone screenshots carry rotation in EXIF
+        except OSError:
+            image = None  # not a readable image - pass it through
+    if image is not None:
+        image.thumbnail((max_edge, max_edge), Image.LANCZOS)
+        output_format = _output_format(image_format)
+        if output_format == "JPEG":
+            image = image.convert("RGB")
+        elif image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.mode or "transparency" in image.info else "RGB")
+        buffer = BytesIO()
+        options = {"method": 4} if output_format == "WEBP" else {"optimize": True}
+        image.save(buffer, output_format, quality=quality, **options)
+        result["width"], result["height"] = image.size
+        if buffer.tell() < len(data):
+            result.update(data=buffer.getvalue(), mime_type=f"image/{output_format.lower()}",
+                          bytes=buffer.tell(), saved_bytes=len(data) - buffer.tell())
+
+    global _cache_bytes
+    with _cache_lock:
+        if key not in _cache:
+            _cache[key] = result
+            _cache_bytes += result["bytes"]
+        while _cache_bytes > CACHE_MAX_BYTES and len(_cache) > 1:
+            _, evicted = _cache.popitem(last=False)
+            _cache_bytes -= evicted["bytes"]
+    return result
+
+
+def process_for_vision(data, mime_type="image/png"):
+    return process_image(data, mime_type, VISION_MAX_EDGE, VISION_QUALITY)
+
+
+def process_for_attachment(data, mime_type="image/png"):
+    return process_image(data, mime_type, ATTACHMENT_MAX_EDGE, ATTACHMENT_QUALITY)
+
+
+def describe_savings(results):
+    """"2.4 MB -> 180 KB (93% smaller)" for one or more processed images"""
+    original = sum(r["original_bytes"] for r in results)
+    processed = sum(r["bytes"] for r in results)
+
+    def size(n):
+        return f"{n / 1e6:.1f} MB" if n >= 1e6 else f"{n / 1e3:.0f} KB"
+
+    saved = 100 * (original - processed) / original if original else 0
+    return f"{size(original)} -> {size(processed)} ({saved:.0f}% smaller)"
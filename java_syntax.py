@@ -0,0 +1,217 @@
+"""
+Local syntax check for generated Java files (no JDK needed).
+
+A single-pass lexer (strings, text blocks, chars, comments) feeds structural
+checks that catch what generated code usually gets wrong: unbalanced or
+mismatched brackets (often a truncated response), code after the class body,
+markdown left in the file, misplaced package/import lines, and well-known
+library classes used without an import. Missing imports are fixed locally
+with add_imports; everything else goes to a targeted repair prompt.
+"""
+import re
+
+TOKEN_PATTERN = re.compile(r'''
+    (?P<space>\s+)
+  | (?P<comment>//[^\n]*|/\*[\s\S]*?\*/)
+  | (?P<text_block>"""[\s\S]*?(?<!\\)""")
+  | (?P<string>"(?:[^"\\\n]|\\.)*")
+  | (?P<char>'(?:[^'\\\n]|\\.)+')
+  | (?P<name>[A-Za-z_$][\w$]*)
+  | (?P<number>\.?\d[\w.]*(?:[eEpP][+-]\d+)?\w*)
+  | (?P<operator>\.\.\.|::|->|[{}()\[\];,.@=<>!~?:&|+\-*/^%])
+''', re.VERBOSE)
+BRACKETS = {")": "(", "]": "[", "}": "{"}
+TYPE_KEYWORDS = ("class", "interface", "enum", "record")
+MODIFIERS = ("public", "protected", "private", "abstract", "final", "static", "sealed", "non", "strictfp")
+MAX_ERRORS = 10
+
+# Library classes generated tests use, by simple name (only these are checked for a missing import)
+KNOWN_IMPORTS = {
+    **{name: f"org.openqa.selenium.{name}" for name in (
+        "WebDriver", "WebElement", "By", "Keys", "JavascriptExecutor", "TakesScreenshot", "OutputType", "Alert",
+        "Dimension", "StaleElementReferenceException", "TimeoutException", "ElementClickInterceptedException")},
+    "ChromeDriver": "org.openqa.selenium.chrome.ChromeDriver",
+    "ChromeOptions": "org.openqa.selenium.chrome.ChromeOptions",
+    "FirefoxDriver": "org.openqa.selenium.firefox.FirefoxDriver",
+    "FirefoxOptions": "org.openqa.selenium.firefox.FirefoxOptions",
+    "EdgeDriver": "org.openqa.selenium.edge.EdgeDriver",
+    "EdgeOptions": "org.openqa.selenium.edge.EdgeOptions",
+    "RemoteWebDriver": "org.openqa.selenium.remote.RemoteWebDriver",
+    "Actions": "org.openqa.selenium.interactions.Actions",
+    **{name: f"org.openqa.selenium.support.ui.{name}" for name in ("WebDriverWait", "ExpectedConditions", "Select", "FluentWait")},
+    **{name: f"org.openqa.selenium.support.{name}" for name in ("PageFactory", "FindBy", "FindBys", "FindAll", "How")},
+    **{name: f"org.testng.annotations.{name}" for name in (
+        "Test", "BeforeMethod", "AfterMethod", "BeforeClass", "AfterClass", "BeforeSuite", "AfterSuite",
+        "BeforeTest", "AfterTest", "DataProvider", "Parameters", "Listeners")},
+    "Assert": "org.testng.Assert",
+    "SoftAssert": "org.testng.asserts.SoftAssert",
+    **{name: f"org.testng.{name}" for name in ("ITestResult", "ITestListener", "ITestContext", "Reporter")},
+    "RestAssured": "io.restassured.RestAssured",
+    "Response": "io.restassured.response.Response",
+    "ValidatableResponse": "io.restassured.response.ValidatableResponse",
+    "RequestSpecification": "io.restassured.specification.RequestSpecification",
+    "ResponseSpecification": "io.restassured.specification.ResponseSpecification",
+    "RequestSpecBuilder": "io.restassured.builder.RequestSpecBuilder",
+    "ResponseSpecBuilder": "io.restassured.builder.ResponseSpecBuilder",
+    "ContentType": "io.restassured.http.ContentType",
+    "JsonPath": "io.restassured.path.json.JsonPath",
+    "AllureRestAssured": "io.qameta.allure.restassured.AllureRestAssured",
+    **{name: f"io.qameta.allure.{name}" for name in ("Allure", "Step", "Description", "Epic", "Feature", "Story", "Severity", "SeverityLevel")},
+    **{name: f"org.apache.logging.log4j.{name}" for name in ("Logger", "LogManager")},
+    **{name: f"java.util.{name}" for name in (
+        "List", "ArrayList", "Map", "HashMap", "LinkedHashMap", "Set", "HashSet", "Arrays", "Collections",
+        "Properties", "Objects", "Iterator", "UUID", "Random")},
+    "Duration": "java.time.Duration",
+    **{name: f"java.io.{name}" for name in ("File", "IOException", "FileInputStream", "InputStream", "FileReader", "UncheckedIOException")},
+    **{name: f"java.nio.file.{name}" for name in ("Files", "Path", "Paths")},
+    "ObjectMapper": "com.fasterxml.jackson.databind.ObjectMapper",
+}
+# Methods generated tests call unqualified, from a static import
+KNOWN_STATIC_IMPORTS = {
+    "given": "io.restassured.RestAssured.given",
+    **{name: f"org.hamcrest.Matchers.{name}" for name in (
+        "equalTo", "notNullValue", "nullValue", "hasSize", "hasItem", "hasItems", "hasKey", "containsString",
+        "greaterThan", "lessThan", "greaterThanOrEqualTo", "lessThanOrEqualTo", "everyItem", "anyOf", "allOf")},
+}
+IMPORT_LINE_PATTERN = re.compile(r"^\s*import\s+(static\s+)?([\w.]+(?:\.\*)?)\s*;", re.MULTILINE)
+PACKAGE_LINE_PATTERN = re.compile(r"^\s*package\s+[\w.]+\s*;[^\n]*\n?", re.MULTILINE)
+
+
+def tokenize(source):
+    """[(kind, text, line)] without spaces and comments, and the first lexical error ("line N: ...") or None"""
+    tokens, position, line = [], 0, 1
+    while position < len(source):
+        match = TOKEN_PATTERN.match(source, position)
+        if match is None:
+            rest = source[position:position + 3]
+            if rest.startswith('"""'):
+                problem = "unterminated text block"
+            elif rest.startswith(("\"", "'")):
+                problem = "unterminated string literal"
+            elif rest.startswith("/*"):
+                problem = "unterminated comment"
+            elif rest.startswith("`"):
+                problem = "unexpected '`' (markdown fence left in the file?)"
+            else:
+                problem = f"unexpected character {source[position]!r}"
+            return tokens, f"line {line}: {problem}"
+        kind, text = match.lastgroup, match.group()
+        if kind not in ("space", "comment"):
+            tokens.append((kind, text, line))
+        line += text.count("\n")
+        position = match.end()
+    return tokens, None
+
+
+def _structure_errors(tokens):
+    """Bracket matching and package/import/type order at the top level"""
+    errors, stack = [], []
+    seen_type = seen_import = closed_type = False
+    for index, (kind, text, line) in enumerate(tokens):
+        if kind != "operator" and kind != "name":
+            continue
+        if text in "([{" and kind == "operator":
+            stack.append((text, line))
+            continue
+        if text in BRACKETS and kind == "operator":
+            if not stack:
+                errors.append(f"line {line}: unmatched '{text}'")
+            elif stack[-1][0] != BRACKETS[text]:
+                errors.append(f"line {line}: '{text}' does not match '{stack[-1][0]}' opened at line {stack[-1][1]}")
+                stack.pop()
+            else:
+                stack.pop()
+                closed_type = closed_type or (text == "}" and not stack and seen_type)
+            continue
+        if stack:
+            continue
+        # Top level: package, imports, then annotated/modified type declarations
+        previous = tokens[index - 1][1] if index else ""
+        if text == "package" and previous != ".":
+            if seen_import or seen_type:
+                errors.append(f"line {line}: package declaration must come first")
+        elif text == "import" and previous != ".":
+            seen_import = True
+            if seen_type:
+                errors.append(f"line {line}: import after a type declaration")
+        elif text in TYPE_KEYWORDS and previous != ".":
+            seen_type = True
+        elif closed_type and previous in ("}", ";") and text not in MODIFIERS and text not in TYPE_KEYWORDS \
+                and text not in ("@", ";", "}"):
+            errors.append(f"line {line}: '{text}' after the end of the class body (extra closing brace?)")
+            closed_type = False
+    for opener, line in stack[-3:]:
+        errors.append(f"end of file: '{opener}' opened at line {line} is never closed (truncated?)")
+    if not seen_type:
+        errors.append("no class, interface, enum or record declaration")
+    return errors
+
+
+def _imports(source):
+    """(imported simple names, wildcard packages, static names, static wildcard classes)"""
+    names, packages, static_names, static_classes = set(), set(), set(), set()
+    for static, target in IMPORT_LINE_PATTERN.findall(source):
+        if static and target.endswith(".*"):
+            static_classes.add(target[:-2])
+        elif static:
+            static_names.add(target.rsplit(".", 1)[-1])
+        elif target.endswith(".*"):
+            packages.add(target[:-2])
+        else:
+            names.add(target.rsplit(".", 1)[-1])
+    return names, packages, static_names, static_classes
+
+
+def missing_imports(tokens, source, project_types=()):
+    """Fully qualified KNOWN_IMPORTS / KNOWN_STATIC_IMPORTS the code uses without importing them"""
+    names, packages, static_names, static_classes = _imports(source)
+    declared = set(project_types)
+    for index, (kind, text, _) in enumerate(tokens[:-1]):
+        if text in TYPE_KEYWORDS and tokens[index + 1][0] == "name":
+            declared.add(tokens[index + 1][1])
+    missing = []
+    in_import = False
+    for index, (kind, text, _) in enumerate(tokens):
+        if text in ("import", "package"):
+            in_import = True
+        elif text == ";":
+            in_import = False
+        if in_import or kind != "name" or (index and tokens[index - 1][1] == "."):
+            continue
+        following = tokens[index + 1][1] if index + 1 < len(tokens) else ""
+        qualified = KNOWN_IMPORTS.get(text)
+        if qualified and text not in names and text not in declared and qualified.rsplit(".", 1)[0] not in packages:
+            missing.append(qualified)
+            names.add(text)
+        static = KNOWN_STATIC_IMPORTS.get(text)
+        if static and following == "(" and text not in static_names and static.rsplit(".", 1)[0] not in static_classes:
+            # Not a method of this file ("Type given(" declares one)
+            if not (index and (tokens[index - 1][0] == "name" or tokens[index - 1][1] in (">", "]"))):
+                missing.append("static " + static)
+                static_names.add(text)
+    return missing
+
+
+def check_java(source, project_types=()):
+    """
+    (errors, missing): syntax errors as "line N: message" (at most MAX_ERRORS) and the imports
+    ("a.b.C" or "static a.b.C.m") the code needs but does not declare
+    """
+    tokens, lexical_error = tokenize(source)
+    if lexical_error:
+        return [lexical_error], []
+    return _structure_errors(tokens)[:MAX_ERRORS], missing_imports(tokens, source, project_types)
+
+
+def add_imports(source, imports):
+    """Insert import lines after the existing imports (or the package line)"""
+    lines = "".join(f"import {name};\n" for name in imports)
+    existing = list(IMPORT_LINE_PATTERN.finditer(source))
+    if existing:
+        end = existing[-1].end()
+        return source[:end] + "\n" + lines.rstrip("\n") + source[end:]
+    package = PACKAGE_LINE_PATTERN.search(source)
+    if package:
+        rest = source[package.end():]
+        return source[:package.end()] + "\n" + lines + ("" if rest.startswith("\n") else "\n") + rest
+    return lines + "\n" + source
@@ -0,0 +1,185 @@
+"""
+Background job runner for long generations.
+
+Streamlit reruns the whole script on every widget interaction, so work
+done under st.spinner is lost (or started twice) if the user clicks
+anything while it runs. Jobs are submitted to a process-wide thread pool
+instead and tracked by ID; progress, messages and results live on the Job
+object, outside any script run, so any page can poll or attach to them.
+
+Job functions run without a Streamlit script context: they receive the
+Job as their first argument, must not touch st.*, and report progress with
+job.update(). Cancellation is cooperative - queued jobs never start, and
+running jobs stop at their next job.update() call.
+"""
+import os
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+MAX_WORKERS = int(os.getenv("ROBOTEST_JOB_WORKERS", "4"))
+KEEP_FINISHED_SECONDS = 3600
+
+
+class JobCancelled(Exception):
+    """Raised inside a job function when cancellation was requested"""
+
+
+class Job:
+    """State of one background job; updated by the worker, read by any script run"""
+
+    def __init__(self, kind, label, owner=None, params=None):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.label = label
+        self.owner = owner
+        self.params = params or {}  # context needed when the result is applied
+        self.status = QUEUED
+        self.progress = 0.0
+        self.message = "Queued"
+        self.messages = []
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.applied = False
+        self.apply_error = None     # why applying the result failed (it stays unapplied)
+        self._claimed = False
+        self._cancel = threading.Event()
+        self._future = None
+
+    @property
+    def finished(self):
+        return self.status in FINISHED_STATES
+
+    @property
+    def cancel_requested(self):
+        return self._cancel.is_set()
+
+    @property
+    def elapsed(self):
+        if not self.started_at:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    def check_cancelled(self):
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def update(self, progress=None, message=None):
+        """Report progress (0..1) and/or a status message; raises JobCancelled if cancelled"""
+        self.check_cancelled()
+        if progress is not None:
+            self.progress = max(0.0, min(1.0, progress))
+        if message:
+            self.message = message
+
+    def log(self, message):
+        """Keep a message (e.g. provider fallback warnings) to show with the job"""
+        self.messages.append(message)
+
+    def _finish(self, status, message):
+        # finished_at first: readers treat a finished status as final
+        self.finished_at = time.time()
+        self.message = message
+        self.status = status
+
+
+class JobRunner:
+    """Process-wide pool of generation workers"""
+
+    def __init__(self, max_workers=MAX_WORKERS):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="robotest-job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, kind="job", label="", owner=None, params=None, **kwargs):
+        """Queue fn(job, *args, **kwargs); returns the job ID"""
+        self.prune()
+        job = Job(kind, label or kind, owner, params)
+        with self._lock:
+            self._jobs[job.id] = job
+        job._future = self._pool.submit(self._run, job, fn, args, kwargs)
+        return job.id
+
+    def _run(self, job, fn, args, kwargs):
+        if job.cancel_requested:
+            job._finish(CANCELLED, "Cancelled")
+            return
+        job.status = RUNNING
+        job.message = "Running"
+        job.started_at = time.time()
+        try:
+            result = fn(job, *args, **kwargs)
+            job.check_cancelled()
+        except JobCancelled:
+            job._finish(CANCELLED, "Cancelled")
+        except Exception as e:
+            job.error = str(e)
+            job._finish(FAILED, f"Failed: {e}")
+        else:
+            job.result = result
+            job.progress = 1.0
+            job._finish(DONE, "Done")
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self, owner=None):
+        """Jobs (optionally of one owner), newest first"""
+        with self._lock:
+            jobs = [job for job in self._jobs.values() if owner is None or job.owner == owner]
+        return sorted(jobs, key=lambda job: job.created_at, reverse=True)
+
+    def cancel(self, job_id):
+        """Request cancellation; returns False if the job is unknown or already finished"""
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return False
+        job._cancel.set()
+        if job._future is not None and job._future.cancel():
+            # Still queued - it will never run
+            job._finish(CANCELLED, "Cancelled")
+        return True
+
+    def claim_finished(self, owner):
+        """
+        Finished jobs of an owner whose results have not been applied yet. A claimed job is not
+        returned again until release(); call mark_applied() once its result has been applied.
+        """
+        with self._lock:
+            claimed = [job for job in self._jobs.values()
+                       if job.owner == owner and job.finished and not job.applied and not job._claimed]
+            for job in claimed:
+                job._claimed = True
+        return sorted(claimed, key=lambda job: job.created_at)
+
+    def mark_applied(self, job):
+        with self._lock:
+            job.applied = True
+            job.apply_error = None
+            job._claimed = False
+
+    def release(self, job, error=None):
+        """Give back a claimed job whose result could not be applied; the next claim_finished retries it"""
+        with self._lock:
+            job.apply_error = str(error) if error is not None else None
+            job._claimed = False
+
+    def prune(self, max_age=KEEP_FINISHED_SECONDS):
+        """Forget finished jobs older than max_age seconds"""
+        cutoff = time.time() - max_age
+        with self._lock:
+            for job_id in [j.id for j in self._jobs.values()
+                           if j.finished and j.finished_at is not None and j.finished_at < cutoff]:
+                del self._jobs[job_id]
@@ -0,0 +1,335 @@
+"""
+Locator index of saved HTML pages for Selenium generation.
+
+Saved pages (.html, or a .zip of them) are parsed locally into their
+interactive elements - links, buttons, inputs, selects, text areas and ARIA
+widgets - each with ranked locator candidates (data-testid, id, name,
+aria-label, placeholder, text, CSS) and a stability score. Only the elements
+relevant to the test cases being automated go into the prompt, so page
+objects use the application's real locators instead of invented ones.
+Pages are indexed once per content hash.
+"""
+import re
+import math
+import zipfile
+import hashlib
+import threading
+from io import BytesIO
+from html.parser import HTMLParser
+from collections import Counter, OrderedDict
+
+from api_specs import tokenize
+
+PAGE_EXTENSIONS = (".html", ".htm", ".xhtml")
+MAX_PAGE_ELEMENTS = 400       # indexed per page
+MAX_PROMPT_ELEMENTS = 25      # per page in a prompt
+DEFAULT_TOP_PAGES = 3
+MIN_RELATIVE_SCORE = 0.35
+DEFAULT_MAX_CHARS = 5000
+INDEX_CACHE_SIZE = 64
+MAX_LOCATORS = 3
+
+INTERACTIVE_TAGS = {"a", "button", "input", "select", "textarea", "summary"}
+INTERACTIVE_ROLES = {"button", "link", "checkbox", "radio", "tab", "menuitem", "option", "switch", "textbox",
+                     "combobox", "searchbox", "slider", "spinbutton", "treeitem"}
+TEXT_TAGS = {"a", "button", "summary", "label", "option", "title"}
+SKIPPED_TAGS = {"script", "style", "template", "noscript", "svg"}
+VOID_TAGS = {"input", "img", "br", "hr", "meta", "link", "area", "base", "col", "embed", "source", "track", "wbr"}
+TEST_ID_ATTRIBUTES = ("data-testid", "data-test-id", "data-test", "data-cy", "data-qa", "data-automation-id")
+
+# Stability of each locator strategy (times 0.5 when the value is not unique on the page)
+STRATEGY_SCORES = {"test_id": 1.0, "id": 0.95, "name": 0.85, "aria_label": 0.75, "link_text": 0.65,
+                   "placeholder": 0.6, "text": 0.55, "css_class": 0.35, "generated_id": 0.3}
+# Framework-generated ids and class names that change between builds or page loads
+GENERATED_ID_PATTERN = re.compile(
+    r"\d{4,}|^[0-9a-f-]{16,}$|^:r[0-9a-z]+:$|^(?:ember|ext-gen|react-select|mui-|radix-|headlessui-|rc_|j_id|jsx-|__)",
+    re.IGNORECASE)
+UTILITY_CLASS_PATTERN = re.compile(r"^(?:css-|sc-|jss\d|makeStyles|[a-z]{1,2}-\d|[mp][trblxy]?-|w-|h-|text-|bg-|flex|grid|col-|row\b)|\d{3,}")
+SAVED_FROM_PATTERN = re.compile(r"saved from url=\(\d+\)(\S+)")
+
+
+def _java_string(value):
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _css_attribute(tag, attribute, value):
+    if "'" in value:
+        return None
+    return f"{tag}[{attribute}='{value}']"
+
+
+def _xpath_text(tag, text):
+    if "'" in text:
+        return None
+    return f"//{tag}[normalize-space()='{text}']"
+
+
+class _PageParser(HTMLParser):
+    """Collects interactive elements with their attributes and visible text"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.elements = []
+        self.title = ""
+        self.url = ""
+        self.labels = {}          # for= id -> label text
+        self._skip = 0
+        self._text_stack = []     # [element or "label"/"title"/..., text parts, label for=, tag]
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_TAGS:
+            if tag not in VOID_TAGS:
+                self._skip += 1
+            return
+        if self._skip:
+            return
+        attributes = {name: (value or "") for name, value in attrs}
+        if tag == "link" and attributes.get("rel") == "canonical" and not self.url:
+            self.url = attributes.get("href", "")
+        if tag == "meta" and attributes.get("property") == "og:url" and not self.url:
+            self.url = attributes.get("content", "")
+        interactive = (tag in INTERACTIVE_TAGS or attributes.get("role") in INTERACTIVE_ROLES
+                       or "onclick" in attributes or attributes.get("contenteditable") == "true")
+        if tag == "a" and "href" not in attributes and "role" not in attributes and "onclick" not in attributes:
+            interactive = False
+        if tag == "input" and attributes.get("type", "").lower() == "hidden":
+            interactive = False
+        element = None
+        if interactive and len(self.elements) < MAX_PAGE_ELEMENTS:
+            element = {"tag": tag, "attributes": attributes, "text": ""}
+            self.elements.append(element)
+        if tag in VOID_TAGS:
+            return
+        if element is not None or tag in TEXT_TAGS:
+            self._text_stack.append([element if element is not None else tag, [], attributes.get("for", ""), tag])
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS:
+            self._skip = max(0, self._skip - 1)
+            return
+        if self._skip or not self._text_stack:
+            return
+        # Close the innermost open text holder with this tag (tolerates unclosed inner tags)
+        for position in range(len(self._text_stack) - 1, -1, -1):
+            if self._text_stack[position][3] == tag:
+                holder, parts, label_for, _ = self._text_stack.pop(position)
+                text = " ".join(" ".join(parts).split())
+                if isinstance(holder, dict):
+                    if holder["tag"] not in ("select", "textarea"):  # option text / content is not a label
+                        holder["text"] = text[:80]
+                elif holder == "label" and label_for:
+                    self.labels[label_for] = text[:80]
+                elif holder == "title" and not self.title:
+                    self.title = text[:120]
+                # Text of inner elements also belongs to the enclosing ones ("<button><span>Save</span>")
+                if self._text_stack:
+                    self._text_stack[-1][1].append(text)
+                break
+
+    def handle_data(self, data):
+        if not self._skip and self._text_stack:
+            self._text_stack[-1][1].append(data)
+
+    def handle_comment(self, data):
+        match = SAVED_FROM_PATTERN.search(data)
+        if match and not self.url:
+            self.url = match.group(1)
+
+
+def _label(element, labels):
+    attributes = element["attributes"]
+    return (element["text"] or attributes.get("aria-label") or labels.get(attributes.get("id", ""))
+            or attributes.get("placeholder") or attributes.get("title") or attributes.get("value")
+            or attributes.get("name") or attributes.get("alt") or "").strip()[:80]
+
+
+def _candidates(element, counts):
+    """[(By expression, score)] best first"""
+    tag, attributes, text = element["tag"], element["attributes"], element["text"]
+    candidates = []
+
+    def add(strategy, key, value, expression):
+        if expression is None:
+            return
+        score = STRATEGY_SCORES[strategy] * (1 if counts[(key, value)] == 1 else 0.5)
+        candidates.append((expression, score))
+
+    for attribute in TEST_ID_ATTRIBUTES:
+        if attributes.get(attribute):
+            value = attributes[attribute]
+            css = _css_attribute("", attribute, value)
+            add("test_id", attribute, value, css and f"By.cssSelector({_java_string(css)})")
+            break
+    if attributes.get("id"):
+        value = attributes["id"]
+        add("generated_id" if GENERATED_ID_PATTERN.search(value) else "id", "id", value, f"By.id({_java_string(value)})")
+    if attributes.get("name") and tag in ("input", "select", "textarea", "button"):
+        add("name", "name", attributes["name"], f"By.name({_java_string(attributes['name'])})")
+    if attributes.get("aria-label"):
+        css = _css_attribute(tag, "aria-label", attributes["aria-label"])
+        add("aria_label", "aria-label", attributes["aria-label"], css and f"By.cssSelector({_java_string(css)})")
+    if attributes.get("placeholder"):
+        css = _css_attribute(tag, "placeholder", attributes["placeholder"])
+        add("placeholder", "placeholder", attributes["placeholder"], css and f"By.cssSelector({_java_string(css)})")
+    if text and len(text) <= 40:
+        if tag == "a":
+            add("link_text", "text", text, f"By.linkText({_java_string(text)})")
+        else:
+            xpath = _xpath_text(tag, text)
+            add("text", "text", text, xpath and f"By.xpath({_java_string(xpath)})")
+    classes = [name for name in attributes.get("class", "").split() if not UTILITY_CLASS_PATTERN.search(name)][:2]
+    if classes:
+        css = tag + "".join(f".{name}" for name in classes)
+        add("css_class", "css", css, f"By.cssSelector({_java_string(css)})")
+    candidates.sort(key=lambda candidate: -candidate[1])
+    return candidates[:MAX_LOCATORS]
+
+
+class PageIndex:
+    """Interactive elements of one saved page with ranked locators"""
+
+    def __init__(self, name, html):
+        parser = _PageParser()
+        parser.feed(html)
+        parser.close()
+        self.name = name
+        self.digest = hashlib.sha1(html.encode("utf-8")).hexdigest()[:12]
+        self.title = parser.title
+        self.url = parser.url
+        counts = Counter()
+        for element in parser.elements:
+            attributes = element["attributes"]
+            for key in ("id", "name", "aria-label", "placeholder") + TEST_ID_ATTRIBUTES:
+                if attributes.get(key):
+                    counts[(key, attributes[key])] += 1
+            if element["text"]:
+                counts[("text", element["text"])] += 1
+            classes = [c for c in attributes.get("class", "").split() if not UTILITY_CLASS_PATTERN.search(c)][:2]
+            if classes:
+                counts[("css", element["tag"] + "".join(f".{c}" for c in classes))] += 1
+        self.elements = []
+        for element in parser.elements:
+            locators = _candidates(element, counts)
+            if not locators:
+                continue
+            attributes = element["attributes"]
+            kind = attributes.get("type", "").lower() if element["tag"] == "input" else attributes.get("role", "")
+            label = _label(element, parser.labels)
+            words = [label, attributes.get("id", ""), attributes.get("name", ""), kind] + [attributes.get(a, "") for a in TEST_ID_ATTRIBUTES]
+            self.elements.append({"tag": element["tag"], "kind": kind, "label": label, "locators": locators,
+                                  "stability": locators[0][1], "tokens": Counter(tokenize(" ".join(words)))})
+        self.tokens = Counter(tokenize(" ".join([self.title, self.url, name.rsplit(".", 1)[0]])))
+
+    def __len__(self):
+        return len(self.elements)
+
+    def render(self, elements):
+        header = f"Page: {self.title or self.name}" + (f" ({self.url})" if self.url else "") + f" [{self.name}]"
+        lines = [header]
+        for element in elements:
+            what = element["tag"] + (f"[{element['kind']}]" if element["kind"] else "")
+            label = f' "{element["label"]}"' if element["label"] else ""
+            locators = " | ".join(expression for expression, _ in element["locators"])
+            lines.append(f"  - {what}{label}: {locators} (stability {element['stability']:.2f})")
+        return "\n".join(lines)
+
+
+class LocatorIndex:
+    """Several page indexes with lexical relevance search over pages and elements"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        documents = [page.tokens + Counter(token for element in page.elements for token in element["tokens"]) for page in pages]
+        self._documents = documents
+        document_frequency = Counter(token for document in documents for token in document)
+        self._idf = {token: math.log(1 + len(pages) / count) for token, count in document_frequency.items()}
+
+    def __len__(self):
+        return sum(len(page) for page in self.pages)
+
+    def __repr__(self):
+        # Stable across reruns, so options holding an index can be fingerprinted
+        return f"LocatorIndex({', '.join(page.name + ':' + page.digest for page in self.pages)})"
+
+    def _score(self, query, tokens, title_tokens=()):
+        return sum(self._idf.get(token, 1.0) * (2 if token in title_tokens else 1) for token in query if token in tokens)
+
+    def relevant(self, texts, top_pages=DEFAULT_TOP_PAGES):
+        """[(page, elements)] for the pages matching the texts best; matching elements first, then the rest of the page"""
+        query = set(token for text in texts for token in tokenize(text))
+        scored = [(self._score(query, document, page.tokens), -position, page)
+                  for position, (page, document) in enumerate(zip(self.pages, self._documents))]
+        scored = sorted((item for item in scored if item[0] > 0), key=lambda item: (item[0], item[1]), reverse=True)
+        cutoff = scored[0][0] * MIN_RELATIVE_SCORE if scored else 0
+        chosen = []
+        for score, _, page in scored[:top_pages]:
+            if score < cutoff:
+                break
+            ranked = sorted(enumerate(page.elements),
+                            key=lambda item: (-self._score(query, item[1]["tokens"]), item[0]))
+            chosen.append((page, [element for _, element in ranked[:MAX_PROMPT_ELEMENTS]]))
+        return chosen
+
+    def context_for(self, texts, max_chars=DEFAULT_MAX_CHARS):
+        """Prompt block of the relevant pages' locators, cut at max_chars on element boundaries ("" if nothing matches)"""
+        blocks, used = [], 0
+        for page, elements in self.relevant(texts):
+            block = page.render(elements)
+            while elements and used + len(block) > max_chars:
+                elements = elements[:-1]
+                block = page.render(elements)
+            if not elements:
+                break
+            blocks.append(block)
+            used += len(block)
+        return "\n".join(blocks)
+
+
+def decode_html(data):
+    """HTML bytes -> text (charset from a BOM or meta tag, else UTF-8)"""
+    if data.startswith(b"\xef\xbb\xbf"):
+        return data[3:].decode("utf-8", errors="replace")
+    match = re.search(rb"""<meta[^>]+charset=["']?([\w-]+)""", data[:2048], re.IGNORECASE)
+    encoding = match.group(1).decode("ascii") if match else "utf-8"
+    try:
+        return data.decode(encoding, errors="replace")
+    except LookupError:
+        return data.decode("utf-8", errors="replace")
+
+
+_index_cache = OrderedDict()
+_index_cache_lock = threading.Lock()
+
+
+def get_page_index(name, data):
+    """PageIndex of HTML bytes, cached by file name and content hash (the name feeds the prompt and relevance)"""
+    key = (name, hashlib.sha256(data).hexdigest())
+    with _index_cache_lock:
+        if key in _index_cache:
+            _index_cache.move_to_end(key)
+            return _index_cache[key]
+    index = PageIndex(name, decode_html(data))
+    with _index_cache_lock:
+        _index_cache[key] = index
+        while len(_index_cache) > INDEX_CACHE_SIZE:
+            _index_cache.popitem(last=False)
+    return index
+
+
+def iter_pages(name, data):
+    """(name, bytes) of the HTML pages in an upload: the page itself, or the pages inside a .zip"""
+    if name.lower().endswith(".zip"):
+        with zipfile.ZipFile(BytesIO(data)) as archive:
+            for member in archive.infolist():
+                if not member.is_dir() and member.filename.lower().endswith(PAGE_EXTENSIONS):
+                    yield member.filename, archive.read(member)
+    elif name.lower().endswith(PAGE_EXTENSIONS):
+        yield name, data
+
+
+def build_locator_index(uploads):
+    """[(file name, bytes)] of .html pages or .zip archives -> LocatorIndex, or None if no page has elements"""
+    pages = [get_page_index(name, data) for upload_name, upload in uploads for name, data in iter_pages(upload_name, upload)]
+    # The same file uploaded twice is the same cached object; list it once
+    pages = [page for page in dict.fromkeys(pages, None) if len(page)]
+    return LocatorIndex(pages) if pages else None
@@ -0,0 +1,633 @@
+"""
+Local SQLite repository for RoboTest artifacts.
+
+Test cases, automation code, test plans and bug reports are stored per
+project (the "Module Name" used in test case IDs) so that work survives
+Streamlit session restarts. Test cases are loaded lazily page by page,
+and every write runs in its own transaction.
+"""
+import os
+import json
+import base64
+import sqlite3
+import threading
+import time
+from collections.abc import MutableSequence
+
+from search_index import SEARCH_COLUMNS, search_document, build_match_query
+
+DEFAULT_DB_PATH = os.getenv("ROBOTEST_DB_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "robotest.db"))
+DEFAULT_PROJECT = "Default"
+PAGE_SIZE = 200
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS test_cases (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    case_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    title TEXT,
+    priority TEXT,
+    severity TEXT,
+    category TEXT,
+    test_type TEXT,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_test_cases_position ON test_cases(project_id, position);
+CREATE INDEX IF NOT EXISTS idx_test_cases_case_id ON test_cases(project_id, case_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS test_cases_fts USING fts5(
+    heading, steps, expected, test_data,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS test_cases_fts_delete AFTER DELETE ON test_cases BEGIN
+    DELETE FROM test_cases_fts WHERE rowid = old.id;
+END;
+CREATE TABLE IF NOT EXISTS automation_code (
+    project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    code_key TEXT NOT NULL,
+    files TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (project_id, code_key)
+);
+CREATE TABLE IF NOT EXISTS automation_fingerprints (
+    project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    code_key TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    PRIMARY KEY (project_id, code_key)
+);
+CREATE TABLE IF NOT EXISTS learned_styles (
+    kind TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    name TEXT,
+    rules TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (kind, content_hash)
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_learned_styles_name ON learned_styles(kind, name) WHERE name IS NOT NULL;
+CREATE TABLE IF NOT EXISTS test_plans (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    content TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS bug_reports (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    content TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+# Columns copied out of the JSON payload so they can be filtered/sorted in SQL
+INDEXED_FIELDS = ("title", "priority", "severity", "category", "test_type")
+FACET_FIELDS = ("priority", "severity", "category", "test_type")
+
+# Sort options for paginated views -> ORDER BY clause
+SORT_ORDERS = {
+    "Created": "position",
+    "ID": "case_id, position",
+    "Title": "title COLLATE NOCASE, position",
+    "Priority": "CASE priority WHEN 'High' THEN 0 WHEN 'Medium' THEN 1 WHEN 'Low' THEN 2 ELSE 3 END, position",
+    "Severity": "CASE severity WHEN 'Critical' THEN 0 WHEN 'Major' THEN 1 WHEN 'Normal' THEN 2 WHEN 'Minor' THEN 3 ELSE 4 END, position",
+    # bm25 rank when a full-text search is active, creation order otherwise
+    "Relevance": "position",
+}
+
+# Keep IN (...) lists below SQLite's bound-parameter limit
+MAX_SQL_PARAMS = 500
+
+
+def _encode_value(value):
+    """JSON fallback for attachment bytes"""
+    if isinstance(value, (bytes, bytearray)):
+        return {"__bytes__": base64.b64encode(bytes(value)).decode("ascii")}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _decode_object(obj):
+    if len(obj) == 1 and "__bytes__" in obj:
+        return base64.b64decode(obj["__bytes__"])
+    return obj
+
+
+def dumps_case(test_case):
+    return json.dumps(test_case, ensure_ascii=False, default=_encode_value)
+
+
+def loads_case(data):
+    return json.loads(data, object_hook=_decode_object)
+
+
+class ProjectStore:
+    """Thread-safe SQLite repository shared by all sessions of the app"""
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(SCHEMA)
+        self._project_ids = {}
+        # Bumped on every committed write; lets views cache derived data (exports, counts)
+        self.revision = 0
+        # Per project id: the revision of the last write to that project's test cases
+        self._case_revisions = {}
+        self._sync_search_index()
+
+    def _transaction(self, project_ids=()):
+        """Write transaction; project_ids are the projects whose test cases it changes"""
+        return _Transaction(self, project_ids)
+
+    def test_case_revision(self, project):
+        """Counter bumped by every committed change to the project's test cases (cache key for derived views)"""
+        return self._case_revisions.get(self.project_id(project), 0)
+
+    def _row_project_ids(self, rowids):
+        rowids = list(rowids)
+        ids = set()
+        for start in range(0, len(rowids), MAX_SQL_PARAMS):
+            chunk = rowids[start:start + MAX_SQL_PARAMS]
+            ids.update(row[0] for row in self._query(
+                f"SELECT DISTINCT project_id FROM test_cases WHERE id IN ({', '.join('?' * len(chunk))})", chunk))
+        return ids
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _sync_search_index(self):
+        """Rebuild the full-text index if it is out of step with test_cases (e.g. older databases)"""
+        indexed = self._query("SELECT COUNT(*) FROM test_cases_fts")[0][0]
+        total = self._query("SELECT COUNT(*) FROM test_cases")[0][0]
+        if indexed == total:
+            return
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM test_cases_fts")
+            rows = conn.execute("SELECT id, data FROM test_cases").fetchall()
+            conn.executemany(
+                f"INSERT INTO test_cases_fts(rowid, {', '.join(SEARCH_COLUMNS)}) VALUES (?, ?, ?, ?, ?)",
+                [(rowid, *search_document(loads_case(data))) for rowid, data in rows]
+            )
+
+    def _index_test_case(self, conn, rowid, test_case):
+        """Insert or replace the full-text entry of one test case inside the caller's transaction"""
+        conn.execute("DELETE FROM test_cases_fts WHERE rowid = ?", (rowid,))
+        conn.execute(
+            f"INSERT INTO test_cases_fts(rowid, {', '.join(SEARCH_COLUMNS)}) VALUES (?, ?, ?, ?, ?)",
+            (rowid, *search_document(test_case))
+        )
+
+    # --- Projects ---
+    def project_id(self, name):
+        """Return the id of a project, creating it on first use"""
+        name = (name or DEFAULT_PROJECT).strip() or DEFAULT_PROJECT
+        if name in self._project_ids:
+            return self._project_ids[name]
+        with self._transaction() as conn:
+            conn.execute("INSERT OR IGNORE INTO projects(name, created_at) VALUES (?, ?)", (name, time.time()))
+            project_id = conn.execute("SELECT id FROM projects WHERE name = ?", (name,)).fetchone()[0]
+        self._project_ids[name] = project_id
+        return project_id
+
+    def list_projects(self):
+        return [row[0] for row in self._query("SELECT name FROM projects ORDER BY name")]
+
+    def delete_project(self, name):
+        with self._transaction([self._project_ids.get(name)]) as conn:
+            conn.execute("DELETE FROM projects WHERE name = ?", (name,))
+        self._project_ids.pop(name, None)
+
+    # --- Test cases ---
+    def _where(self, project, filters=None):
+        """
+        Build the WHERE clause for a filtered view.
+        filters: {"search": full-text query, "text": substring of ID/title,
+                  "<facet>": [allowed values], "case_ids": [IDs]}
+        """
+        clauses = ["project_id = ?"]
+        params = [self.project_id(project)]
+        filters = filters or {}
+        match = build_match_query(filters.get("search") or "")
+        if match:
+            clauses.append("id IN (SELECT rowid FROM test_cases_fts WHERE test_cases_fts MATCH ?)")
+            params.append(match)
+        text = (filters.get("text") or "").strip()
+        if text:
+            pattern = "%" + text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            clauses.append("(title LIKE ? ESCAPE '\\' OR case_id LIKE ? ESCAPE '\\')")
+            params += [pattern, pattern]
+        for field in FACET_FIELDS:
+            values = filters.get(field)
+            if values:
+                clauses.append(f"{field} IN ({', '.join('?' * len(values))})")
+                params += list(values)
+        if filters.get("case_ids") is not None:
+            case_ids = list(filters["case_ids"])
+            if not case_ids:
+                clauses.append("0")
+            elif len(case_ids) <= MAX_SQL_PARAMS:
+                clauses.append(f"case_id IN ({', '.join('?' * len(case_ids))})")
+                params += case_ids
+            else:
+                clauses.append("case_id IN (SELECT value FROM json_each(?))")
+                params.append(json.dumps(case_ids))
+        return " AND ".join(clauses), params
+
+    def count_test_cases(self, project, filters=None):
+        where, params = self._where(project, filters)
+        return self._query(f"SELECT COUNT(*) FROM test_cases WHERE {where}", params)[0][0]
+
+    def query_test_cases(self, project, filters=None, sort="Created", descending=False, offset=0, limit=PAGE_SIZE):
+        """Load one window of a filtered/sorted view as (rowid, test_case) pairs"""
+        match = build_match_query((filters or {}).get("search") or "")
+        if sort == "Relevance" and match:
+            # Join the FTS table directly so bm25 rank is available for ordering
+            where, params = self._where(project, {k: v for k, v in filters.items() if k != "search"})
+            rows = self._query(
+                f"SELECT test_cases.id, data FROM test_cases JOIN test_cases_fts ON test_cases_fts.rowid = test_cases.id "
+                f"WHERE test_cases_fts MATCH ? AND {where} ORDER BY test_cases_fts.rank {'DESC' if descending else ''} LIMIT ? OFFSET ?",
+                [match] + params + [-1 if limit is None else limit, offset]
+            )
+            return [(rowid, loads_case(data)) for rowid, data in rows]
+
+        where, params = self._where(project, filters)
+        order = SORT_ORDERS.get(sort, SORT_ORDERS["Created"])
+        if descending:
+            order = ", ".join(f"{part} DESC" for part in order.split(", "))
+        rows = self._query(
+            f"SELECT id, data FROM test_cases WHERE {where} ORDER BY {order} LIMIT ? OFFSET ?",
+            params + [-1 if limit is None else limit, offset]
+        )
+        return [(rowid, loads_case(data)) for rowid, data in rows]
+
+    def list_case_ids(self, project, filters=None):
+        """IDs of every test case in a filtered view, without decoding the payloads"""
+        where, params = self._where(project, filters)
+        return [row[0] for row in self._query(f"SELECT case_id FROM test_cases WHERE {where} ORDER BY position", params)]
+
+    def get_test_cases_by_ids(self, project, case_ids):
+        """Load the given test cases in display order"""
+        return [tc for _, tc in self.query_test_cases(project, {"case_ids": case_ids}, limit=None)]
+
+    def facet_counts(self, project, field, filters=None):
+        """
+        Value -> count for one facet over the filtered set.
+        The facet's own selection is ignored so its other values stay selectable.
+        """
+        if field not in FACET_FIELDS:
+            raise ValueError(f"Unknown facet: {field}")
+        where, params = self._where(project, {k: v for k, v in (filters or {}).items() if k != field})
+        rows = self._query(f"SELECT {field}, COUNT(*) FROM test_cases WHERE {where} GROUP BY {field}", params)
+        return {value: count for value, count in rows}
+
+    def facet_values(self, project, field):
+        if field not in FACET_FIELDS:
+            raise ValueError(f"Unknown facet: {field}")
+        rows = self._query(
+            f"SELECT DISTINCT {field} FROM test_cases WHERE project_id = ? AND {field} != '' ORDER BY {field}",
+            (self.project_id(project),)
+        )
+        return [row[0] for row in rows]
+
+    def load_test_cases(self, project, offset=0, limit=PAGE_SIZE):
+        """Load one page of test cases in display order as (rowid, test_case) pairs"""
+        rows = self._query(
+            "SELECT id, data FROM test_cases WHERE project_id = ? ORDER BY position LIMIT ? OFFSET ?",
+            (self.project_id(project), -1 if limit is None else limit, offset)
+        )
+        return [(rowid, loads_case(data)) for rowid, data in rows]
+
+    def get_test_case(self, project, case_id):
+        rows = self._query(
+            "SELECT data FROM test_cases WHERE project_id = ? AND case_id = ? LIMIT 1",
+            (self.project_id(project), case_id)
+        )
+        return loads_case(rows[0][0]) if rows else None
+
+    def add_test_cases(self, project, test_cases):
+        """Append test cases at the end of the project in a single transaction"""
+        project_id = self.project_id(project)
+        now = time.time()
+        with self._transaction([project_id]) as conn:
+            position = conn.execute(
+                "SELECT COALESCE(MAX(position), -1) FROM test_cases WHERE project_id = ?", (project_id,)
+            ).fetchone()[0]
+            for tc in test_cases:
+                position += 1
+                cursor = conn.execute(
+                    "INSERT INTO test_cases(project_id, case_id, position, title, priority, severity, category, test_type, data, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (project_id, tc.get("id", ""), position, *_indexed_values(tc), dumps_case(tc), now)
+                )
+                self._index_test_case(conn, cursor.lastrowid, tc)
+
+    def update_test_case(self, rowid, test_case):
+        with self._transaction(self._row_project_ids([rowid])) as conn:
+            conn.execute(
+                "UPDATE test_cases SET case_id = ?, title = ?, priority = ?, severity = ?, category = ?, test_type = ?, "
+                "data = ?, updated_at = ? WHERE id = ?",
+                (test_case.get("id", ""), *_indexed_values(test_case), dumps_case(test_case), time.time(), rowid)
+            )
+            self._index_test_case(conn, rowid, test_case)
+
+    def insert_test_case(self, project, index, test_case):
+        """Insert a test case before the given display index"""
+        project_id = self.project_id(project)
+        with self._transaction([project_id]) as conn:
+            row = conn.execute(
+                "SELECT position FROM test_cases WHERE project_id = ? ORDER BY position LIMIT 1 OFFSET ?",
+                (project_id, max(index, 0))
+            ).fetchone()
+            if row is None:
+                position = conn.execute(
+                    "SELECT COALESCE(MAX(position), -1) + 1 FROM test_cases WHERE project_id = ?", (project_id,)
+                ).fetchone()[0]
+            else:
+                position = row[0]
+                conn.execute(
+                    "UPDATE test_cases SET position = position + 1 WHERE project_id = ? AND position >= ?",
+                    (project_id, position)
+                )
+            cursor = conn.execute(
+                "INSERT INTO test_cases(project_id, case_id, position, title, priority, severity, category, test_type, data, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (project_id, test_case.get("id", ""), position, *_indexed_values(test_case), dumps_case(test_case), time.time())
+            )
+            self._index_test_case(conn, cursor.lastrowid, test_case)
+
+    def delete_rows(self, rowids):
+        with self._transaction(self._row_project_ids(rowids)) as conn:
+            conn.executemany("DELETE FROM test_cases WHERE id = ?", [(r,) for r in rowids])
+
+    def delete_test_cases(self, project, case_ids):
+        """Delete test cases by their test case ID; returns the number removed"""
+        project_id = self.project_id(project)
+        with self._transaction([project_id]) as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "DELETE FROM test_cases WHERE project_id = ? AND case_id = ?",
+                [(project_id, case_id) for case_id in case_ids]
+            )
+            return conn.total_changes - before
+
+    def clear_test_cases(self, project):
+        project_id = self.project_id(project)
+        with self._transaction([project_id]) as conn:
+            conn.execute("DELETE FROM test_cases WHERE project_id = ?", (project_id,))
+
+    # --- Automation code ---
+    def save_automation_code(self, project, automation_code, fingerprints=None):
+        """
+        Replace the stored automation code (test case ID or "combined" -> {file: content})
+        and the fingerprints of what each key was generated from (generation.suite_fingerprints)
+        """
+        project_id = self.project_id(project)
+        now = time.time()
+        fingerprints = fingerprints or {}
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM automation_code WHERE project_id = ?", (project_id,))
+            conn.execute("DELETE FROM automation_fingerprints WHERE project_id = ?", (project_id,))
+            conn.executemany(
+                "INSERT INTO automation_code(project_id, code_key, files, updated_at) VALUES (?, ?, ?, ?)",
+                [(project_id, key, json.dumps(files, ensure_ascii=False), now) for key, files in automation_code.items()]
+            )
+            conn.executemany(
+                "INSERT INTO automation_fingerprints(project_id, code_key, fingerprint) VALUES (?, ?, ?)",
+                [(project_id, key, fingerprints[key]) for key in automation_code if key in fingerprints]
+            )
+
+    def load_automation_fingerprints(self, project):
+        rows = self._query(
+            "SELECT code_key, fingerprint FROM automation_fingerprints WHERE project_id = ?", (self.project_id(project),)
+        )
+        return dict(rows)
+
+    def load_automation_code(self, project):
+        rows = self._query(
+            "SELECT code_key, files FROM automation_code WHERE project_id = ? ORDER BY updated_at, code_key",
+            (self.project_id(project),)
+        )
+        return {key: json.loads(files) for key, files in rows}
+
+    # --- Learned styles (shared by all projects) ---
+    def get_learned_style(self, kind, content_hash):
+        rows = self._query(
+            "SELECT rules FROM learned_styles WHERE kind = ? AND content_hash = ?", (kind, content_hash)
+        )
+        return json.loads(rows[0][0]) if rows else None
+
+    def save_learned_style(self, kind, content_hash, rules):
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO learned_styles(kind, content_hash, rules, created_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(kind, content_hash) DO UPDATE SET rules = excluded.rules",
+                (kind, content_hash, json.dumps(rules, ensure_ascii=False), time.time())
+            )
+
+    def name_style_profile(self, kind, content_hash, name):
+        """Publish a cached style as a named profile (replaces any profile with the same name)"""
+        with self._transaction() as conn:
+            conn.execute("UPDATE learned_styles SET name = NULL WHERE kind = ? AND name = ?", (kind, name))
+            conn.execute(
+                "UPDATE learned_styles SET name = ? WHERE kind = ? AND content_hash = ?", (name, kind, content_hash)
+            )
+
+    def list_style_profiles(self, kind):
+        """(name, content_hash) of every named profile of a kind"""
+        return self._query(
+            "SELECT name, content_hash FROM learned_styles WHERE kind = ? AND name IS NOT NULL ORDER BY name", (kind,)
+        )
+
+    def delete_style_profile(self, kind, name):
+        with self._transaction() as conn:
+            conn.execute("UPDATE learned_styles SET name = NULL WHERE kind = ? AND name = ?", (kind, name))
+
+    # --- Test plans and bug reports ---
+    def add_test_plan(self, project, content):
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO test_plans(project_id, content, created_at) VALUES (?, ?, ?)",
+                (self.project_id(project), content, time.time())
+            )
+
+    def list_test_plans(self, project, limit=20):
+        return self._query(
+            "SELECT id, content, created_at FROM test_plans WHERE project_id = ? ORDER BY id DESC LIMIT ?",
+            (self.project_id(project), limit)
+        )
+
+    def latest_test_plan(self, project):
+        plans = self.list_test_plans(project, limit=1)
+        return plans[0][1] if plans else ""
+
+    def add_bug_report(self, project, content):
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO bug_reports(project_id, content, created_at) VALUES (?, ?, ?)",
+                (self.project_id(project), content, time.time())
+            )
+
+    def list_bug_reports(self, project, limit=20):
+        return self._query(
+            "SELECT id, content, created_at FROM bug_reports WHERE project_id = ? ORDER BY id DESC LIMIT ?",
+            (self.project_id(project), limit)
+        )
+
+    def count_bug_reports(self, project):
+        return self._query("SELECT COUNT(*) FROM bug_reports WHERE project_id = ?", (self.project_id(project),))[0][0]
+
+    def test_cases(self, project):
+        """Lazy, write-through list view used as st.session_state.test_cases"""
+        return PersistentTestCaseList(self, project)
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT/ROLLBACK under the store lock"""
+
+    def __init__(self, store, project_ids=()):
+        self.store = store
+        self.conn = store._conn
+        self.project_ids = project_ids
+
+    def __enter__(self):
+        self.store._lock.acquire()
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+            if not exc_type:
+                self.store.revision += 1
+                # The global revision at the project's last change: unique even across delete/recreate
+                for project_id in self.project_ids:
+                    if project_id is not None:
+                        self.store._case_revisions[project_id] = self.store.revision
+        finally:
+            self.store._lock.release()
+        return False
+
+
+def _indexed_values(test_case):
+    return tuple(str(test_case.get(field, "") or "") for field in INDEXED_FIELDS)
+
+
+class PersistentTestCaseList(MutableSequence):
+    """
+    List-like view over a project's test cases.
+    Only the pages that are actually accessed are read from SQLite; every
+    mutation is written through to the store and invalidates the page cache.
+    """
+
+    def __init__(self, store, project, page_size=PAGE_SIZE):
+        self.store = store
+        self.project = project
+        self.page_size = page_size
+        self._length = None
+        self._pages = {}
+
+    def invalidate(self):
+        self._length = None
+        self._pages = {}
+
+    def _page(self, number):
+        if number not in self._pages:
+            self._pages[number] = self.store.load_test_cases(self.project, number * self.page_size, self.page_size)
+        return self._pages[number]
+
+    def _entry(self, index):
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("test case index out of range")
+        return self._page(index // self.page_size)[index % self.page_size]
+
+    def __len__(self):
+        if self._length is None:
+            self._length = self.store.count_test_cases(self.project)
+        return self._length
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return self._entry(index)[1]
+
+    def __iter__(self):
+        for number in range((len(self) + self.page_size - 1) // self.page_size):
+            for _, test_case in self._page(number):
+                yield test_case
+
+    def __setitem__(self, index, test_case):
+        if isinstance(index, slice):
+            raise TypeError("slice assignment is not supported")
+        rowid, _ = self._entry(index)
+        self.store.update_test_case(rowid, test_case)
+        self.invalidate()
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            rowids = [self._entry(i)[0] for i in range(*index.indices(len(self)))]
+        else:
+            rowids = [self._entry(index)[0]]
+        self.store.delete_rows(rowids)
+        self.invalidate()
+
+    def insert(self, index, test_case):
+        self.store.insert_test_case(self.project, index, test_case)
+        self.invalidate()
+
+    def append(self, test_case):
+        self.store.add_test_cases(self.project, [test_case])
+        self.invalidate()
+
+    def extend(self, test_cases):
+        self.store.add_test_cases(self.project, list(test_cases))
+        self.invalidate()
+
+    def count(self, filters=None):
+        return self.store.count_test_cases(self.project, filters)
+
+    def window(self, filters=None, sort="Created", descending=False, offset=0, limit=PAGE_SIZE):
+        """(rowid, test_case) pairs for the visible slice of a filtered/sorted view"""
+        return self.store.query_test_cases(self.project, filters, sort, descending, offset, limit)
+
+    def case_ids(self, filters=None):
+        return self.store.list_case_ids(self.project, filters)
+
+    def facet_counts(self, field, filters=None):
+        return self.store.facet_counts(self.project, field, filters)
+
+    def facet_values(self, field):
+        return self.store.facet_values(self.project, field)
+
+    def get_many(self, case_ids):
+        return self.store.get_test_cases_by_ids(self.project, case_ids)
+
+    def update_row(self, rowid, test_case):
+        self.store.update_test_case(rowid, test_case)
+        self.invalidate()
+
+    def remove_ids(self, case_ids):
+        """Delete test cases by ID in one transaction; returns the number removed"""
+        removed = self.store.delete_test_cases(self.project, case_ids)
+        self.invalidate()
+        return removed
+
+    def clear(self):
+        self.store.clear_test_cases(self.project)
+        self.invalidate()
+
+    def __repr__(self):
+        return f"PersistentTestCaseList(project={self.project!r}, count={len(self)})"
@@ -0,0 +1,322 @@
+"""
+RoboTest headless CLI - batch generation without the Streamlit UI.
+
+Usage:
+    python robotest.py generate-cases requirements/ -o cases.xlsx --jobs 8
+    python robotest.py generate-automation cases.jsonl -o suite.zip --framework rest-assured --mode separate
+    python robotest.py test-plan brd.pdf -o plans.zip --tester Manual:3 --tester Automation:5
+    python robotest.py bug-report notes/ -o bugs.jsonl --env Staging --browser Chrome
+
+Inputs may be files or directories (searched recursively). Independent
+inputs are processed concurrently (--jobs); results keep the input order.
+API keys are read from the environment / .env (GEMINI_API_KEY,
+ANTHROPIC_API_KEY, OPENAI_API_KEY, GITHUB_TOKEN).
+"""
+import os
+import sys
+import time
+import argparse
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from dotenv import load_dotenv
+
+import generation
+from ai_providers import PROVIDERS, call_ai, supports_vision
+from extractors import EXTENSION_TYPES, extract_text_from_path, iter_extract_many, split_sections
+from exporters import export_test_cases_to_excel, files_to_zip, save_zip, to_jsonl, read_test_cases
+from page_locators import PAGE_EXTENSIONS, build_locator_index
+
+TEST_CASE_EXTENSIONS = (".jsonl", ".json", ".xlsx")
+SPEC_EXTENSIONS = (".json", ".yaml", ".yml")
+SCREENSHOT_TYPES = {".png": "image/png", ".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".webp": "image/webp"}
+
+
+def collect_inputs(paths, extensions):
+    """Expand directories into the files they contain with one of the given extensions"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in sorted(os.walk(path)):
+                files.extend(os.path.join(root, name) for name in sorted(names)
+                             if os.path.splitext(name)[1].lower() in extensions)
+        elif os.path.isfile(path):
+            files.append(path)
+        else:
+            raise SystemExit(f"Input not found: {path}")
+    if not files:
+        raise SystemExit("No input files found")
+    return files
+
+
+def run_concurrently(items, worker, jobs, label=str):
+    """
+    Run worker(item) for every item on a thread pool (provider calls are I/O bound).
+    Returns (results in input order, [(item, error)]); progress goes to stderr.
+    """
+    results = [None] * len(items)
+    errors = []
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        futures = {pool.submit(worker, item): index for index, item in enumerate(items)}
+        started = time.time()
+        for done, future in enumerate(as_completed(futures), start=1):
+            index = futures[future]
+            try:
+                results[index] = future.result()
+                status = "ok"
+            except Exception as e:
+                errors.append((items[index], e))
+                status = f"failed: {e}"
+            print(f"[{done}/{len(items)}] {label(items[index])}: {status} ({time.time() - started:.1f}s)", file=sys.stderr)
+    return results, errors
+
+
+def extract_inputs(paths):
+    """Extract all input files concurrently (CPU-bound parsing runs in worker processes)"""
+    files = []
+    for path in paths:
+        mime_type = EXTENSION_TYPES.get(os.path.splitext(path)[1].lower())
+        if mime_type is None:
+            raise SystemExit(f"Unsupported file type: {path}")
+        with open(path, "rb") as f:
+            files.append((f.read(), mime_type, None))
+    texts = [None] * len(paths)
+    for index, text, error in iter_extract_many(files):
+        if error is not None:
+            raise SystemExit(f"Could not extract {paths[index]}: {error}")
+        texts[index] = text
+    return texts
+
+
+def write_output(path, data):
+    mode = "w" if isinstance(data, str) else "wb"
+    with open(path, mode, **({"encoding": "utf-8"} if mode == "w" else {})) as f:
+        f.write(data)
+    print(f"Wrote {path}", file=sys.stderr)
+
+
+def write_documents(path, documents, kind):
+    """[(source, markdown)] -> .zip of Markdown files or .jsonl records"""
+    if path.lower().endswith(".zip"):
+        files = {}
+        for source, text in documents:
+            name = f"{os.path.splitext(os.path.basename(source))[0]}_{kind}.md"
+            while name in files:
+                name = "_" + name
+            files[name] = text
+        write_output(path, files_to_zip(files))
+    else:
+        write_output(path, to_jsonl({"source": source, kind: text} for source, text in documents))
+
+
+# --- Commands ---
+def cmd_generate_cases(args, ai):
+    inputs = collect_inputs(args.inputs, EXTENSION_TYPES)
+    # (path, section number, section title, text) - one work item per file, or per heading section
+    items = []
+    for path, text in zip(inputs, extract_inputs(inputs)):
+        sections = split_sections(text, args.split_sections) if args.split_sections else []
+        if len(sections) > 1:
+            items.extend((path, n, section["title"], section["text"]) for n, section in enumerate(sections, start=1))
+        else:
+            items.append((path, None, "", text))
+
+    def worker(item):
+        path, section_number, section_title, requirements = item
+        cases = generation.generate_test_cases_from_prompt(
+            requirements, args.num_cases, args.priority, args.severity, args.language, ai=ai
+        )
+        stem = os.path.splitext(os.path.basename(path))[0]
+        if section_number:
+            stem = f"{stem}_S{section_number}"
+        for i, tc in enumerate(cases):
+            tc["id"] = f"TC_{args.module}_{stem}_{i + 1}"
+            tc.setdefault("severity", args.severity)
+            tc.setdefault("attachments", [])
+            tc["source"] = path
+            if section_title:
+                tc["section"] = section_title
+        return cases
+
+    def label(item):
+        return f"{item[0]} [{item[2]}]" if item[2] else item[0]
+
+    results, errors = run_concurrently(items, worker, args.jobs, label=label)
+    test_cases = [tc for cases in results if cases for tc in cases]
+    if args.output.lower().endswith(".xlsx"):
+        write_output(args.output, export_test_cases_to_excel(test_cases).getvalue())
+    else:
+        write_output(args.output, to_jsonl(test_cases))
+    print(f"Generated {len(test_cases)} test cases from {len(items) - len(errors)}/{len(items)} "
+          f"{'sections' if len(items) > len(inputs) else 'files'}", file=sys.stderr)
+    return [(label(item), error) for item, error in errors]
+
+
+def cmd_generate_automation(args, ai):
+    test_cases = [tc for path in collect_inputs(args.inputs, TEST_CASE_EXTENSIONS) for tc in read_test_cases(path)]
+    if not test_cases:
+        raise SystemExit("No test cases found")
+    api_spec = ""
+    if args.api_spec:
+        if os.path.splitext(args.api_spec)[1].lower() in SPEC_EXTENSIONS:
+            with open(args.api_spec, encoding="utf-8") as f:
+                api_spec = f.read()
+        else:
+            api_spec = extract_text_from_path(args.api_spec)
+    page_index = None
+    if args.pages:
+        uploads = []
+        for path in collect_inputs(args.pages, PAGE_EXTENSIONS + (".zip",)):
+            with open(path, "rb") as f:
+                uploads.append((os.path.basename(path), f.read()))
+        page_index = build_locator_index(uploads)
+        print(f"Indexed {len(page_index) if page_index else 0} elements from {len(page_index.pages) if page_index else 0} pages",
+              file=sys.stderr)
+    selenium_options = dict(use_pom=not args.no_pom, use_oop=not args.no_oop, use_data_driven=args.data_driven,
+                            use_bdd=args.bdd, use_bot_style=args.bot_style, custom_prompt=args.custom_prompt,
+                            page_index=page_index)
+    rest_options = dict(use_bdd=not args.no_bdd_api, custom_prompt=args.custom_prompt, api_spec=api_spec)
+    framework = "rest_assured" if args.framework == "rest-assured" else "selenium"
+    options = rest_options if args.framework == "rest-assured" else selenium_options
+    suite_results = {}
+
+    if args.framework == "auto":
+        # Mixed selection: one run, a folder per framework
+        def worker(cases):
+            return generation.generate_auto_automation(
+                cases, args.mode == "combined", {"selenium": selenium_options, "rest_assured": rest_options}, ai=ai,
+                on_error=lambda message: print(message, file=sys.stderr))[generation.AUTO_KEY]
+    elif args.framework == "unit-spec":
+        def worker(tc):
+            return {f"{tc['id']}_unit_spec.md": generation.generate_unit_test_specifications(tc, ai=ai)}
+    else:
+        # Same pipeline as the app: a combined suite in output-budget batches, or the shared framework layer
+        # once and thin per-case tests; either way one project with the skeleton, validation and conflict reports
+        def worker(cases):
+            suite_results.update(generation.generate_automation_suite(
+                framework, cases, args.mode == "combined", options, ai=ai,
+                on_error=lambda message: print(message, file=sys.stderr), concurrency=args.jobs))
+            return generation.suite_files(framework, suite_results)
+
+    if args.framework == "unit-spec":
+        results, errors = run_concurrently(test_cases, worker, args.jobs, label=lambda tc: tc["id"])
+    else:
+        results, errors = run_concurrently([test_cases], worker, 1, label=lambda cases: f"{len(cases)} test cases")
+        if suite_results and args.mode != "combined" and args.framework != "auto":
+            errors += [(tc, "no code generated") for tc in test_cases if tc["id"] not in suite_results]
+
+    files = {}
+    for result in results:
+        files.update(result or {})
+    if args.output.lower().endswith(".jsonl"):
+        write_output(args.output, to_jsonl({"path": name, "content": content} for name, content in files.items()))
+    else:
+        save_zip(files, args.output)
+        print(f"Wrote {args.output}", file=sys.stderr)
+    print(f"Generated {len(files)} files", file=sys.stderr)
+    return errors
+
+
+def parse_tester(value):
+    specialization, _, experience = value.partition(":")
+    return {"specialization": specialization or "Manual", "experience": int(experience or 2)}
+
+
+def cmd_test_plan(args, ai):
+    inputs = collect_inputs(args.inputs, EXTENSION_TYPES)
+    timeline_str = f"{args.start} to {args.end}" if args.start and args.end else "Not specified"
+    testers = args.tester or [parse_tester("Manual:2")]
+
+    def worker(path):
+        return generation.generate_test_plan(extract_text_from_path(path), timeline_str, testers, args.instructions, ai=ai)
+
+    results, errors = run_concurrently(inputs, worker, args.jobs)
+    write_documents(args.output, [(path, plan) for path, plan in zip(inputs, results) if plan], "test_plan")
+    return errors
+
+
+def cmd_bug_report(args, ai):
+    inputs = collect_inputs(args.inputs, EXTENSION_TYPES)
+
+    screenshots = []
+    for shot in args.screenshot or []:
+        with open(shot, "rb") as f:
+            screenshots.append({"data": f.read(), "mime_type": SCREENSHOT_TYPES.get(os.path.splitext(shot)[1].lower(), "image/png")})
+    vision = supports_vision(args.provider, args.github_model)
+    if screenshots and not vision:
+        print(f"Warning: {args.provider} model cannot read images - screenshots are not sent", file=sys.stderr)
+
+    def worker(path):
+        return generation.generate_bug_report(extract_text_from_path(path), args.env, args.browser, args.language,
+                                              screenshots=screenshots, ai=ai, vision=vision)
+
+    results, errors = run_concurrently(inputs, worker, args.jobs)
+    write_documents(args.output, [(path, report) for path, report in zip(inputs, results) if report], "bug_report")
+    return errors
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="robotest", description="RoboTest AI Suite - headless batch generation")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("inputs", nargs="+", help="Input files or directories")
+    common.add_argument("-o", "--output", required=True, help="Output file (format chosen by extension)")
+    common.add_argument("-j", "--jobs", type=int, default=4, help="Concurrent AI requests (default: 4)")
+    common.add_argument("--provider", choices=PROVIDERS, default="auto", help="AI provider (default: auto fallback)")
+    common.add_argument("--github-model", default=None, help="GitHub Models model name")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("generate-cases", parents=[common], help="Requirements files -> test cases (.jsonl/.xlsx)")
+    p.add_argument("-n", "--num-cases", type=int, default=10)
+    p.add_argument("--priority", default="Medium", choices=["High", "Medium", "Low"])
+    p.add_argument("--severity", default="Major", choices=["Critical", "Major", "Normal", "Minor"])
+    p.add_argument("--language", default="English", choices=["English", "Arabic"])
+    p.add_argument("--module", default="MOD", help="Module name used in test case IDs")
+    p.add_argument("--split-sections", type=int, nargs="?", const=2, default=0, metavar="LEVEL",
+                   help="Generate per heading section (levels 1..LEVEL, default 2) in parallel; --num-cases applies per section")
+    p.set_defaults(handler=cmd_generate_cases)
+
+    p = sub.add_parser("generate-automation", parents=[common], help="Test cases (.jsonl/.json/.xlsx) -> automation code (.zip/.jsonl)")
+    p.add_argument("--framework", default="selenium", choices=["selenium", "rest-assured", "unit-spec", "auto"],
+                   help="auto: route each test case by type and run the three pipelines concurrently")
+    p.add_argument("--mode", default="separate", choices=["separate", "combined"])
+    p.add_argument("--no-pom", action="store_true", help="Disable Page Object Model")
+    p.add_argument("--no-oop", action="store_true", help="Disable OOP base classes")
+    p.add_argument("--data-driven", action="store_true")
+    p.add_argument("--bdd", action="store_true", help="BDD-style Selenium tests")
+    p.add_argument("--bot-style", action="store_true", help="Action-based (ActionBot) Selenium tests")
+    p.add_argument("--no-bdd-api", action="store_true", help="Plain RestAssured syntax instead of given/when/then")
+    p.add_argument("--api-spec", help="API spec for REST Assured (OpenAPI/Swagger/Postman .json/.yaml, or any document)")
+    p.add_argument("--pages", action="append", help="Saved HTML pages (.html, .zip or a directory) for real Selenium locators, repeatable")
+    p.add_argument("--custom-prompt", default="")
+    p.set_defaults(handler=cmd_generate_automation)
+
+    p = sub.add_parser("test-plan", parents=[common], help="Requirements files -> test plans (.zip/.jsonl)")
+    p.add_argument("--tester", action="append", type=parse_tester, help="SPECIALIZATION:YEARS, repeatable (e.g. Automation:5)")
+    p.add_argument("--start", help="Start date (YYYY-MM-DD)")
+    p.add_argument("--end", help="End date (YYYY-MM-DD)")
+    p.add_argument("--instructions", default="", help="Additional custom instructions")
+    p.set_defaults(handler=cmd_test_plan)
+
+    p = sub.add_parser("bug-report", parents=[common], help="Rough bug notes -> bug reports (.zip/.jsonl)")
+    p.add_argument("--env", default="QA / Staging")
+    p.add_argument("--browser", default="Chrome")
+    p.add_argument("--language", default="English", choices=["English", "Arabic"])
+    p.add_argument("--screenshot", action="append", help="Screenshot sent with every report (downscaled), repeatable")
+    p.set_defaults(handler=cmd_bug_report)
+    return parser
+
+
+def main(argv=None):
+    load_dotenv()
+    args = build_parser().parse_args(argv)
+    ai = partial(call_ai, provider=args.provider, github_model=args.github_model,
+                 on_fallback=lambda message: print(message, file=sys.stderr))
+    errors = args.handler(args, ai)
+    for item, error in errors:
+        label = item["id"] if isinstance(item, dict) else (f"{len(item)} test cases" if isinstance(item, list) else item)
+        print(f"FAILED {label}: {error}", file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,494 @@
+"""
+Deterministic Maven/TestNG project skeleton for generated automation code.
+
+Build files and framework boilerplate (pom.xml, testng.xml, log4j2.xml,
+allure.properties, config.properties, DriverFactory, ConfigReader, ActionBot,
+TestDataReader) come from templates instead of the model, so every download
+is a runnable project and AI output goes to page objects and test logic.
+"""
+import os
+import re
+
+GROUP_ID = "com.qa"
+ARTIFACT_ID = "automation-tests"
+
+VERSIONS = {
+    "selenium": "4.21.0",
+    "testng": "7.10.2",
+    "log4j": "2.23.1",
+    "allure": "2.27.0",
+    "aspectj": "1.9.22",
+    "rest-assured": "5.4.0",
+    "jackson": "2.17.1",
+    "surefire": "3.2.5",
+    "compiler": "3.13.0",
+}
+
+JAVA_PACKAGE_PATTERN = re.compile(r"^\s*package\s+([\w.]+)\s*;", re.MULTILINE)
+TEST_CLASS_PATTERN = re.compile(r"@Test\b")
+
+
+def _render(template, **values):
+    """Fill {{name}} placeholders (Java and Maven use braces and ${...} themselves)"""
+    for name, value in values.items():
+        template = template.replace("{{" + name + "}}", value)
+    return template
+
+
+POM_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<project xmlns="http://maven.apache.org/POM/4.0.0"
+         xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
+         xsi:schemaLocation="http://maven.apache.org/POM/4.0.0 https://maven.apache.org/xsd/maven-4.0.0.xsd">
+    <modelVersion>4.0.0</modelVersion>
+
+    <groupId>{{group_id}}</groupId>
+    <artifactId>{{artifact_id}}</artifactId>
+    <version>1.0.0</version>
+    <packaging>jar</packaging>
+
+    <properties>
+        <maven.compiler.release>17</maven.compiler.release>
+        <project.build.sourceEncoding>UTF-8</project.build.sourceEncoding>
+{{properties}}
+    </properties>
+
+    <dependencies>
+{{dependencies}}
+    </dependencies>
+
+    <build>
+        <plugins>
+            <plugin>
+                <groupId>org.apache.maven.plugins</groupId>
+                <artifactId>maven-compiler-plugin</artifactId>
+                <version>{{compiler_version}}</version>
+            </plugin>
+            <plugin>
+                <groupId>org.apache.maven.plugins</groupId>
+                <artifactId>maven-surefire-plugin</artifactId>
+                <version>{{surefire_version}}</version>
+                <configuration>
+                    <suiteXmlFiles>
+                        <suiteXmlFile>testng.xml</suiteXmlFile>
+                    </suiteXmlFiles>
+                    <argLine>-javaagent:"${settings.localRepository}/org/aspectj/aspectjweaver/${aspectj.version}/aspectjweaver-${aspectj.version}.jar"</argLine>
+                </configuration>
+                <dependencies>
+                    <dependency>
+                        <groupId>org.aspectj</groupId>
+                        <artifactId>aspectjweaver</artifactId>
+                        <version>${aspectj.version}</version>
+                    </dependency>
+                </dependencies>
+            </plugin>
+        </plugins>
+    </build>
+</project>
+"""
+
+TESTNG_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE suite SYSTEM "https://testng.org/testng-1.0.dtd">
+<suite name="Automation Suite" parallel="methods" thread-count="4">
+    <test name="{{test_name}}">
+{{body}}
+    </test>
+</suite>
+"""
+
+LOG4J2_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<Configuration status="WARN">
+    <Appenders>
+        <Console name="Console" target="SYSTEM_OUT">
+            <PatternLayout pattern="%d{HH:mm:ss.SSS} [%t] %-5level %logger{36} - %msg%n"/>
+        </Console>
+        <RollingFile name="File" fileName="logs/automation.log" filePattern="logs/automation-%d{yyyy-MM-dd}-%i.log.gz">
+            <PatternLayout pattern="%d{yyyy-MM-dd HH:mm:ss.SSS} [%t] %-5level %logger{36} - %msg%n"/>
+            <Policies>
+                <SizeBasedTriggeringPolicy size="10 MB"/>
+            </Policies>
+            <DefaultRolloverStrategy max="5"/>
+        </RollingFile>
+    </Appenders>
+    <Loggers>
+        <Logger name="{{group_id}}" level="debug" additivity="false">
+            <AppenderRef ref="Console"/>
+            <AppenderRef ref="File"/>
+        </Logger>
+        <Root level="info">
+            <AppenderRef ref="Console"/>
+        </Root>
+    </Loggers>
+</Configuration>
+"""
+
+ALLURE_PROPERTIES = """allure.results.directory=target/allure-results
+"""
+
+SELENIUM_CONFIG = """# Override any key with -Dkey=value, e.g. mvn test -Dbrowser=firefox -Dheadless=true
+baseUrl=https://example.com
+browser=chrome
+headless=false
+explicitWait=10
+pageLoadTimeout=30
+"""
+
+REST_CONFIG = """# Override any key with -Dkey=value, e.g. mvn test -DbaseUrl=https://staging.example.com
+baseUrl=https://api.example.com
+basePath=/
+timeout=30
+authToken=
+"""
+
+CONFIG_READER_TEMPLATE = """package {{package}};
+
+import java.io.IOException;
+import java.io.InputStream;
+import java.util.Properties;
+
+/**
+ * Singleton access to config.properties on the test classpath.
+ * System properties (-Dkey=value) override the file.
+ */
+public final class ConfigReader {
+    private static final String CONFIG_FILE = "config.properties";
+    private static volatile ConfigReader instance;
+
+    private final Properties properties = new Properties();
+
+    private ConfigReader() {
+        try (InputStream input = ConfigReader.class.getClassLoader().getResourceAsStream(CONFIG_FILE)) {
+            if (input == null) {
+                throw new IllegalStateException(CONFIG_FILE + " not found on the classpath");
+            }
+            properties.load(input);
+        } catch (IOException e) {
+            throw new IllegalStateException("Cannot read " + CONFIG_FILE, e);
+        }
+    }
+
+    public static ConfigReader getInstance() {
+        if (instance == null) {
+            synchronized (ConfigReader.class) {
+                if (instance == null) {
+                    instance = new ConfigReader();
+                }
+            }
+        }
+        return instance;
+    }
+
+    public String get(String key) {
+        return System.getProperty(key, properties.getProperty(key));
+    }
+
+    public String get(String key, String defaultValue) {
+        String value = get(key);
+        return value == null || value.isBlank() ? defaultValue : value.trim();
+    }
+
+    public int getInt(String key, int defaultValue) {
+        String value = get(key);
+        return value == null || value.isBlank() ? defaultValue : Integer.parseInt(value.trim());
+    }
+
+    public boolean getBoolean(String key, boolean defaultValue) {
+        String value = get(key);
+        return value == null || value.isBlank() ? defaultValue : Boolean.parseBoolean(value.trim());
+    }
+}
+"""
+
+DRIVER_FACTORY_TEMPLATE = """package {{group_id}}.driver;
+
+import {{group_id}}.config.ConfigReader;
+import java.time.Duration;
+import org.openqa.selenium.WebDriver;
+import org.openqa.selenium.chrome.ChromeDriver;
+import org.openqa.selenium.chrome.ChromeOptions;
+import org.openqa.selenium.edge.EdgeDriver;
+import org.openqa.selenium.edge.EdgeOptions;
+import org.openqa.selenium.firefox.FirefoxDriver;
+import org.openqa.selenium.firefox.FirefoxOptions;
+
+/**
+ * Thread-safe WebDriver factory: one driver per test thread.
+ * Browser and headless mode come from ConfigReader (browser=chrome|firefox|edge, headless=true|false).
+ */
+public final class DriverFactory {
+    private static final ThreadLocal<WebDriver> DRIVER = new ThreadLocal<>();
+
+    private DriverFactory() {
+    }
+
+    public static WebDriver initDriver() {
+        ConfigReader config = ConfigReader.getInstance();
+        String browser = config.get("browser", "chrome").toLowerCase();
+        boolean headless = config.getBoolean("headless", false);
+
+        WebDriver driver = switch (browser) {
+            case "firefox" -> {
+                FirefoxOptions options = new FirefoxOptions();
+                if (headless) {
+                    options.addArguments("-headless");
+                }
+                yield new FirefoxDriver(options);
+            }
+            case "edge" -> {
+                EdgeOptions options = new EdgeOptions();
+                if (headless) {
+                    options.addArguments("--headless=new", "--window-size=1920,1080");
+                }
+                yield new EdgeDriver(options);
+            }
+            default -> {
+                ChromeOptions options = new ChromeOptions();
+                if (headless) {
+                    options.addArguments("--headless=new", "--window-size=1920,1080");
+                }
+                yield new ChromeDriver(options);
+            }
+        };
+        driver.manage().timeouts().pageLoadTimeout(Duration.ofSeconds(config.getInt("pageLoadTimeout", 30)));
+        if (!headless) {
+            driver.manage().window().maximize();
+        }
+        DRIVER.set(driver);
+        return driver;
+    }
+
+    public static WebDriver getDriver() {
+        return DRIVER.get();
+    }
+
+    public static void quitDriver() {
+        WebDriver driver = DRIVER.get();
+        if (driver != null) {
+            driver.quit();
+            DRIVER.remove();
+        }
+    }
+}
+"""
+
+ACTION_BOT_TEMPLATE = """package {{group_id}}.bot;
+
+import {{group_id}}.config.ConfigReader;
+import java.time.Duration;
+import org.apache.logging.log4j.LogManager;
+import org.apache.logging.log4j.Logger;
+import org.openqa.selenium.By;
+import org.openqa.selenium.TimeoutException;
+import org.openqa.selenium.WebDriver;
+import org.openqa.selenium.WebElement;
+import org.openqa.selenium.support.ui.ExpectedConditions;
+import org.openqa.selenium.support.ui.WebDriverWait;
+
+/**
+ * Action-based wrapper around WebDriver: every interaction waits explicitly and is logged.
+ */
+public class ActionBot {
+    private static final Logger LOG = LogManager.getLogger(ActionBot.class);
+
+    private final WebDriver driver;
+    private final WebDriverWait wait;
+
+    public ActionBot(WebDriver driver) {
+        this.driver = driver;
+        this.wait = new WebDriverWait(driver, Duration.ofSeconds(ConfigReader.getInstance().getInt("explicitWait", 10)));
+    }
+
+    public WebDriver getDriver() {
+        return driver;
+    }
+
+    public void navigate(String url) {
+        LOG.info("Navigate to {}", url);
+        driver.get(url);
+    }
+
+    public WebElement waitForElement(By locator) {
+        return wait.until(ExpectedConditions.visibilityOfElementLocated(locator));
+    }
+
+    public void click(By locator) {
+        LOG.debug("Click {}", locator);
+        wait.until(ExpectedConditions.elementToBeClickable(locator)).click();
+    }
+
+    public void type(By locator, String text) {
+        LOG.debug("Type into {}", locator);
+        WebElement element = waitForElement(locator);
+        element.clear();
+        element.sendKeys(text);
+    }
+
+    public String getText(By locator) {
+        return waitForElement(locator).getText();
+    }
+
+    public boolean isDisplayed(By locator) {
+        try {
+            return waitForElement(locator).isDisplayed();
+        } catch (TimeoutException e) {
+            return false;
+        }
+    }
+}
+"""
+
+TEST_DATA_READER_TEMPLATE = """package {{package}};
+
+import com.fasterxml.jackson.core.type.TypeReference;
+import com.fasterxml.jackson.databind.ObjectMapper;
+import java.io.IOException;
+import java.io.InputStream;
+import java.util.List;
+import java.util.Map;
+
+/**
+ * Reads test data from src/test/resources/testdata/{name}.json (a JSON array of objects).
+ */
+public final class TestDataReader {
+    private static final ObjectMapper MAPPER = new ObjectMapper();
+
+    private TestDataReader() {
+    }
+
+    public static List<Map<String, Object>> readRows(String name) {
+        String resource = "testdata/" + name + ".json";
+        try (InputStream input = TestDataReader.class.getClassLoader().getResourceAsStream(resource)) {
+            if (input == null) {
+                throw new IllegalStateException(resource + " not found on the classpath");
+            }
+            return MAPPER.readValue(input, new TypeReference<List<Map<String, Object>>>() { });
+        } catch (IOException e) {
+            throw new IllegalStateException("Cannot read " + resource, e);
+        }
+    }
+
+    /** Rows as a TestNG @DataProvider array: one Map argument per row. */
+    public static Object[][] asDataProvider(String name) {
+        List<Map<String, Object>> rows = readRows(name);
+        Object[][] data = new Object[rows.size()][1];
+        for (int i = 0; i < rows.size(); i++) {
+            data[i][0] = rows.get(i);
+        }
+        return data;
+    }
+}
+"""
+
+
+def _dependency(group_id, artifact_id, version):
+    return (f"        <dependency>\n            <groupId>{group_id}</groupId>\n"
+            f"            <artifactId>{artifact_id}</artifactId>\n            <version>{version}</version>\n"
+            f"        </dependency>")
+
+
+def build_pom(framework, options=None):
+    """pom.xml with the dependencies the scaffold and the generated code need"""
+    options = options or {}
+    properties = {"aspectj.version": VERSIONS["aspectj"], "allure.version": VERSIONS["allure"],
+                  "log4j.version": VERSIONS["log4j"]}
+    dependencies = [("org.testng", "testng", VERSIONS["testng"])]
+    if framework == "rest_assured":
+        dependencies += [
+            ("io.rest-assured", "rest-assured", VERSIONS["rest-assured"]),
+            ("io.qameta.allure", "allure-rest-assured", "${allure.version}"),
+        ]
+    else:
+        dependencies.append(("org.seleniumhq.selenium", "selenium-java", VERSIONS["selenium"]))
+    if framework == "rest_assured" or options.get("use_data_driven"):
+        dependencies.append(("com.fasterxml.jackson.core", "jackson-databind", VERSIONS["jackson"]))
+    dependencies += [
+        ("io.qameta.allure", "allure-testng", "${allure.version}"),
+        ("org.apache.logging.log4j", "log4j-api", "${log4j.version}"),
+        ("org.apache.logging.log4j", "log4j-core", "${log4j.version}"),
+        ("org.apache.logging.log4j", "log4j-slf4j2-impl", "${log4j.version}"),
+    ]
+    return _render(
+        POM_TEMPLATE,
+        group_id=GROUP_ID,
+        artifact_id=ARTIFACT_ID,
+        properties="\n".join(f"        <{name}>{value}</{name}>" for name, value in properties.items()),
+        dependencies="\n".join(_dependency(*dependency) for dependency in dependencies),
+        compiler_version=VERSIONS["compiler"],
+        surefire_version=VERSIONS["surefire"],
+    )
+
+
+def java_class_name(path, content):
+    """Fully qualified class name of a generated Java file"""
+    package = JAVA_PACKAGE_PATTERN.search(content)
+    name = os.path.splitext(os.path.basename(path))[0]
+    return f"{package.group(1)}.{name}" if package else name
+
+
+def test_classes(files):
+    """Fully qualified names of the TestNG classes among generated files (natural order: Suite2 before Suite10)"""
+    return sorted((java_class_name(path, content) for path, content in files.items()
+                   if path.endswith(".java") and TEST_CLASS_PATTERN.search(content)),
+                  key=lambda name: [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", name)])
+
+
+def build_testng_xml(framework, files=None):
+    """testng.xml running the generated test classes (every test package if there are none yet)"""
+    classes = test_classes(files or {})
+    if classes:
+        body = "        <classes>\n" + "\n".join(f'            <class name="{name}"/>' for name in classes) + "\n        </classes>"
+    else:
+        body = f'        <packages>\n            <package name="{GROUP_ID}.*"/>\n        </packages>'
+    test_name = "API Tests" if framework == "rest_assured" else "UI Tests"
+    return _render(TESTNG_TEMPLATE, test_name=test_name, body=body)
+
+
+def scaffold_files(framework, options=None, generated=None):
+    """
+    {path: content} of the project skeleton for "selenium" or "rest_assured".
+    options: the Test Automation page flags (use_bot_style, use_data_driven, ...);
+    generated: AI files, used to list test classes in testng.xml.
+    """
+    options = options or {}
+    files = {
+        "pom.xml": build_pom(framework, options),
+        "testng.xml": build_testng_xml(framework, generated),
+        "src/test/resources/log4j2.xml": _render(LOG4J2_TEMPLATE, group_id=GROUP_ID),
+        "src/test/resources/allure.properties": ALLURE_PROPERTIES,
+    }
+    if framework == "rest_assured":
+        package = f"{GROUP_ID}.api"
+        files["src/test/resources/config.properties"] = REST_CONFIG
+    else:
+        package = GROUP_ID
+        files["src/test/resources/config.properties"] = SELENIUM_CONFIG
+        files["src/main/java/com/qa/driver/DriverFactory.java"] = _render(DRIVER_FACTORY_TEMPLATE, group_id=GROUP_ID)
+        if options.get("use_bot_style"):
+            files["src/main/java/com/qa/bot/ActionBot.java"] = _render(ACTION_BOT_TEMPLATE, group_id=GROUP_ID)
+    package_dir = package.replace(".", "/")
+    files[f"src/main/java/{package_dir}/config/ConfigReader.java"] = _render(CONFIG_READER_TEMPLATE, package=f"{package}.config")
+    if options.get("use_data_driven"):
+        files[f"src/main/java/{package_dir}/utils/TestDataReader.java"] = _render(TEST_DATA_READER_TEMPLATE, package=f"{package}.utils")
+        files["src/test/resources/testdata/README.md"] = "Test data files: <name>.json, a JSON array of objects, read with TestDataReader.readRows(\"<name>\").\n"
+    return files
+
+
+def normalize_path(path, content):
+    """Place bare Java file names ("LoginPage.java") under the source root their package implies"""
+    if "/" in path.replace("\\", "/") or not path.endswith(".java"):
+        return path.replace("\\", "/")
+    package = JAVA_PACKAGE_PATTERN.search(content)
+    package_dir = package.group(1).replace(".", "/") + "/" if package else ""
+    root = "src/test/java" if TEST_CLASS_PATTERN.search(content) or path.endswith("Test.java") else "src/main/java"
+    return f"{root}/{package_dir}{path}"
+
+
+def merge_with_scaffold(framework, options, generated, project_files=None):
+    """
+    Complete project: scaffold files plus the AI files (paths normalized).
+    The prompts declare the scaffold as existing, so it wins over files the model re-emitted at the same path.
+    project_files: every generated file of the project, for testng.xml (default: generated).
+    """
+    normalized = {normalize_path(path, content): content for path, content in generated.items()}
+    project = scaffold_files(framework, options, normalized if project_files is None else project_files)
+    project.update((path, content) for path, content in normalized.items() if path not in project)
+    return project
@@ -0,0 +1,79 @@
+"""
+Text normalization and query building for the test case full-text index.
+
+The index itself is an SQLite FTS5 table maintained by ProjectStore; this
+module turns test cases into normalized index documents and user input
+into FTS5 MATCH expressions. Arabic text is normalized (diacritics,
+tatweel, alef/yeh/teh marbuta variants, Arabic-Indic digits and the
+definite article) so that spelling variants find each other.
+"""
+import re
+import unicodedata
+
+# Columns of the FTS5 table, in order
+SEARCH_COLUMNS = ("heading", "steps", "expected", "test_data")
+
+# Harakat, Quranic annotation marks and superscript alef
+ARABIC_DIACRITICS = re.compile(r"[\u0610-\u061A\u064B-\u065F\u0670\u06D6-\u06ED]")
+ARABIC_TATWEEL = "\u0640"
+ARABIC_CHAR_MAP = str.maketrans({
+    "\u0622": "\u0627",  # alef with madda -> alef
+    "\u0623": "\u0627",  # alef with hamza above -> alef
+    "\u0625": "\u0627",  # alef with hamza below -> alef
+    "\u0671": "\u0627",  # alef wasla -> alef
+    "\u0649": "\u064A",  # alef maksura -> yeh
+    "\u0626": "\u064A",  # yeh with hamza -> yeh
+    "\u0624": "\u0648",  # waw with hamza -> waw
+    "\u0629": "\u0647",  # teh marbuta -> heh
+    **{chr(0x0660 + d): str(d) for d in range(10)},  # Arabic-Indic digits
+    **{chr(0x06F0 + d): str(d) for d in range(10)},  # Extended Arabic-Indic digits
+})
+# Definite article and its common proclitic forms (وال، بال، كال، فال، لل)
+ARABIC_ARTICLE = re.compile(r"^(?:و|ب|ك|ف)?ال|^لل")
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def _strip_article(token):
+    stripped = ARABIC_ARTICLE.sub("", token, count=1)
+    # Keep short words intact (e.g. "الى" should not become "ى")
+    return stripped if len(stripped) >= 2 else token
+
+
+def normalize_text(text):
+    """Normalize text for indexing and querying; returns space-separated tokens"""
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKC", str(text))
+    text = ARABIC_DIACRITICS.sub("", text).replace(ARABIC_TATWEEL, "")
+    text = text.translate(ARABIC_CHAR_MAP).casefold()
+    return " ".join(_strip_article(token) for token in TOKEN_PATTERN.findall(text))
+
+
+def _join(value):
+    if isinstance(value, (list, tuple)):
+        return "\n".join(str(v) for v in value)
+    return str(value or "")
+
+
+def search_document(test_case):
+    """Normalized FTS column values for a test case (see SEARCH_COLUMNS)"""
+    return (
+        normalize_text(f"{test_case.get('id', '')} {test_case.get('title', '')}"),
+        normalize_text(_join(test_case.get("test_steps", []))),
+        normalize_text(_join(test_case.get("expected_results", []))),
+        normalize_text(_join(test_case.get("test_data", []))),
+    )
+
+
+def build_match_query(query):
+    """
+    Convert free text into an FTS5 MATCH expression.
+    Every term must match (implicit AND); the last term is a prefix match so
+    results update while the user is still typing. Returns "" for empty input.
+    """
+    tokens = normalize_text(query).split()
+    if not tokens:
+        return ""
+    terms = [f'"{token}"' for token in tokens[:-1]]
+    terms.append(f'"{tokens[-1]}"*')
+    return " ".join(terms)
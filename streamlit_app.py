@@ -1,25 +1,34 @@
 import os
 import streamlit as st
 from dotenv import load_dotenv
-from google import genai
 import json
-import re
 import base64
-import PyPDF2
-import docx
 import pandas as pd
 from io import BytesIO
 import tempfile
 from pathlib import Path
-import zipfile
 import time
 import time
-import requests
+import uuid
+from functools import partial
 import json
 import gspread
 from google.oauth2.service_account import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
+from project_store import ProjectStore, DEFAULT_PROJECT, SORT_ORDERS
+from style_profiles import TEST_CASE_STYLE, REST_ASSURED_STYLE, learn_with_cache
+from traceability import TraceabilityIndex
+import ai_providers
+import jobs
+from jobs import JobRunner
+import generation
+from api_specs import get_spec_index
+from page_locators import build_locator_index
+from images import describe_savings, process_for_attachment, process_for_vision
+from extractors import FILE_PROCESSORS, TABLE_MAX_ROWS, extract_bytes, iter_extract_many, pdf_page_count, table_columns
+from exporters import cached_zip, export_test_cases_to_excel, files_to_zip
+from scaffold import build_testng_xml
 
 # Load environment variables
 load_dotenv()
@@ -73,7 +82,7 @@ GEMINI_API_KEY = st.session_state.get("user_gemini_key", "") or os.getenv("GEMIN
 OPENAI_API_KEY = st.session_state.get("user_openai_key", "") or os.getenv("OPENAI_API_KEY")
 ANTHROPIC_API_KEY = st.session_state.get("user_anthropic_key", "") or os.getenv("ANTHROPIC_API_KEY")  # Claude API Key
 GITHUB_TOKEN = st.session_state.get("user_github_token", "") or os.getenv("GITHUB_TOKEN")  # GitHub PAT with models scope
-GITHUB_MODEL = os.getenv("GITHUB_MODEL", "openai/gpt-4o-mini")  # e.g., openai/gpt-4o, openai/gpt-4.1, or gpt-5 if available
+GITHUB_MODEL = os.getenv("GITHUB_MODEL", ai_providers.GITHUB_MODEL)  # e.g., openai/gpt-4o, openai/gpt-4.1, or gpt-5 if available
 
 # --- Google OAuth Configuration ---
 # Update this with your deployed URL when pushing to production
@@ -190,187 +199,103 @@ handle_oauth_callback()
 # Initialize Gemini client if available
 
 
-# Model Configuration
-GEMINI_MODEL = "models/gemini-flash-latest"
-OPENAI_MODEL = "gpt-4o-mini"  # Cost-effective model, change to "gpt-4o" for better quality
-CLAUDE_MODEL = "claude-sonnet-4-20250514"  # Fast and intelligent model
+def session_api_keys():
+    return {
+        "gemini": GEMINI_API_KEY,
+        "openai": OPENAI_API_KEY,
+        "anthropic": ANTHROPIC_API_KEY,
+        "github": GITHUB_TOKEN,
+    }
+
+# Whether the selected provider/model can read screenshots
+def session_supports_vision():
+    return ai_providers.supports_vision(
+        st.session_state.get('ai_provider', 'auto'),
+        st.session_state.get('github_model', GITHUB_MODEL),
+        session_api_keys()
+    )
 
 # Function to call AI (supports Gemini, OpenAI, and Claude)
-def call_ai(prompt, provider=None):
+def call_ai(prompt, provider=None, images=None):
     """
-    Call AI API with automatic fallback.
+    Call AI API with automatic fallback, using the keys and provider chosen in this session.
     provider: "gemini", "openai", "claude", "github", or "auto" (tries in order)
     If not specified, uses the provider from session state
+    images: optional processed images sent with the prompt (see images.py)
     """
     # Get provider from session state if not specified
     if provider is None:
         provider = st.session_state.get('ai_provider', 'auto')
-    
-    if provider == "auto":
-        # Try providers in order: Gemini -> Claude -> OpenAI -> GitHub
-        errors = []
-        
-        if GEMINI_API_KEY:
-            try:
-                return call_gemini(prompt)
-            except Exception as e:
-                if "429" in str(e) or "RESOURCE_EXHAUSTED" in str(e):
-                    st.warning("⚠️ Gemini quota exceeded. Trying next provider...")
-                    errors.append(f"Gemini: {str(e)}")
-                else:
-                    raise e
-        
-        if ANTHROPIC_API_KEY:
-            try:
-                return call_claude(prompt)
-            except Exception as e:
-                st.warning("⚠️ Claude failed. Trying next provider...")
-                errors.append(f"Claude: {str(e)}")
-        
-        if OPENAI_API_KEY:
-            try:
-                return call_openai(prompt)
-            except Exception as e:
-                st.warning("⚠️ OpenAI failed. Trying next provider...")
-                errors.append(f"OpenAI: {str(e)}")
-        
-        if GITHUB_TOKEN:
-            try:
-                return call_github(prompt)
-            except Exception as e:
-                errors.append(f"GitHub: {str(e)}")
-        
-        if errors:
-            raise Exception(f"All providers failed. Errors: {'; '.join(errors)}")
-        raise Exception("No API keys configured. Please set at least one: GEMINI_API_KEY, ANTHROPIC_API_KEY, OPENAI_API_KEY, or GITHUB_TOKEN")
-    
-    elif provider == "gemini":
-        return call_gemini(prompt)
-    elif provider == "openai":
-        return call_openai(prompt)
-    elif provider == "claude":
-        return call_claude(prompt)
-    elif provider == "github":
-        return call_github(prompt)
-    else:
-        raise Exception(f"Unknown provider: {provider}")
-
-def call_gemini(prompt):
-    """Call Gemini API"""
-    # Get current API key from session state or env
-    current_key = st.session_state.get("user_gemini_key", "") or os.getenv("GEMINI_API_KEY")
-    if not current_key:
-        raise Exception("Gemini API key not configured")
-    
-    # Create client with current key
-    client = genai.Client(api_key=current_key)
-    response = client.models.generate_content(
-        model=GEMINI_MODEL,
-        contents=prompt
+    return ai_providers.call_ai(
+        prompt,
+        provider,
+        api_keys=session_api_keys(),
+        github_model=st.session_state.get('github_model', GITHUB_MODEL),
+        on_fallback=st.warning,
+        images=images
     )
-    return response.text
 
-def call_claude(prompt):
-    """Call Anthropic Claude API"""
-    if not ANTHROPIC_API_KEY:
-        raise Exception("Anthropic API key not configured. Add ANTHROPIC_API_KEY to your .env file.")
-    
-    headers = {
-        "Content-Type": "application/json",
-        "x-api-key": ANTHROPIC_API_KEY,
-        "anthropic-version": "2023-06-01"
-    }
-    
-    data = {
-        "model": CLAUDE_MODEL,
-        "max_tokens": 8000,
-        "messages": [
-            {"role": "user", "content": prompt}
-        ],
-        "system": "You are an expert QA engineer with extensive experience in test automation and test planning."
-    }
-    
-    response = requests.post(
-        "https://api.anthropic.com/v1/messages",
-        headers=headers,
-        json=data
-    )
-    
-    if response.status_code != 200:
-        error_data = response.json()
-        error_msg = error_data.get("error", {}).get("message", str(error_data))
-        raise Exception(f"Claude API error: {error_msg}")
-    
-    return response.json()["content"][0]["text"]
-
-def call_openai(prompt):
-    """Call OpenAI API"""
-    if not OPENAI_API_KEY:
-        raise Exception("OpenAI API key not configured. Add OPENAI_API_KEY to your .env file.")
-    
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {OPENAI_API_KEY}"
-    }
-    
-    data = {
-        "model": OPENAI_MODEL,
-        "messages": [
-            {"role": "system", "content": "You are an expert QA engineer with extensive experience in test automation and test planning."},
-            {"role": "user", "content": prompt}
-        ],
-        "temperature": 0.7,
-        "max_tokens": 8000
-    }
-    
-    response = requests.post(
-        "https://api.openai.com/v1/chat/completions",
-        headers=headers,
-        json=data
-    )
-    
-    if response.status_code != 200:
-        error_msg = response.json().get("error", {}).get("message", "Unknown error")
-        raise Exception(f"OpenAI API error: {error_msg}")
-    
-    return response.json()["choices"][0]["message"]["content"]
-
-def call_github(prompt):
-    """Call GitHub Models (Copilot) API"""
-    if not GITHUB_TOKEN:
-        raise Exception("GitHub token not configured. Add GITHUB_TOKEN to your .env file.")
-    
-    # Use selected model from session state if available, else use .env default
-    selected_model = st.session_state.get('github_model', GITHUB_MODEL)
-    
-    headers = {
-        "Accept": "application/vnd.github+json",
-        "Authorization": f"Bearer {GITHUB_TOKEN}",
-        "X-GitHub-Api-Version": "2022-11-28",
-        "Content-Type": "application/json"
-    }
-    data = {
-        "model": selected_model,
-        "messages": [
-            {"role": "system", "content": "You are an expert QA engineer with extensive experience in test automation and test planning."},
-            {"role": "user", "content": prompt}
-        ],
-        "temperature": 0.7
-    }
-    response = requests.post(
-        "https://models.github.ai/inference/chat/completions",
-        headers=headers,
-        json=data
-    )
-    if response.status_code != 200:
+# Function to choose how an uploaded file is extracted (PDF pages, sheet columns and rows)
+def extraction_options_input(file, key):
+    """Options widgets for PDF and CSV/XLSX uploads; returns extract_bytes() options"""
+    if file is None:
+        return {}
+    if file.type == "application/pdf":
         try:
-            error_msg = response.json()
+            page_count = pdf_page_count(file.getvalue())
         except Exception:
-            error_msg = response.text
-        raise Exception(f"GitHub Models API error: {error_msg}")
-    resp = response.json()
-    # GitHub Models returns choices/message/content similar to OpenAI
-    return resp.get("choices", [{}])[0].get("message", {}).get("content", "")
+            return {}
+        pages = st.text_input(
+            f"Pages of {file.name} to extract ({page_count} pages)",
+            placeholder="All pages - or e.g. 1-5, 12, 20-",
+            key=f"{key}_pages"
+        )
+        return {"pages": pages}
+    if file.type in ("text/csv", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"):
+        try:
+            columns = table_columns(file.getvalue(), file.type)
+        except Exception:
+            return {}
+        with st.expander(f"📊 Sheet options for {file.name}"):
+            selected = st.multiselect("Columns to include (all if empty)", columns, key=f"{key}_columns")
+            opt_col1, opt_col2 = st.columns(2)
+            with opt_col1:
+                max_rows = st.number_input("Rows per sheet", min_value=10, max_value=100000, value=TABLE_MAX_ROWS, step=100, key=f"{key}_rows")
+            with opt_col2:
+                mode = st.selectbox(
+                    "Row selection",
+                    ["head", "sample", "group"],
+                    format_func=lambda m: {"head": "First rows", "sample": "Random sample", "group": "Group by requirement"}[m],
+                    key=f"{key}_mode"
+                )
+            group_by = None
+            if mode == "group":
+                group_by = st.selectbox("Requirement ID column", ["(auto-detect)"] + columns, key=f"{key}_group")
+                group_by = None if group_by == "(auto-detect)" else group_by
+        return {"columns": selected, "max_rows": int(max_rows), "mode": mode, "group_by": group_by}
+    return {}
+
+# Function to extract an uploaded file through the shared extraction cache
+def extract_uploaded_file(file, options=None, mime_type=None):
+    """
+    Same upload (by content) is parsed once across reruns, pages and sessions.
+    Uncached PDFs are extracted page-wise in parallel with live progress.
+    """
+    widgets = {}
+
+    def on_progress(done, total, chunk):
+        if not widgets:
+            widgets["progress"] = st.progress(0.0, text=f"Extracting {file.name}...")
+            widgets["preview"] = st.empty()
+        widgets["progress"].progress(done / total, text=f"Extracted {done}/{total} pages of {file.name}")
+        first_page, first_text = chunk[0]
+        widgets["preview"].caption(f"Page {first_page + 1}: {first_text[:200].strip()}...")
+
+    try:
+        return extract_bytes(file.getvalue(), mime_type or file.type, options, on_progress=on_progress)
+    finally:
+        for widget in widgets.values():
+            widget.empty()
 
 # Check if at least one API key is available
 if not GEMINI_API_KEY and not OPENAI_API_KEY and not ANTHROPIC_API_KEY and not GITHUB_TOKEN:
@@ -663,11 +588,32 @@ input[type="password"]::-ms-clear {
 # App header
 st.markdown('<div class="header"><h1>🤖 RoboTest AI Suite</h1></div>', unsafe_allow_html=True)
 
+# Persistent project repository (shared by all sessions)
+@st.cache_resource
+def get_project_store():
+    return ProjectStore()
+
+def load_project(project):
+    """Bind the session-state views to a project in the local repository"""
+    store = get_project_store()
+    st.session_state.active_project = project
+    # Lazy, write-through list: only the pages that are rendered are read from disk
+    st.session_state.test_cases = store.test_cases(project)
+    st.session_state.automation_code = store.load_automation_code(project)
+    st.session_state.automation_fingerprints = store.load_automation_fingerprints(project)
+    st.session_state.generated_test_plan = store.latest_test_plan(project)
+    st.session_state.bug_reports_count = store.count_bug_reports(project)
+    st.session_state.selected_case_ids = set()
+
 # Initialize session state
+if 'active_project' not in st.session_state:
+    load_project(DEFAULT_PROJECT)
 if 'test_cases' not in st.session_state:
-    st.session_state.test_cases = []
+    st.session_state.test_cases = get_project_store().test_cases(st.session_state.active_project)
 if 'automation_code' not in st.session_state:
     st.session_state.automation_code = {}
+if 'automation_fingerprints' not in st.session_state:
+    st.session_state.automation_fingerprints = {}
 if 'current_tc_id' not in st.session_state:
     st.session_state.current_tc_id = ""
 if 'framework_generated' not in st.session_state:
@@ -684,6 +630,8 @@ if 'toast_time' not in st.session_state:
     st.session_state.toast_time = 0
 if 'toast_type' not in st.session_state:
     st.session_state.toast_type = "success"  # success, error, warning, info
+if 'selected_case_ids' not in st.session_state:
+    st.session_state.selected_case_ids = set()
 if 'selected_test_cases' not in st.session_state:
     st.session_state.selected_test_cases = []
 if 'editing_test_case' not in st.session_state:
@@ -711,654 +659,180 @@ manual_test_case_form = {
     "attachments": []
 }
 
-# File processing functions
-def extract_text_from_txt(file):
-    return file.read().decode("utf-8")
-
-def extract_text_from_pdf(file):
-    text = ""
-    pdf_reader = PyPDF2.PdfReader(file)
-    for page in pdf_reader.pages:
-        text += page.extract_text()
-    return text
-
-def extract_text_from_docx(file):
-    doc = docx.Document(BytesIO(file.read()))
-    return "\n".join([para.text for para in doc.paragraphs])
-
-def extract_text_from_csv(file):
-    df = pd.read_csv(file)
-    return df.to_markdown()
-
-def extract_text_from_xlsx(file):
-    df = pd.read_excel(file)
-    return df.to_markdown()
-
-FILE_PROCESSORS = {
-    "text/plain": extract_text_from_txt,
-    "application/pdf": extract_text_from_pdf,
-    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": extract_text_from_docx,
-    "text/csv": extract_text_from_csv,
-    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": extract_text_from_xlsx,
-    "text/markdown": extract_text_from_txt,  # Markdown is text
-    "application/octet-stream": extract_text_from_txt # Fallback for some md files type detection
-}
-
+# Generation wrappers - the core in generation.py raises, the UI reports errors inline
 # Function to generate test cases with Gemini
 def generate_test_cases_from_prompt(prompt, num_cases, priority, severity="Major", language="English"):
     try:
-        # Language instruction
-        language_instruction = ""
-        if language == "Arabic":
-            language_instruction = "\n        - IMPORTANT: Generate all test case content (title, preconditions, test_data, test_steps, expected_results) in Arabic language.\n        - Use proper Arabic text and formatting.\n        - Keep only the JSON keys in English, but all values must be in Arabic."
-        else:
-            language_instruction = "\n        - Generate all content in English language."
-        
-        prompt_template = f"""
-        You are a senior QA engineer with 15+ years of experience. 
-        Generate {num_cases} comprehensive test cases based on the following requirements:
-        
-        {prompt}
-        
-        Instructions:
-        - Default Priority: {priority}
-        - Default Severity: {severity} (Critical=System crash, Major=Feature broken, Normal=General severity, Minor=Minor issue){language_instruction}
-        - Format test cases in JSON with this structure:
-        {{
-            "test_cases": [
-                {{
-                    "id": "TC_001",
-                    "title": "Test case title",
-                    "preconditions": ["Precondition 1", "Precondition 2"],
-                    "test_data": ["Data 1", "Data 2"],
-                    "test_steps": ["Step 1", "Step 2", "Step 3"],
-                    "expected_results": ["Expected result 1", "Expected result 2"],
-                    "priority": "High/Medium/Low",
-                    "severity": "Critical/Major/Normal/Minor",
-                    "attachments": []
-                }}
-            ]
-        }}
-        """
-        
-        response_text = call_ai(prompt_template)
-        json_match = re.search(r'\{[\s\S]*\}', response_text)
-        if json_match:
-            json_str = json_match.group()
-            data = json.loads(json_str)
-            return data.get("test_cases", [])
-        return []
+        return generation.generate_test_cases_from_prompt(prompt, num_cases, priority, severity, language, ai=call_ai)
     except Exception as e:
         st.error(f"Error generating test cases: {str(e)}")
         return []
 
-# Function to generate Java Selenium code for a test case
-def generate_test_case_automation_code(test_case, use_pom=True, use_oop=True, use_data_driven=False, use_bdd=False, use_bot_style=False, custom_prompt=""):
+# Function to learn patterns from example test cases
+def learn_from_examples(example_contents):
     try:
-        # Build design pattern instructions
-        design_instructions = []
-        if use_pom:
-            design_instructions.append("- Page Object Model with @FindBy annotations")
-            design_instructions.append("- Separate Page classes for each page")
-            design_instructions.append("- Use Selenium 'By' locators (id, name, cssSelector, xpath) for dynamic or computed elements")
-            design_instructions.append("- Combine @FindBy for static elements with By-based lookups in actions and waits")
-            design_instructions.append("- Prefer stable CSS/XPath strategies; avoid brittle absolute XPaths; include meaningful locator names")
-        if use_oop:
-            design_instructions.append("- Object-Oriented Programming (OOP) & SOLID Principles")
-            design_instructions.append("- Inheritance: Use BaseTest and BasePage classes")
-            design_instructions.append("- Component Objects: Create reusable components (Table, Navbar) extending BaseComponent")
-            design_instructions.append("- Fluent Interfaces: Method chaining for actions (e.g., login.enterUser().enterPass().clickSubmit())")
-            design_instructions.append("- Encapsulation: Private WebElements, public action methods")
-        if use_data_driven:
-            design_instructions.append("- Data-driven testing with @DataProvider")
-            design_instructions.append("- External test data from JSON/Excel files")
-        if use_bdd:
-            design_instructions.append("- BDD style with descriptive method names")
-            design_instructions.append("- Given-When-Then comments in test methods")
-        if use_bot_style:
-            design_instructions.append("- Action-Based Testing (Bot Style)")
-            design_instructions.append("- Create an ActionBot class that abstracts all WebDriver actions")
-            design_instructions.append("- Bot methods should be generic: click(locator), type(locator, text), isDisplayed(locator), waitForElement(locator)")
-            design_instructions.append("- Page classes should use the Bot for all interactions, not WebDriver directly")
-            design_instructions.append("- This abstracts Selenium logic away from Page Objects")
-
-        # Critical Enhancements (From Enhancement Guide)
-        design_instructions.append("- Explicit Waits: Use WebDriverWait with ExpectedConditions. NEVER use Thread.sleep().")
-        design_instructions.append("- Logging: Use SLF4J/Log4j2. Log INFO for flow, DEBUG for actions, ERROR for failures.")
-        design_instructions.append("- Test Isolation: Use @BeforeMethod for setup and @AfterMethod for teardown. No shared state.")
-        design_instructions.append("- Exception Handling: Wrap actions in try-catch, capture screenshots on failure, log stack traces.")
-        design_instructions.append("- Locator Strategy: Priority ID > Name > CSS. Avoid absolute XPath. Use data-testid if available.")
-        
-        if not use_pom and not use_oop and not use_bot_style:
-            design_instructions.append("- Simple linear test script without Page Object Model")
-            design_instructions.append("- All code in single test class")
-        
-        design_str = chr(10).join(design_instructions) if design_instructions else "- Simple script structure"
-        
-        # Custom prompt section
-        custom_section = f"\n\nAdditional Requirements:\n{custom_prompt}" if custom_prompt.strip() else ""
-        
-        prompt_template = f"""
-        You are a super senior QA automation engineer with over 30 years of enterprise experience. 
-        Write complete, production-grade Selenium test automation code in Java using TestNG.
-        
-        Based on the following test case:
-        - Title: {test_case['title']}
-        - Steps: 
-        {chr(10).join(test_case['test_steps'])}
-        - Expected Results: 
-        {chr(10).join(test_case['expected_results'])}
-        
-        Design Pattern Requirements:
-{design_str}
-        
-        Use the following enterprise standards:
-        - Java 17
-        - Selenium WebDriver
-        - TestNG
-        - Factory Pattern for WebDriver
-        - Singleton for configuration
-        - Log4j2 logging
-        - Allure reporting annotations
-        - Explicit waits with WebDriverWait
-        - Meaningful assertions
-        - Thread-safe implementation
-        {custom_section}
-        
-        Output the code in the following format:
-        
-        // FILE: src/main/java/com/qa/pages/[PageName]Page.java
-        [Java code here]
-        
-        // FILE: src/test/java/com/qa/tests/[TestName]Test.java
-        [Java code here]
-        """
-        
-        response_text = call_ai(prompt_template)
-        return response_text
+        return generation.learn_from_examples(example_contents, ai=call_ai)
     except Exception as e:
-        st.error(f"Error generating automation code: {str(e)}")
-        return ""
+        st.error(f"Error learning from examples: {str(e)}")
+        return None
 
-# Function to generate combined Java Selenium code for multiple test cases
-def generate_combined_automation_code(test_cases, use_pom=True, use_oop=True, use_data_driven=False, use_bdd=False, use_bot_style=False, custom_prompt=""):
+# Function to learn coding style from example REST Assured scripts
+def learn_rest_assured_style(script_contents):
     try:
-        test_cases_str = "\n\n".join(
-            [f"Test Case {idx+1}: {tc['title']}\n"
-             f"Steps:\n{chr(10).join(tc['test_steps'])}\n"
-             f"Expected Results:\n{chr(10).join(tc['expected_results'])}"
-             for idx, tc in enumerate(test_cases)]
-        )
-        
-        # Build design pattern instructions
-        design_instructions = []
-        if use_pom:
-            design_instructions.append("- Page Object Model with @FindBy annotations")
-            design_instructions.append("- Separate Page classes for each page")
-            design_instructions.append("- Use Selenium 'By' locators (id, name, cssSelector, xpath) for dynamic or computed elements")
-            design_instructions.append("- Combine @FindBy for static elements with By-based lookups in actions and waits")
-            design_instructions.append("- Prefer stable CSS/XPath strategies; avoid brittle absolute XPaths; include meaningful locator names")
-        if use_oop:
-            design_instructions.append("- Object-Oriented Programming (OOP) & SOLID Principles")
-            design_instructions.append("- Inheritance: Use BaseTest and BasePage classes")
-            design_instructions.append("- Component Objects: Create reusable components (Table, Navbar) extending BaseComponent")
-            design_instructions.append("- Fluent Interfaces: Method chaining for actions (e.g., login.enterUser().enterPass().clickSubmit())")
-            design_instructions.append("- Encapsulation: Private WebElements, public action methods")
-        if use_data_driven:
-            design_instructions.append("- Data-driven testing with @DataProvider")
-            design_instructions.append("- External test data from JSON/Excel files")
-        if use_bdd:
-            design_instructions.append("- BDD style with descriptive method names")
-            design_instructions.append("- Given-When-Then comments in test methods")
-        if use_bot_style:
-            design_instructions.append("- Action-Based Testing (Bot Style)")
-            design_instructions.append("- Create an ActionBot class that abstracts all WebDriver actions")
-            design_instructions.append("- Bot methods should be generic and handle waits/exceptions: bot.click(locator), bot.type(locator, text)")
-            design_instructions.append("- Use the ActionBot in Page classes to handle element interactions")
-            design_instructions.append("- Ensure Test classes focus on business logic, Page classes on element structure, and Bot on WebDriver commands")
-
-        # Critical Enhancements (From Enhancement Guide)
-        design_instructions.append("- Explicit Waits: Use WebDriverWait with ExpectedConditions. NEVER use Thread.sleep().")
-        design_instructions.append("- Logging: Use SLF4J/Log4j2. Log INFO for flow, DEBUG for actions, ERROR for failures.")
-        design_instructions.append("- Test Isolation: Use @BeforeMethod for setup and @AfterMethod for teardown. No shared state.")
-        design_instructions.append("- Exception Handling: Wrap actions in try-catch, capture screenshots on failure, log stack traces.")
-        design_instructions.append("- Locator Strategy: Priority ID > Name > CSS. Avoid absolute XPath. Use data-testid if available.")
-        
-        if not use_pom and not use_oop and not use_bot_style:
-            design_instructions.append("- Simple linear test script without Page Object Model")
-            design_instructions.append("- All code in single test class")
-        
-        design_str = chr(10).join(design_instructions) if design_instructions else "- Simple script structure"
-        
-        # Custom prompt section
-        custom_section = f"\n\nAdditional Requirements:\n{custom_prompt}" if custom_prompt.strip() else ""
-        
-        prompt_template = f"""
-        You are a super senior QA automation engineer with over 30 years of enterprise experience. 
-        Write complete, production-grade Selenium test automation code in Java using TestNG.
-        
-        Create a SINGLE test class that includes test methods for the following test cases:
-        
-        {test_cases_str}
-        
-        Design Pattern Requirements:
-{design_str}
-        
-        Use the following enterprise standards:
-        - Java 17
-        - Selenium WebDriver
-        - TestNG
-        - Factory Pattern for WebDriver
-        - Singleton for configuration
-        - Log4j2 logging
-        - Allure reporting annotations
-        - Explicit waits with WebDriverWait
-        - Meaningful assertions
-        - Thread-safe implementation
-        {custom_section}
-        
-        Output the code in the following format:
-        
-        // FILE: src/main/java/com/qa/pages/[PageName]Page.java
-        [Java code here]
-        
-        // FILE: src/test/java/com/qa/tests/GeneratedTestSuite.java
-        [Java code for the combined test suite]
-        """
-        
-        response_text = call_ai(prompt_template)
-        return response_text
+        return generation.learn_rest_assured_style(script_contents, ai=call_ai)
     except Exception as e:
-        st.error(f"Error generating combined automation code: {str(e)}")
-        return ""
-
-# Function to parse generated code
-def parse_generated_code(code):
-    files = {}
-    current_file = None
-    current_content = []
-    
-    for line in code.split('\n'):
-        if line.startswith("// FILE: "):
-            if current_file:
-                files[current_file] = "\n".join(current_content)
-                current_content = []
-            current_file = line.split("// FILE: ")[1].strip()
-        elif current_file:
-            current_content.append(line)
-    
-    if current_file and current_content:
-        files[current_file] = "\n".join(current_content)
-    
-    return files
-
-# Function to detect test type from test case content
-def detect_test_type(test_case):
-    """
-    Auto-detect test type from title and steps
-    Returns: 'ui', 'api', 'unit_spec', or 'mixed'
-    """
-    title_lower = test_case.get('title', '').lower()
-    steps_text = ' '.join(test_case.get('test_steps', [])).lower()
-    combined_text = title_lower + ' ' + steps_text
+        st.error(f"Error learning style: {e}")
+        return None
+
+# Style profile picker shared by the Learn from Examples and REST Assured flows
+def render_style_profile_picker(kind, state_key, widget_prefix):
+    """Load a saved style profile into session state without calling the AI"""
+    store = get_project_store()
+    profiles = store.list_style_profiles(kind)
+    if not profiles:
+        return
+    profile_hashes = dict(profiles)
+    pick_col1, pick_col2 = st.columns([3, 1])
+    with pick_col1:
+        profile_name = st.selectbox("📚 Saved Style Profiles", list(profile_hashes), key=f"{widget_prefix}_profile_select")
+    with pick_col2:
+        st.markdown("<br>", unsafe_allow_html=True)
+        if st.button("Use Profile", key=f"{widget_prefix}_profile_use", use_container_width=True):
+            st.session_state[state_key] = store.get_learned_style(kind, profile_hashes[profile_name])
+            st.session_state[f"{state_key}_hash"] = profile_hashes[profile_name]
+            show_toast(f"✅ Loaded style profile '{profile_name}'")
+            st.rerun()
+
+def render_save_style_profile(kind, state_key, widget_prefix):
+    """Name the currently learned style so the team can reuse it"""
+    content_hash = st.session_state.get(f"{state_key}_hash")
+    if not content_hash:
+        return
+    save_col1, save_col2 = st.columns([3, 1])
+    with save_col1:
+        profile_name = st.text_input("Save as Style Profile", placeholder="e.g. Payments Team Style", key=f"{widget_prefix}_profile_name")
+    with save_col2:
+        st.markdown("<br>", unsafe_allow_html=True)
+        if st.button("💾 Save Profile", key=f"{widget_prefix}_profile_save", use_container_width=True, disabled=not profile_name.strip()):
+            get_project_store().name_style_profile(kind, content_hash, profile_name.strip())
+            show_toast(f"✅ Saved style profile '{profile_name.strip()}'")
+
+# REST Assured context shared by the REST Assured and Auto options: API spec and learned script style
+def render_rest_assured_sources():
+    """API spec upload and learn-from-scripts; results go to session state (api_spec_content, learned_rest_style)"""
+    st.markdown("---")
     
-    # Check for API indicators
-    api_keywords = ['api', 'endpoint', 'request', 'response', 'json', 'rest', 'http', 'post', 'get', 'put', 'delete', 'status code', 'payload']
-    if any(word in combined_text for word in api_keywords):
-        return 'api'
+    # API Specification Upload Section
+    st.markdown("### 📄 API Documentation (Optional)")
+    st.info("Upload API specs (Swagger/OpenAPI) or technical docs from developers for more accurate test generation")
     
-    # Check for unit test indicators
-    unit_keywords = ['function', 'method', 'class', 'unit', 'component', 'module', 'service', 'repository', 'controller', 'calculate', 'validate', 'parse']
-    if any(word in combined_text for word in unit_keywords):
-        return 'unit_spec'
+    api_spec_file = st.file_uploader(
+        "Upload API Specification",
+        type=['json', 'yaml', 'yml', 'md', 'txt', 'pdf', 'docx'],
+        key="api_spec_uploader",
+        help="Swagger, OpenAPI, Postman collection, or any API documentation"
+    )
     
-    # Check for UI indicators
-    ui_keywords = ['click', 'navigate', 'button', 'page', 'ui', 'screen', 'form', 'input', 'field', 'dropdown', 'checkbox', 'login', 'submit', 'display', 'verify']
-    if any(word in combined_text for word in ui_keywords):
-        return 'ui'
+    api_spec_content = ""
+    if api_spec_file:
+        st.success(f"✅ Uploaded: {api_spec_file.name}")
+        try:
+            if api_spec_file.type in FILE_PROCESSORS:
+                api_spec_content = extract_uploaded_file(api_spec_file)
+            else:
+                api_spec_content = api_spec_file.read().decode('utf-8')
+                api_spec_file.seek(0)
+            
+            spec_index = get_spec_index(api_spec_content)
+            if spec_index is not None:
+                st.caption(f"📚 {spec_index.format}: {len(spec_index)} endpoints indexed - each test case gets only its relevant endpoints")
+                with st.expander("📋 Endpoint Index", expanded=False):
+                    st.code("\n".join(f"{e['method']} {e['path']}" + (f" - {e['summary']}" if e['summary'] else "") for e in spec_index.endpoints))
+            else:
+                with st.expander("📋 Preview API Spec", expanded=False):
+                    st.code(api_spec_content[:2000] + "..." if len(api_spec_content) > 2000 else api_spec_content)
+            
+            # Store in session state for use in generation
+            st.session_state.api_spec_content = api_spec_content
+        except Exception as e:
+            st.error(f"Could not read file: {e}")
     
-    return 'ui'  # Default to UI if unsure
-
-# Function to learn patterns from example test cases
-def learn_from_examples(example_contents):
-    """
-    Analyze test case examples and extract writing patterns
-    Returns learned rules as structured data
-    """
-    try:
-        examples_text = "\n\n---\n\n".join(example_contents)
-        
-        prompt = f"""
-        You are an expert QA analyst. Analyze the following test case examples and extract the writing patterns and style.
-        
-        EXAMPLES:
-        {examples_text}
-        
-        Analyze and return a JSON object with the following structure:
-        {{
-            "id_format": "The ID format pattern (e.g., TC-001, TC_MODULE_001)",
-            "title_style": "Description of title writing style",
-            "precondition_style": "How preconditions are written (numbered, bulleted, etc.)",
-            "steps_style": "How steps are written (verb usage, numbering, detail level)",
-            "expected_results_style": "How expected results are written",
-            "common_fields": ["List of common fields used"],
-            "priority_values": ["Priority values used"],
-            "tone": "Formal/Informal/Technical",
-            "special_patterns": ["Any unique patterns noticed"],
-            "summary": "Brief summary of the overall writing style"
-        }}
+    st.markdown("---")
+    
+    # Learn from Existing REST Assured Scripts
+    st.markdown("### 🎓 Learn from Your Scripts (Optional)")
+    st.info("Upload your existing REST Assured scripts and AI will learn your coding style")
+    
+    # Reuse a saved style profile instantly (no API call)
+    render_style_profile_picker(REST_ASSURED_STYLE, "learned_rest_style", "rest_style")
+    
+    example_scripts = st.file_uploader(
+        "Upload Example REST Assured Scripts",
+        type=['java', 'txt'],
+        accept_multiple_files=True,
+        key="rest_assured_examples",
+        help="Upload 1-3 of your best REST Assured test scripts"
+    )
+    
+    if example_scripts:
+        st.success(f"✅ {len(example_scripts)} script(s) uploaded")
         
-        Return ONLY the JSON object, no additional text.
-        """
+        # Preview uploaded scripts
+        for script in example_scripts:
+            with st.expander(f"📄 {script.name}", expanded=False):
+                content = script.read().decode('utf-8')
+                script.seek(0)
+                st.code(content[:1500] + "..." if len(content) > 1500 else content, language='java')
         
-        response_text = call_ai(prompt)
-        json_match = re.search(r'\{[\s\S]*\}', response_text)
-        if json_match:
-            return json.loads(json_match.group())
-        return None
-    except Exception as e:
-        st.error(f"Error learning from examples: {str(e)}")
-        return None
+        # Learn button
+        if st.button("🔍 Learn from Scripts", key="learn_rest_scripts"):
+            with st.spinner("Analyzing your REST Assured coding style..."):
+                script_contents = []
+                for script in example_scripts:
+                    content = script.read().decode('utf-8')
+                    script.seek(0)
+                    script_contents.append(content)
+                
+                # Identical scripts reuse the cached style (zero API calls)
+                learned_style, content_hash, from_cache = learn_with_cache(
+                    get_project_store(), REST_ASSURED_STYLE, script_contents, learn_rest_assured_style
+                )
+                if learned_style:
+                    st.session_state.learned_rest_style = learned_style
+                    st.session_state.learned_rest_style_hash = content_hash
+                    if from_cache:
+                        show_toast("♻️ Loaded previously learned REST Assured style for these scripts!")
+                    else:
+                        show_toast("✅ Learned your REST Assured coding style!")
+    
+    # Display learned style
+    if st.session_state.get('learned_rest_style'):
+        style = st.session_state.learned_rest_style
+        with st.expander("📊 Learned Style", expanded=True):
+            cols = st.columns(2)
+            with cols[0]:
+                st.markdown(f"**Class Naming:** {style.get('class_naming', 'N/A')}")
+                st.markdown(f"**Method Naming:** {style.get('method_naming', 'N/A')}")
+                st.markdown(f"**Request Style:** {style.get('request_style', 'N/A')}")
+            with cols[1]:
+                st.markdown(f"**Assertion Style:** {style.get('assertion_style', 'N/A')}")
+                st.markdown(f"**Response Handling:** {style.get('response_handling', 'N/A')}")
+        
+        render_save_style_profile(REST_ASSURED_STYLE, "learned_rest_style", "rest_style")
+        
+        if st.button("🗑️ Clear Learned Style", key="clear_rest_style"):
+            del st.session_state.learned_rest_style
+            st.session_state.learned_rest_style_hash = None
+            st.rerun()
 
 # Function to generate test cases with learned rules
 def generate_test_cases_with_rules(prompt, num_cases, priority, severity, language, learned_rules=None):
-    """
-    Generate test cases using custom rules learned from examples
-    """
     try:
-        rules_instruction = ""
-        if learned_rules:
-            rules_instruction = f"""
-            
-        IMPORTANT: Follow these learned patterns from the user's examples:
-        - ID Format: {learned_rules.get('id_format', 'TC_001')}
-        - Title Style: {learned_rules.get('title_style', 'Descriptive')}
-        - Steps Style: {learned_rules.get('steps_style', 'Numbered, imperative verbs')}
-        - Expected Results: {learned_rules.get('expected_results_style', 'Clear outcomes')}
-        - Tone: {learned_rules.get('tone', 'Professional')}
-        - Special Patterns: {', '.join(learned_rules.get('special_patterns', []))}
-        """
-        
-        language_instruction = ""
-        if language == "Arabic":
-            language_instruction = "\n        - IMPORTANT: Generate all test case content in Arabic language. Keep only JSON keys in English."
-        else:
-            language_instruction = "\n        - Generate all content in English language."
-        
-        prompt_template = f"""
-        You are a senior QA engineer with 15+ years of experience. 
-        Generate {num_cases} comprehensive test cases based on the following requirements:
-        
-        {prompt}
-        
-        Instructions:
-        - Default Priority: {priority}
-        - Default Severity: {severity}{language_instruction}{rules_instruction}
-        - Categorize each test case as: "positive", "negative", or "edge_case"
-        - Format test cases in JSON with this structure:
-        {{
-            "test_cases": [
-                {{
-                    "id": "TC_001",
-                    "title": "Test case title",
-                    "category": "positive/negative/edge_case",
-                    "test_type": "ui/api/unit_spec",
-                    "preconditions": ["Precondition 1", "Precondition 2"],
-                    "test_data": ["Data 1", "Data 2"],
-                    "test_steps": ["Step 1", "Step 2", "Step 3"],
-                    "expected_results": ["Expected result 1", "Expected result 2"],
-                    "priority": "High/Medium/Low",
-                    "severity": "Critical/Major/Normal/Minor",
-                    "attachments": []
-                }}
-            ],
-            "summary": {{
-                "total": 0,
-                "positive": 0,
-                "negative": 0,
-                "edge_cases": 0,
-                "ui_tests": 0,
-                "api_tests": 0,
-                "unit_specs": 0
-            }}
-        }}
-        """
-        
-        response_text = call_ai(prompt_template)
-        json_match = re.search(r'\{[\s\S]*\}', response_text)
-        if json_match:
-            json_str = json_match.group()
-            data = json.loads(json_str)
-            return data.get("test_cases", []), data.get("summary", {})
-        return [], {}
+        return generation.generate_test_cases_with_rules(prompt, num_cases, priority, severity, language, learned_rules, ai=call_ai)
     except Exception as e:
         st.error(f"Error generating test cases with rules: {str(e)}")
         return [], {}
 
-# Function to generate REST Assured API automation code
-def generate_rest_assured_code(test_case, use_bdd=True, custom_prompt="", api_spec="", learned_style=None):
-    """
-    Generate REST Assured API automation code
-    Supports BDD style (given/when/then)
-    Can use API spec documentation and learned coding style
-    """
-    try:
-        bdd_instruction = ""
-        if use_bdd:
-            bdd_instruction = """
-        - Use BDD style with given().when().then() pattern
-        - Add descriptive method chaining
-        - Use RequestSpecBuilder for reusable specs"""
-        else:
-            bdd_instruction = """
-        - Use standard RestAssured syntax
-        - Keep it simple and readable"""
-        
-        custom_section = f"\n\nAdditional Requirements:\n{custom_prompt}" if custom_prompt.strip() else ""
-        
-        # Add API spec context if provided
-        api_spec_section = ""
-        if api_spec:
-            api_spec_section = f"""
-        
-        API SPECIFICATION CONTEXT:
-        Use the following API documentation to ensure accurate endpoint URLs, methods, request/response formats:
-        
-        {api_spec[:3000]}  # Limit to 3000 chars to avoid token limits
-        """
-        
-        # Add learned style instructions if available
-        style_section = ""
-        if learned_style:
-            style_section = f"""
-        
-        CODING STYLE REQUIREMENTS (Learn from user's existing code):
-        - Class Naming: {learned_style.get('class_naming', 'Standard naming')}
-        - Method Naming: {learned_style.get('method_naming', 'Standard naming')}
-        - Assertion Style: {learned_style.get('assertion_style', 'Standard assertions')}
-        - Request Style: {learned_style.get('request_style', 'Standard requests')}
-        - Response Handling: {learned_style.get('response_handling', 'Standard handling')}
-        - Package Structure: {learned_style.get('package_structure', 'com.qa.api')}
-        
-        IMPORTANT: Match the user's coding style as closely as possible.
-        """
-        
-        prompt_template = f"""
-        You are a senior QA automation engineer with expertise in REST API testing.
-        Write complete, production-grade REST Assured test code in Java using TestNG.
-        
-        Based on the following test case:
-        - Title: {test_case['title']}
-        - Steps: 
-        {chr(10).join(test_case['test_steps'])}
-        - Expected Results: 
-        {chr(10).join(test_case['expected_results'])}
-        
-        API Testing Requirements:{bdd_instruction}
-        {api_spec_section}
-        {style_section}
-        
-        Include:
-        Include:
-        - TestNG annotations (@Test, @BeforeMethod, @AfterMethod) for test isolation
-        - Request specifications (headers, content type, base URI)
-        - Response validation (status code, body, headers)
-        - JSON path assertions
-        - SLF4J/Log4j2 Logging: Log Request details and Response status
-        - Robust Error handling
-        - Allure reporting annotations
-        {custom_section}
-        
-        Output the code in the following format:
-        
-        // FILE: src/test/java/com/qa/api/tests/{test_case['id']}ApiTest.java
-        [Java code here]
-        
-        // FILE: src/main/java/com/qa/api/specs/RequestSpecs.java
-        [Java code here]
-        """
-        
-        response_text = call_ai(prompt_template)
-        return response_text
-    except Exception as e:
-        st.error(f"Error generating REST Assured code: {str(e)}")
-        return ""
-
-# Function to generate unit test specifications for developers
-def generate_unit_test_specifications(test_case, output_format="markdown"):
-    """
-    Generate detailed unit test specifications for developers
-    Provides clear requirements for what to test at component level
-    """
-    try:
-        prompt_template = f"""
-        You are a senior QA engineer creating unit test specifications for developers.
-        
-        Based on the following test case:
-        - Title: {test_case['title']}
-        - Steps: 
-        {chr(10).join(test_case['test_steps'])}
-        - Expected Results: 
-        {chr(10).join(test_case['expected_results'])}
-        - Preconditions:
-        {chr(10).join(test_case.get('preconditions', []))}
-        
-        Generate a detailed unit test specification document that developers can use to implement unit tests.
-        
-        Include the following sections:
-        
-        1. **Overview**
-           - Brief description of what needs to be tested
-           - Component/Module being tested
-        
-        2. **Test Scenarios**
-           - List all test scenarios with clear descriptions
-           - Include positive, negative, and edge cases
-        
-        3. **Input Parameters**
-           - List all input parameters for each scenario
-           - Include valid and invalid values
-           - Specify data types and constraints
-        
-        4. **Expected Outputs**
-           - Expected return values
-           - Expected exceptions/errors
-           - State changes to verify
-        
-        5. **Mock/Stub Requirements**
-           - External dependencies to mock
-           - Expected mock behavior
-        
-        6. **Test Data**
-           - Sample test data for each scenario
-           - Boundary values
-        
-        7. **Assertions**
-           - Specific assertions to implement
-           - Verification points
-        
-        Format the output in clean, readable Markdown that developers can directly use.
-        """
-        
-        response_text = call_ai(prompt_template)
-        return response_text
-    except Exception as e:
-        st.error(f"Error generating unit test specifications: {str(e)}")
-        return ""
-
-# Function to generate combined automation code for multiple test cases (REST Assured)
-def generate_combined_rest_assured_code(test_cases, use_bdd=True, custom_prompt="", api_spec="", learned_style=None):
-    """Generate REST Assured code for multiple test cases with optional API spec and learned style"""
-    try:
-        test_cases_str = "\n\n".join(
-            [f"Test Case {idx+1}: {tc['title']}\n"
-             f"Steps:\n{chr(10).join(tc['test_steps'])}\n"
-             f"Expected Results:\n{chr(10).join(tc['expected_results'])}"
-             for idx, tc in enumerate(test_cases)]
-        )
-        
-        bdd_instruction = "- Use BDD style with given().when().then() pattern" if use_bdd else "- Use standard RestAssured syntax"
-        custom_section = f"\n\nAdditional Requirements:\n{custom_prompt}" if custom_prompt.strip() else ""
-        
-        # Add API spec context if provided
-        api_spec_section = ""
-        if api_spec:
-            api_spec_section = f"""
-        
-        API SPECIFICATION:
-        {api_spec[:3000]}
-        """
-        
-        # Add learned style instructions if available
-        style_section = ""
-        if learned_style:
-            style_section = f"""
-        
-        CODING STYLE (Match user's existing code):
-        - Class Naming: {learned_style.get('class_naming', 'Standard')}
-        - Method Naming: {learned_style.get('method_naming', 'Standard')}
-        - Assertion Style: {learned_style.get('assertion_style', 'Standard')}
-        - Request Style: {learned_style.get('request_style', 'Standard')}
-        """
-        
-        prompt_template = f"""
-        You are a senior QA automation engineer. Write a complete REST Assured test suite.
-        
-        Test Cases to automate:
-        {test_cases_str}
-        
-        Requirements:
-        {bdd_instruction}
-        - TestNG annotations (@BeforeMethod/@AfterMethod for isolation)
-        - Response validation & JSON path assertions
-        - Allure reporting
-        - Base test class with common setup
-        - SLF4J/Log4j2 Logging (INFO for flows, DEBUG for requests)
-        - Robust Exception Handling
-        {api_spec_section}
-        {style_section}
-        {custom_section}
-        
-        Output format:
-        
-        // FILE: src/test/java/com/qa/api/tests/ApiTestSuite.java
-        [Java code]
-        
-        // FILE: src/test/java/com/qa/api/base/BaseApiTest.java
-        [Java code]
-        
-        // FILE: src/main/java/com/qa/api/specs/RequestSpecs.java
-        [Java code]
-        """
-        
-        response_text = call_ai(prompt_template)
-        return response_text
-    except Exception as e:
-        st.error(f"Error generating combined REST Assured code: {str(e)}")
-        return ""
-
-
-
 # Function to show toast notification using Streamlit's built-in toast
 def show_toast(message, rerun_after=False):
     if rerun_after:
@@ -1367,12 +841,145 @@ def show_toast(message, rerun_after=False):
     else:
         st.toast(message)
 
+# Function to pick st.code highlighting for a generated project file
+def code_language(file_name):
+    return {".java": "java", ".xml": "xml", ".properties": "properties", ".md": "markdown"}.get(os.path.splitext(file_name)[1])
+
+# Function to offer a file map as a ZIP without compressing it on every rerun
+def zip_download_button(label, files, file_name, key):
+    """Download button for cached ZIP bytes; until the archive is built, a button that builds it on demand"""
+    data = cached_zip(files)
+    if data is None:
+        if not st.button(f"📦 Prepare {label.removeprefix('📥 ')}", use_container_width=True, key=f"prepare_{key}"):
+            return
+        data = files_to_zip(files)
+    st.download_button(
+        label=label,
+        data=data,
+        file_name=file_name,
+        mime="application/zip",
+        use_container_width=True,
+        key=key
+    )
+
 # Show pending toast if exists (called at start of each page)
 def show_pending_toast():
     if 'pending_toast' in st.session_state and st.session_state.pending_toast:
         st.toast(st.session_state.pending_toast)
         st.session_state.pending_toast = None
 
+# Background jobs - long generations run on a shared worker pool so reruns don't lose them
+@st.cache_resource
+def get_job_runner():
+    return JobRunner()
+
+if 'job_owner' not in st.session_state:
+    st.session_state.job_owner = uuid.uuid4().hex
+
+def session_ai_settings():
+    """This session's provider and keys, for call_ai from worker threads (no session state there)"""
+    return {
+        "provider": st.session_state.get('ai_provider', 'auto'),
+        "api_keys": {
+            "gemini": GEMINI_API_KEY,
+            "openai": OPENAI_API_KEY,
+            "anthropic": ANTHROPIC_API_KEY,
+            "github": GITHUB_TOKEN,
+        },
+        "github_model": st.session_state.get('github_model', GITHUB_MODEL),
+    }
+
+def submit_job(fn, *args, kind, label, params=None, **kwargs):
+    """Submit fn(job, ai, *args, **kwargs) for this session; returns the job ID"""
+    return get_job_runner().submit(
+        fn, session_ai_settings(), *args,
+        kind=kind, label=label, owner=st.session_state.job_owner, params=params, **kwargs
+    )
+
+# Job functions - run in worker threads, must not use st.*
+def automation_job(job, ai_settings, framework, test_cases, combined, options, reuse=None):
+    ai = partial(ai_providers.call_ai, on_fallback=job.log, **ai_settings)
+    if framework == "auto":
+        return generation.generate_auto_automation(
+            test_cases, combined, options, ai=ai, on_progress=job.update, on_error=job.log, reuse=reuse
+        )
+    return generation.generate_automation_suite(
+        framework, test_cases, combined, options, ai=ai, on_progress=job.update, on_error=job.log, reuse=reuse
+    )
+
+def test_plan_job(job, ai_settings, requirements_content, timeline_str, testers, custom_instructions):
+    ai = partial(ai_providers.call_ai, on_fallback=job.log, **ai_settings)
+    job.update(0.1, "Generating test plan")
+    return generation.generate_test_plan(requirements_content, timeline_str, testers, custom_instructions, ai=ai)
+
+# Result handlers - run in the script thread when a job of this session finishes
+def apply_automation_job(job):
+    project = job.params["project"]
+    fingerprints = {key: fingerprint for key, fingerprint in job.params["fingerprints"].items() if key in job.result}
+    if job.params["framework"] == "unit_spec":
+        st.session_state.unit_test_specs = job.result
+        st.session_state.unit_spec_fingerprints = fingerprints
+        show_toast(f"✅ Generated specifications for {len(job.result)} test cases!")
+        return
+    get_project_store().save_automation_code(project, job.result, fingerprints)
+    if st.session_state.active_project == project:
+        st.session_state.automation_code = job.result
+        st.session_state.automation_fingerprints = fingerprints
+    show_toast(f"✅ {job.label} generated successfully!")
+
+def apply_test_plan_job(job):
+    get_project_store().add_test_plan(job.params["project"], job.result)
+    if st.session_state.active_project == job.params["project"]:
+        st.session_state.generated_test_plan = job.result
+    show_toast("✅ Test plan generated!")
+
+JOB_RESULT_HANDLERS = {
+    "automation": apply_automation_job,
+    "test_plan": apply_test_plan_job,
+}
+
+def apply_finished_jobs():
+    """Move results of finished jobs into session state (each job is applied once)"""
+    runner = get_job_runner()
+    for job in runner.claim_finished(st.session_state.job_owner):
+        try:
+            if job.status == jobs.DONE:
+                JOB_RESULT_HANDLERS[job.kind](job)
+        except Exception as e:
+            # Keep the result; it is applied again on the next run
+            runner.release(job, e)
+            st.error(f"Could not save the result of {job.label}: {e}")
+            continue
+        runner.mark_applied(job)
+        if job.status == jobs.FAILED:
+            st.error(f"{job.label} failed: {job.error}")
+
+def render_background_jobs():
+    """Progress of this session's jobs with cancel buttons"""
+    session_jobs = get_job_runner().jobs(st.session_state.job_owner)[:5]
+    if not session_jobs:
+        return
+    st.markdown("### ⏳ Background Jobs")
+    for job in session_jobs:
+        st.caption(f"**{job.label}** · {job.status} · {job.elapsed:.0f}s")
+        if not job.finished:
+            st.progress(job.progress, text=job.message)
+            if st.button("✖ Cancel", key=f"cancel_job_{job.id}", disabled=job.cancel_requested):
+                get_job_runner().cancel(job.id)
+        for message in job.messages[-2:]:
+            st.caption(message)
+    # A job of this session finished since the last run - rerun the app to show its result
+    if any(job.finished and not job.applied and not job.apply_error for job in session_jobs):
+        st.rerun()
+
+# Poll while jobs are running (fragments rerun on their own without rerunning the page)
+if hasattr(st, "fragment"):
+    poll_background_jobs = st.fragment(run_every=2)(render_background_jobs)
+else:
+    poll_background_jobs = render_background_jobs
+
+apply_finished_jobs()
+
 # Custom CSS for enhanced navigation - softer colors
 st.markdown("""
 <style>
@@ -1466,6 +1073,37 @@ page = selected_option
 # Remove emoji prefix for page matching
 page = page.split(" ", 1)[1] if " " in page else page
 
+# Project selection - test cases, automation code, plans and bug reports are stored per project
+st.sidebar.markdown("### 📁 Project")
+NEW_PROJECT_OPTION = "➕ New Project..."
+project_options = get_project_store().list_projects()
+if st.session_state.active_project not in project_options:
+    project_options.append(st.session_state.active_project)
+selected_project = st.sidebar.selectbox(
+    "Project",
+    project_options + [NEW_PROJECT_OPTION],
+    index=project_options.index(st.session_state.active_project),
+    label_visibility="collapsed",
+    key="project_selector"
+)
+if selected_project == NEW_PROJECT_OPTION:
+    new_project_name = st.sidebar.text_input("New project name", key="new_project_name")
+    if st.sidebar.button("Create Project", key="create_project_btn", disabled=not new_project_name.strip()):
+        get_project_store().project_id(new_project_name.strip())
+        load_project(new_project_name.strip())
+        del st.session_state["project_selector"]
+        st.rerun()
+elif selected_project != st.session_state.active_project:
+    load_project(selected_project)
+    st.rerun()
+
+# Background job progress (polls while this session has running jobs)
+with st.sidebar:
+    if any(not job.finished for job in get_job_runner().jobs(st.session_state.job_owner)):
+        poll_background_jobs()
+    else:
+        render_background_jobs()
+
 # AI Provider Configuration in Sidebar
 # Only show provider selection on Home page
 if page == "Home":
@@ -1639,7 +1277,7 @@ if page == "Home":
     dash_col1, dash_col2, dash_col3, dash_col4 = st.columns(4)
     
     with dash_col1:
-        st.metric("Test Cases Created", len(st.session_state.test_cases), help="Total test cases in current session")
+        st.metric("Test Cases Created", len(st.session_state.test_cases), help="Total test cases in the active project")
     with dash_col2:
         # Calculate generated scripts count
         script_count = 0
@@ -1652,7 +1290,7 @@ if page == "Home":
     with dash_col3:
         st.metric("Active AI Model", st.session_state.get('model_provider', 'Gemini'), help="Current AI provider")
     with dash_col4:
-        st.metric("Bug Reports", st.session_state.get('bug_reports_count', 0), help="Bug reports generated in this session")
+        st.metric("Bug Reports", st.session_state.get('bug_reports_count', 0), help="Bug reports generated in the active project")
     
     st.markdown("---")
 
@@ -2003,8 +1641,9 @@ elif page == "Test Case Generator":
                     
                     if brd_quick_file:
                         try:
+                            quick_options = extraction_options_input(brd_quick_file, key="quick_brd")
                             if brd_quick_file.type in FILE_PROCESSORS:
-                                raw_content = FILE_PROCESSORS[brd_quick_file.type](brd_quick_file)
+                                raw_content = extract_uploaded_file(brd_quick_file, quick_options)
                             else:
                                 raw_content = brd_quick_file.read().decode('utf-8')
                                 
@@ -2038,6 +1677,7 @@ elif page == "Test Case Generator":
                                     tc["id"] = f"TC_{module_name}_Q{len(st.session_state.test_cases) + i + 1}"
                                     tc["selected"] = False
                                 st.session_state.test_cases.extend(generated)
+                                st.session_state.last_requirements_text = final_req_content
                                 show_toast(f"✅ Generated {len(generated)} test cases!")
                         except Exception as e:
                             st.error(f"Error: {e}")
@@ -2107,7 +1747,7 @@ elif page == "Test Case Generator":
                     if api_doc:
                         try:
                             if api_doc.type in FILE_PROCESSORS:
-                                api_info = FILE_PROCESSORS[api_doc.type](api_doc)
+                                api_info = extract_uploaded_file(api_doc)
                             else:
                                 api_info = api_doc.read().decode('utf-8')
                         except:
@@ -2269,10 +1909,12 @@ elif page == "Test Case Generator":
                     attachments_data = []
                     for file in attachments:
                         if file.type.startswith('image'):
-                            content = base64.b64encode(file.read()).decode('utf-8')
+                            # Store a downscaled copy instead of the full-size original
+                            image = process_for_attachment(file.getvalue(), file.type)
+                            content = base64.b64encode(image["data"]).decode('utf-8')
                             attachments_data.append({
                                 "name": file.name,
-                                "type": file.type,
+                                "type": image["mime_type"],
                                 "content": content
                             })
                         else:
@@ -2402,8 +2044,10 @@ elif page == "Test Case Generator":
         # Display uploaded files
         if uploaded_files:
             st.info(f"📁 {len(uploaded_files)} file(s) uploaded")
+            requirement_extract_options = {}
             for file in uploaded_files:
                 st.caption(f"• {file.name} ({file.type})")
+                requirement_extract_options[file.name] = extraction_options_input(file, key=f"req_{file.name}")
         
         st.markdown("**Or Enter Requirements Manually:**")
         user_story = st.text_area(
@@ -2425,21 +2069,35 @@ elif page == "Test Case Generator":
             # Process uploaded files
             extracted_content = ""
             if uploaded_files:
-                with st.spinner("Processing uploaded files..."):
-                    for file in uploaded_files:
+                # Extract all files concurrently; combine in upload order
+                contents = [None] * len(uploaded_files)
+                extract_progress = st.progress(0.0, text=f"Processing {len(uploaded_files)} uploaded file(s)...")
+                file_status = st.empty()
+                jobs_to_extract = []
+                for index, file in enumerate(uploaded_files):
+                    if file.type in FILE_PROCESSORS:
+                        jobs_to_extract.append((index, (file.getvalue(), file.type, requirement_extract_options.get(file.name))))
+                    else:
+                        # Try to read as text for unknown types
                         try:
-                            if file.type in FILE_PROCESSORS:
-                                content = FILE_PROCESSORS[file.type](file)
-                                extracted_content += f"\n\n--- Content from {file.name} ---\n{content}"
-                            else:
-                                # Try to read as text for unknown types
-                                try:
-                                    content = file.read().decode("utf-8")
-                                    extracted_content += f"\n\n--- Content from {file.name} ---\n{content}"
-                                except:
-                                    st.warning(f"Could not process {file.name}")
-                        except Exception as e:
-                            st.warning(f"Error processing {file.name}: {str(e)}")
+                            contents[index] = file.read().decode("utf-8")
+                        except:
+                            st.warning(f"Could not process {file.name}")
+                finished = []
+                for done, (job_index, content, error) in enumerate(iter_extract_many([job for _, job in jobs_to_extract]), start=1):
+                    file = uploaded_files[jobs_to_extract[job_index][0]]
+                    if error is not None:
+                        st.warning(f"Error processing {file.name}: {str(error)}")
+                    else:
+                        contents[jobs_to_extract[job_index][0]] = content
+                    finished.append(f"{'❌' if error is not None else '✅'} {file.name}")
+                    extract_progress.progress(done / len(jobs_to_extract), text=f"Extracted {done}/{len(jobs_to_extract)} file(s)")
+                    file_status.caption(" · ".join(finished))
+                extract_progress.empty()
+                file_status.empty()
+                for file, content in zip(uploaded_files, contents):
+                    if content is not None:
+                        extracted_content += f"\n\n--- Content from {file.name} ---\n{content}"
             
             # Combine manual input and file content
             combined_requirements = user_story
@@ -2463,6 +2121,7 @@ elif page == "Test Case Generator":
                                 tc["attachments"] = []
                         
                         st.session_state.test_cases.extend(generated_cases)
+                        st.session_state.last_requirements_text = combined_requirements
                         show_toast(f"✅ Successfully generated {len(generated_cases)} test cases!")
                     else:
                         st.error("Failed to generate test cases. Please try again with more specific requirements.")
@@ -2480,6 +2139,9 @@ elif page == "Test Case Generator":
         if 'learned_rules' not in st.session_state:
             st.session_state.learned_rules = None
         
+        # Reuse a saved style profile instantly (no API call)
+        render_style_profile_picker(TEST_CASE_STYLE, "learned_rules", "tc_style")
+        
         # Step 1: Upload Examples
         st.markdown("### Step 1: Upload Example Test Cases")
         st.info("📁 Upload 3-5 of your best test case examples (MD, TXT, PDF, DOCX)")
@@ -2497,7 +2159,7 @@ elif page == "Test Case Generator":
                 with st.expander(f"📄 {f.name}"):
                     try:
                         if f.type in FILE_PROCESSORS:
-                            content = FILE_PROCESSORS[f.type](f)
+                            content = extract_uploaded_file(f)
                         else:
                             content = f.read().decode('utf-8')
                             f.seek(0)
@@ -2515,7 +2177,7 @@ elif page == "Test Case Generator":
                 for f in example_files:
                     try:
                         if f.type in FILE_PROCESSORS:
-                            content = FILE_PROCESSORS[f.type](f)
+                            content = extract_uploaded_file(f)
                         else:
                             content = f.read().decode('utf-8')
                             f.seek(0)
@@ -2524,10 +2186,17 @@ elif page == "Test Case Generator":
                         st.warning(f"Could not process {f.name}: {e}")
                 
                 if example_contents:
-                    learned = learn_from_examples(example_contents)
+                    # Identical examples reuse the cached rules (zero API calls)
+                    learned, content_hash, from_cache = learn_with_cache(
+                        get_project_store(), TEST_CASE_STYLE, example_contents, learn_from_examples
+                    )
                     if learned:
                         st.session_state.learned_rules = learned
-                        show_toast("✅ Successfully learned patterns from your examples!")
+                        st.session_state.learned_rules_hash = content_hash
+                        if from_cache:
+                            show_toast("♻️ Loaded previously learned patterns for these examples!")
+                        else:
+                            show_toast("✅ Successfully learned patterns from your examples!")
                     else:
                         st.error("Could not learn patterns. Please try with different examples.")
         
@@ -2552,6 +2221,8 @@ elif page == "Test Case Generator":
             
             st.info(f"💡 **Summary:** {rules.get('summary', 'N/A')}")
             
+            render_save_style_profile(TEST_CASE_STYLE, "learned_rules", "tc_style")
+            
             # Step 3: Generate with Learned Style
             st.markdown("### Step 3: Generate Test Cases with Learned Style")
             
@@ -2588,7 +2259,7 @@ elif page == "Test Case Generator":
                     try:
                         # Extract content from the uploaded file
                         if brd_file.type in FILE_PROCESSORS:
-                            brd_content = FILE_PROCESSORS[brd_file.type](brd_file)
+                            brd_content = extract_uploaded_file(brd_file)
                         else:
                             brd_content = brd_file.read().decode('utf-8')
                             brd_file.seek(0)
@@ -2640,6 +2311,7 @@ elif page == "Test Case Generator":
                                 tc["attachments"] = []
                         
                         st.session_state.test_cases.extend(generated)
+                        st.session_state.last_requirements_text = learn_requirements
                         
                         # Show summary
                         if summary:
@@ -2655,65 +2327,100 @@ elif page == "Test Case Generator":
             # Option to clear learned rules
             if st.button("🗑️ Clear Learned Patterns", key="clear_rules"):
                 st.session_state.learned_rules = None
+                st.session_state.learned_rules_hash = None
                 st.rerun()
 
     
-    # Export to Excel function
-    def export_test_cases_to_excel(test_cases):
-        """Convert test cases to Excel file"""
-        data = []
-        for tc in test_cases:
-            data.append({
-                'ID': tc['id'],
-                'Title': tc['title'],
-                'Priority': tc['priority'],
-                'Preconditions': '\n'.join(tc.get('preconditions', [])),
-                'Test Data': '\n'.join(tc.get('test_data', [])),
-                'Test Steps': '\n'.join(tc.get('test_steps', [])),
-                'Expected Results': '\n'.join(tc.get('expected_results', []))
-            })
-        df = pd.DataFrame(data)
-        output = BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name='Test Cases')
-        output.seek(0)
-        return output
+    # Build Excel bytes only when the exported test cases change
+    def cached_excel_export(cache_name, cache_key, load_cases):
+        cache = st.session_state.setdefault('excel_export_cache', {})
+        cached = cache.get(cache_name)
+        if not cached or cached[0] != cache_key:
+            cached = (cache_key, export_test_cases_to_excel(load_cases()).getvalue())
+            cache[cache_name] = cached
+        return cached[1]
+    
+    # Checkbox callback - selection lives in a set so it survives pagination
+    def toggle_test_case_selection(case_id):
+        if st.session_state.get(f"select_{case_id}", False):
+            st.session_state.selected_case_ids.add(case_id)
+        else:
+            st.session_state.selected_case_ids.discard(case_id)
     
     # Bulk actions
     if st.session_state.test_cases:
         st.subheader("Test Case Management")
         
+        test_case_list = st.session_state.test_cases
+        selected_ids = st.session_state.selected_case_ids
+        store_revision = get_project_store().test_case_revision(st.session_state.active_project)
+        
         # Google Sheet Configuration for Bulk Actions
         target_sheet_bulk = "RoboTest Cases"
         if st.session_state.get('google_creds'):
              target_sheet_bulk = st.text_input("Target Google Sheet", value="RoboTest Cases", key="bulk_sheet_name")
 
-        # Export to Excel button (All)
-        excel_file = export_test_cases_to_excel(st.session_state.test_cases)
-        st.download_button(
-            label="📥 Export All Test Cases to Excel",
-            data=excel_file,
-            file_name="test_cases.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            use_container_width=True,
-            key="export_excel"
+        # Export All to Excel - built on demand and cached until the project's test cases change
+        all_export_key = (st.session_state.active_project, store_revision)
+        all_export = st.session_state.get('excel_export_cache', {}).get("all")
+        if not all_export or all_export[0] != all_export_key:
+            if st.button("📥 Export All Test Cases to Excel", key="prepare_all_excel", use_container_width=True):
+                cached_excel_export("all", all_export_key, lambda: list(test_case_list))
+                all_export = st.session_state.excel_export_cache["all"]
+        if all_export and all_export[0] == all_export_key:
+            st.download_button(
+                label=f"💾 Download All ({len(test_case_list)}) .xlsx",
+                data=all_export[1],
+                file_name="test_cases.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                use_container_width=True,
+                key="export_excel"
+            )
+        
+        # Full-text search (SQLite FTS5 index over title, steps, expected results and test data)
+        search_query = st.text_input(
+            "🔍 Search test cases",
+            placeholder="Search title, steps, expected results, test data... (English / العربية)",
+            key="tc_search_query"
         )
         
+        # Facet and sort controls (evaluated in SQLite, nothing is rendered for hidden cases)
+        facet_labels = {"priority": "Priority", "severity": "Severity", "category": "Category", "test_type": "Test Type"}
+        list_filters = {"search": search_query}
+        for field in facet_labels:
+            list_filters[field] = st.session_state.get(f"tc_facet_{field}", [])
+        
+        f_cols = st.columns([2, 2, 2, 2, 2, 1])
+        for f_col, (field, label) in zip(f_cols, facet_labels.items()):
+            counts = test_case_list.facet_counts(field, list_filters)
+            options = sorted(set(test_case_list.facet_values(field)) | set(list_filters[field]))
+            with f_col:
+                list_filters[field] = st.multiselect(
+                    label,
+                    options,
+                    format_func=lambda value, counts=counts: f"{value} ({counts.get(value, 0)})",
+                    key=f"tc_facet_{field}"
+                )
+        with f_cols[4]:
+            sort_by = st.selectbox("Sort by", list(SORT_ORDERS), key="tc_sort_by")
+        with f_cols[5]:
+            sort_desc = st.checkbox("Desc", key="tc_sort_desc", help="Sort in descending order")
+        
+        filtered_count = test_case_list.count(list_filters)
+        
         # Bulk actions container
         with st.container():
             st.markdown('<div class="bulk-actions">', unsafe_allow_html=True)
             
-            # Select All button (using button instead of checkbox for reliable behavior)
+            # Select All / Deselect All apply to the whole filtered set, not just the visible page
             col_sel1, col_sel2, col_sel3 = st.columns([1, 1, 3])
             with col_sel1:
-                if st.button("✅ Select All", key="select_all_btn", use_container_width=True):
-                    for tc in st.session_state.test_cases:
-                        st.session_state[f"select_{tc['id']}"] = True
+                if st.button(f"✅ Select All ({filtered_count})", key="select_all_btn", use_container_width=True):
+                    selected_ids.update(test_case_list.case_ids(list_filters))
                     st.rerun()
             with col_sel2:
                 if st.button("⬜ Deselect All", key="deselect_all_btn", use_container_width=True):
-                    for tc in st.session_state.test_cases:
-                        st.session_state[f"select_{tc['id']}"] = False
+                    selected_ids.difference_update(test_case_list.case_ids(list_filters))
                     st.rerun()
             
             # Copy all button
@@ -2724,42 +2431,39 @@ elif page == "Test Case Generator":
                      "\n".join([f"- {step}" for step in tc['test_steps']]) +
                      "\n\nExpected Results:\n" + 
                      "\n".join([f"- {result}" for result in tc['expected_results']])
-                    for tc in st.session_state.test_cases]
+                    for tc in test_case_list]
                 )
                 
                 st.session_state.test_cases_str = test_cases_str
                 st.rerun()
             
-            # Calculate selected count using session state keys
-            selected_count = sum(1 for tc in st.session_state.test_cases 
-                               if st.session_state.get(f"select_{tc['id']}", False))
+            selected_count = len(selected_ids)
             
             if selected_count > 0:
                 # Group buttons for selected actions
                 b_col1, b_col2, b_col3 = st.columns(3)
-                
-                selected_cases = [
-                        tc for tc in st.session_state.test_cases 
-                        if st.session_state.get(f"select_{tc['id']}", False)
-                    ]
 
                 with b_col1:
                     if st.button(f"🚀 Automate ({selected_count})", key="gen_selected"):
-                        st.session_state.selected_test_cases = selected_cases
+                        st.session_state.selected_test_cases = test_case_list.get_many(selected_ids)
                         st.query_params["page"] = "Test Automation"
                         st.rerun()
                 
                 with b_col2:
-                    # Export Selected to Excel
-                    excel_selected = export_test_cases_to_excel(selected_cases)
-                    st.download_button(
-                        label=f"📥 Export ({selected_count}) to Excel",
-                        data=excel_selected,
-                        file_name=f"selected_test_cases_{selected_count}.xlsx",
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                        use_container_width=True,
-                        key="export_selected_excel"
-                    )
+                    # Export Selected to Excel - built on demand, not on every checkbox click
+                    selected_export_key = (st.session_state.active_project, store_revision, frozenset(selected_ids))
+                    if st.button(f"📥 Export ({selected_count}) to Excel", key="prepare_selected_excel", use_container_width=True):
+                        cached_excel_export("selected", selected_export_key, lambda: test_case_list.get_many(selected_ids))
+                    selected_export = st.session_state.get('excel_export_cache', {}).get("selected")
+                    if selected_export and selected_export[0] == selected_export_key:
+                        st.download_button(
+                            label=f"💾 Download ({selected_count}) .xlsx",
+                            data=selected_export[1],
+                            file_name=f"selected_test_cases_{selected_count}.xlsx",
+                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                            use_container_width=True,
+                            key="export_selected_excel"
+                        )
 
                 with b_col3:
                     # Save Selected to Google Sheet
@@ -2776,7 +2480,7 @@ elif page == "Test Case Generator":
                                 
                                 # Bulk prepare rows
                                 rows_to_append = []
-                                for tc in selected_cases:
+                                for tc in test_case_list.get_many(selected_ids):
                                     rows_to_append.append([
                                         tc['id'],
                                         tc['title'],
@@ -2801,18 +2505,12 @@ elif page == "Test Case Generator":
             
             # Delete selected button
             if st.button("🗑️ Delete Selected", key="delete_selected"):
-                # Count selected BEFORE deleting using session state
-                count_to_delete = sum(1 for tc in st.session_state.test_cases 
-                                     if st.session_state.get(f"select_{tc['id']}", False))
+                count_to_delete = len(selected_ids)
                 if count_to_delete > 0:
-                    # Get IDs to delete
-                    ids_to_delete = [tc['id'] for tc in st.session_state.test_cases 
-                                    if st.session_state.get(f"select_{tc['id']}", False)]
-                    # Remove from test_cases
-                    st.session_state.test_cases = [
-                        tc for tc in st.session_state.test_cases 
-                        if not st.session_state.get(f"select_{tc['id']}", False)
-                    ]
+                    ids_to_delete = list(selected_ids)
+                    # Remove from test_cases (single transaction in the project store)
+                    test_case_list.remove_ids(ids_to_delete)
+                    selected_ids.clear()
                     # Clean up session state keys for deleted items
                     for tc_id in ids_to_delete:
                         if f"select_{tc_id}" in st.session_state:
@@ -2824,22 +2522,38 @@ elif page == "Test Case Generator":
             
             st.markdown('</div>', unsafe_allow_html=True)
         
+        # Pagination controls - only the visible window is loaded and rendered
+        p_col1, p_col2, p_col3 = st.columns([1, 1, 3])
+        with p_col1:
+            page_size = st.selectbox("Page size", [10, 25, 50, 100], index=1, key="tc_page_size")
+        total_pages = max(1, (filtered_count + page_size - 1) // page_size)
+        if st.session_state.get('tc_page', 1) > total_pages:
+            st.session_state.tc_page = total_pages
+        with p_col2:
+            current_page = st.number_input("Page", min_value=1, max_value=total_pages, step=1, key="tc_page")
+        page_offset = (current_page - 1) * page_size
+        with p_col3:
+            st.caption(
+                f"Showing {min(page_offset + 1, filtered_count)}-{min(page_offset + page_size, filtered_count)} "
+                f"of {filtered_count} matching ({len(test_case_list)} total, {selected_count} selected)"
+            )
+        
         # Test case container with scroll
         st.markdown('<div class="test-case-container">', unsafe_allow_html=True)
         
-        # Display all test cases
-        for idx, test_case in enumerate(st.session_state.test_cases):
+        # Display the visible page of test cases
+        for row_id, test_case in test_case_list.window(list_filters, sort_by, sort_desc, page_offset, page_size):
             with st.container():
                 col1, col2, col3 = st.columns([1, 10, 2])
                 
                 with col1:
-                    # Initialize checkbox state if not exists
-                    if f"select_{test_case['id']}" not in st.session_state:
-                        st.session_state[f"select_{test_case['id']}"] = False
-                    # Checkbox for selection - controlled by session state key only
+                    # Sync checkbox state from the selection set before the widget is created
+                    st.session_state[f"select_{test_case['id']}"] = test_case['id'] in selected_ids
                     st.checkbox("", 
                                key=f"select_{test_case['id']}",
-                               label_visibility="collapsed")
+                               label_visibility="collapsed",
+                               on_change=toggle_test_case_selection,
+                               args=(test_case['id'],))
                 
                 with col2:
                     # Test case card
@@ -2882,13 +2596,102 @@ elif page == "Test Case Generator":
                     # Edit button
                     if st.button("✏️ Edit", key=f"edit_{test_case['id']}"):
                         st.session_state.editing_test_case = test_case
-                        st.session_state.editing_index = idx
+                        st.session_state.editing_row_id = row_id
         
         st.markdown('</div>', unsafe_allow_html=True)
     
     else:
         st.info("No test cases created yet. Create or generate test cases to get started.")
     
+    # Requirements traceability - links are kept in session and refreshed incrementally
+    if st.session_state.test_cases:
+        with st.expander("🔗 Requirements Traceability", expanded=False):
+            trace_file = st.file_uploader(
+                "Upload requirements (optional)",
+                type=["txt", "pdf", "docx", "md"],
+                key="trace_req_file",
+                help="Defaults to the requirements last used to generate test cases"
+            )
+            trace_text = st.text_area(
+                "Requirements",
+                value=st.session_state.get('last_requirements_text', ''),
+                height=150,
+                key="trace_req_text",
+                help="Numbered items (1., 1.2, REQ-12:), bullets or plain paragraphs"
+            )
+            trace_revision = (st.session_state.active_project, get_project_store().test_case_revision(st.session_state.active_project))
+            
+            if st.button("🔗 Build Traceability Matrix", key="build_traceability", use_container_width=True):
+                requirements_text = trace_text
+                if trace_file is not None:
+                    try:
+                        requirements_text = extract_uploaded_file(trace_file, mime_type=trace_file.type if trace_file.type in FILE_PROCESSORS else "text/plain")
+                    except Exception as e:
+                        st.error(f"Error processing {trace_file.name}: {str(e)}")
+                with st.spinner("Linking test cases to requirements..."):
+                    index = st.session_state.get('traceability_index') or TraceabilityIndex()
+                    index.set_requirements(requirements_text)
+                    index.update_cases(st.session_state.test_cases)
+                    st.session_state.traceability_index = index
+                    st.session_state.traceability_revision = trace_revision
+            
+            index = st.session_state.get('traceability_index')
+            if index and index.requirements:
+                # Only new or edited test cases are re-embedded
+                if st.session_state.get('traceability_revision') != trace_revision:
+                    index.update_cases(st.session_state.test_cases)
+                    st.session_state.traceability_revision = trace_revision
+                
+                coverage = index.coverage()
+                uncovered = [req for req, cases in coverage if not cases]
+                covered_count = len(coverage) - len(uncovered)
+                
+                st.markdown('<div class="traceability-matrix"><h3>🔗 Traceability Matrix</h3>', unsafe_allow_html=True)
+                m_cols = st.columns(4)
+                m_cols[0].metric("Requirements", len(coverage))
+                m_cols[1].metric("Covered", f"{covered_count} ({covered_count * 100 // max(len(coverage), 1)}%)")
+                m_cols[2].metric("Uncovered", len(uncovered))
+                m_cols[3].metric("Linked Test Cases", sum(1 for links in index.links.values() if links))
+                
+                trace_tab1, trace_tab2, trace_tab3 = st.tabs(["📋 Coverage", "🔲 Matrix", "⚠️ Uncovered"])
+                with trace_tab1:
+                    st.dataframe(pd.DataFrame([{
+                        "Requirement ID": req["id"],
+                        "Requirement": req["text"],
+                        "Test Cases": ", ".join(case_id for case_id, _ in cases),
+                        "Best Score": round(cases[0][1], 3) if cases else None
+                    } for req, cases in coverage]), use_container_width=True, hide_index=True)
+                
+                with trace_tab2:
+                    link_rows = index.link_rows()
+                    if link_rows:
+                        links_df = pd.DataFrame(link_rows)
+                        # Rendering every requirement x case cell does not scale; show a window of requirements
+                        req_ids = [req["id"] for req in index.requirements]
+                        start = st.number_input("From requirement", min_value=1, max_value=len(req_ids), value=1, step=50, key="trace_matrix_start")
+                        window_ids = req_ids[start - 1:start + 49]
+                        window_df = links_df[links_df["Requirement ID"].isin(window_ids)]
+                        if not window_df.empty:
+                            matrix = pd.crosstab(window_df["Requirement ID"], window_df["Test Case ID"]).reindex(window_ids, fill_value=0)
+                            st.dataframe(matrix.replace({0: "", 1: "✔"}), use_container_width=True)
+                        st.download_button(
+                            "📥 Download Links (CSV)",
+                            data=links_df.to_csv(index=False).encode("utf-8"),
+                            file_name="traceability_matrix.csv",
+                            mime="text/csv",
+                            key="download_traceability"
+                        )
+                    else:
+                        st.info("No test cases are linked to these requirements yet.")
+                
+                with trace_tab3:
+                    if uncovered:
+                        for req in uncovered:
+                            st.markdown(f"- **{req['id']}** {req['text']}")
+                    else:
+                        st.success("✅ Every requirement is covered by at least one test case.")
+                st.markdown('</div>', unsafe_allow_html=True)
+    
     # Copy all test cases modal
     if st.session_state.test_cases_str:
         st.text_area("Copy all test cases", 
@@ -2901,7 +2704,7 @@ elif page == "Test Case Generator":
     # Edit test case modal
     if st.session_state.editing_test_case:
         test_case = st.session_state.editing_test_case
-        idx = st.session_state.editing_index
+        row_id = st.session_state.editing_row_id
         
         with st.form(f"edit_form_{test_case['id']}"):
             st.subheader(f"Editing: {test_case['id']}")
@@ -2937,7 +2740,7 @@ elif page == "Test Case Generator":
             with col1:
                 if st.form_submit_button("Save Changes", use_container_width=True):
                     # Update test case
-                    st.session_state.test_cases[idx] = {
+                    updated_case = {
                         "id": test_case['id'],
                         "title": title,
                         "preconditions": [p.strip() for p in preconditions.split('\n') if p.strip()],
@@ -2946,13 +2749,16 @@ elif page == "Test Case Generator":
                         "expected_results": [e.strip() for e in expected.split('\n') if e.strip()],
                         "priority": priority,
                         "attachments": test_case.get('attachments', []),  # FIXED: Use get with default
-                        "selected": test_case.get('selected', False)
+                        "selected": test_case.get('selected', False),
+                        # Keep facet fields so the case stays findable in search filters
+                        **{k: test_case[k] for k in ("severity", "category", "test_type") if k in test_case}
                     }
+                    st.session_state.test_cases.update_row(row_id, updated_case)
                     st.session_state.editing_test_case = None
                     show_toast("✅ Test case created/updated successfully!")
                     
                     # Store last saved case for post-save actions
-                    st.session_state.last_saved_case = st.session_state.test_cases[idx] if st.session_state.get('editing_test_case') else test_case
+                    st.session_state.last_saved_case = updated_case if st.session_state.get('editing_test_case') else test_case
                     
                     st.session_state.editing_test_case = None
                     st.session_state.reset_form = True # Flag to clear form on next run if needed
@@ -3053,12 +2859,19 @@ elif page == "Test Automation":
         st.markdown("### 🛠️ Select Automation Framework")
         automation_framework = st.selectbox(
             "Choose framework based on your test type:",
-            ["🖥️ Selenium WebDriver (UI Tests)", "🔗 REST Assured (API Tests)", "📋 Unit Test Specifications (For Developers)"],
+            ["🖥️ Selenium WebDriver (UI Tests)", "🔗 REST Assured (API Tests)", "📋 Unit Test Specifications (For Developers)",
+             "🧭 Auto (route each test case by type)"],
             key="automation_framework"
         )
         
+        # Auto: preview where each selected test case goes
+        if "Auto" in automation_framework:
+            routed = generation.route_test_cases(st.session_state.selected_test_cases)
+            st.caption("Routing: " + " | ".join(f"**{generation.AUTO_FOLDERS[fw]}**: {len(cases)}" for fw, cases in routed.items())
+                       + " - uses each test case's type when the generator set one, otherwise detects it from the title and steps.")
+        
         # Generation mode selection (for Selenium and REST Assured)
-        if "Selenium" in automation_framework or "REST Assured" in automation_framework:
+        if "Selenium" in automation_framework or "REST Assured" in automation_framework or "Auto" in automation_framework:
             st.radio(
                 "Generation Mode:",
                 ["Combined Test Suite", "Separate Test Classes"],
@@ -3070,7 +2883,9 @@ elif page == "Test Automation":
         st.markdown("### ⚙️ Code Generation Options")
         
         # Framework-specific options
-        if "Selenium" in automation_framework:
+        if "Selenium" in automation_framework or "Auto" in automation_framework:
+            if "Auto" in automation_framework:
+                st.markdown("#### 🖥️ Selenium (UI test cases)")
             col_opt1, col_opt2 = st.columns(2)
             with col_opt1:
                 use_pom = st.checkbox("📄 Use Page Object Model (POM)", value=True, 
@@ -3084,6 +2899,35 @@ elif page == "Test Automation":
                                               help="Use @DataProvider for parameterized tests")
                 use_bdd = st.checkbox("📝 BDD Style Comments", value=False,
                                       help="Add Given-When-Then style comments")
+            
+            # Saved HTML pages -> real locators for the page objects
+            page_files = st.file_uploader(
+                "🌐 Page Snapshots (Optional)",
+                type=['html', 'htm', 'zip'],
+                accept_multiple_files=True,
+                key="page_snapshot_uploader",
+                help="Saved HTML pages of the application (File > Save Page As), or a .zip of them - page objects use their real locators"
+            )
+            page_index = None
+            if page_files:
+                try:
+                    page_index = build_locator_index([(f.name, f.getvalue()) for f in page_files])
+                except Exception as e:
+                    st.error(f"Could not read page snapshots: {e}")
+                if page_index is not None:
+                    st.caption(f"🧭 {len(page_index.pages)} pages, {len(page_index)} interactive elements indexed - each test case gets the locators of its relevant pages")
+                    with st.expander("🔎 Locator Index", expanded=False):
+                        st.code("\n\n".join(page.render(page.elements) for page in page_index.pages))
+                elif page_files:
+                    st.warning("No interactive elements found in the uploaded pages")
+            st.session_state.page_index = page_index
+            
+            if "Auto" in automation_framework:
+                # API test cases are routed to REST Assured - same spec and style context as the REST Assured option
+                st.markdown("#### 🔗 REST Assured (API test cases)")
+                st.checkbox("📝 BDD Style (given/when/then)", value=True, key="auto_rest_bdd",
+                            help="Use BDD style with given().when().then() pattern")
+                render_rest_assured_sources()
         elif "REST Assured" in automation_framework:
             # REST Assured specific options
             col_opt1, col_opt2 = st.columns(2)
@@ -3098,115 +2942,7 @@ elif page == "Test Automation":
             use_pom = False
             use_bot_style = False
             
-            st.markdown("---")
-            
-            # API Specification Upload Section
-            st.markdown("### 📄 API Documentation (Optional)")
-            st.info("Upload API specs (Swagger/OpenAPI) or technical docs from developers for more accurate test generation")
-            
-            api_spec_file = st.file_uploader(
-                "Upload API Specification",
-                type=['json', 'yaml', 'yml', 'md', 'txt', 'pdf', 'docx'],
-                key="api_spec_uploader",
-                help="Swagger, OpenAPI, Postman collection, or any API documentation"
-            )
-            
-            api_spec_content = ""
-            if api_spec_file:
-                st.success(f"✅ Uploaded: {api_spec_file.name}")
-                try:
-                    if api_spec_file.type in FILE_PROCESSORS:
-                        api_spec_content = FILE_PROCESSORS[api_spec_file.type](api_spec_file)
-                    else:
-                        api_spec_content = api_spec_file.read().decode('utf-8')
-                        api_spec_file.seek(0)
-                    
-                    with st.expander("📋 Preview API Spec", expanded=False):
-                        st.code(api_spec_content[:2000] + "..." if len(api_spec_content) > 2000 else api_spec_content)
-                    
-                    # Store in session state for use in generation
-                    st.session_state.api_spec_content = api_spec_content
-                except Exception as e:
-                    st.error(f"Could not read file: {e}")
-            
-            st.markdown("---")
-            
-            # Learn from Existing REST Assured Scripts
-            st.markdown("### 🎓 Learn from Your Scripts (Optional)")
-            st.info("Upload your existing REST Assured scripts and AI will learn your coding style")
-            
-            example_scripts = st.file_uploader(
-                "Upload Example REST Assured Scripts",
-                type=['java', 'txt'],
-                accept_multiple_files=True,
-                key="rest_assured_examples",
-                help="Upload 1-3 of your best REST Assured test scripts"
-            )
-            
-            learned_script_style = None
-            if example_scripts:
-                st.success(f"✅ {len(example_scripts)} script(s) uploaded")
-                
-                # Preview uploaded scripts
-                for script in example_scripts:
-                    with st.expander(f"📄 {script.name}", expanded=False):
-                        content = script.read().decode('utf-8')
-                        script.seek(0)
-                        st.code(content[:1500] + "..." if len(content) > 1500 else content, language='java')
-                
-                # Learn button
-                if st.button("🔍 Learn from Scripts", key="learn_rest_scripts"):
-                    with st.spinner("Analyzing your REST Assured coding style..."):
-                        script_contents = []
-                        for script in example_scripts:
-                            content = script.read().decode('utf-8')
-                            script.seek(0)
-                            script_contents.append(content)
-                        
-                        # Use AI to learn patterns
-                        learn_prompt = f"""
-                        Analyze these REST Assured test scripts and extract the coding patterns and style:
-                        
-                        {chr(10).join(['---SCRIPT---' + chr(10) + s for s in script_contents])}
-                        
-                        Return a JSON with:
-                        {{
-                            "package_structure": "How packages are organized",
-                            "class_naming": "Class naming convention",
-                            "method_naming": "Method naming convention",
-                            "assertion_style": "How assertions are written",
-                            "request_style": "How requests are structured",
-                            "response_handling": "How responses are validated",
-                            "logging_approach": "Logging style used",
-                            "special_patterns": ["List of unique patterns"]
-                        }}
-                        """
-                        
-                        try:
-                            response = call_ai(learn_prompt)
-                            json_match = re.search(r'\{[\s\S]*\}', response)
-                            if json_match:
-                                st.session_state.learned_rest_style = json.loads(json_match.group())
-                                show_toast("✅ Learned your REST Assured coding style!")
-                        except Exception as e:
-                            st.error(f"Error learning style: {e}")
-                
-                # Display learned style
-                if st.session_state.get('learned_rest_style'):
-                    style = st.session_state.learned_rest_style
-                    with st.expander("📊 Learned Style", expanded=True):
-                        cols = st.columns(2)
-                        with cols[0]:
-                            st.markdown(f"**Class Naming:** {style.get('class_naming', 'N/A')}")
-                            st.markdown(f"**Method Naming:** {style.get('method_naming', 'N/A')}")
-                            st.markdown(f"**Request Style:** {style.get('request_style', 'N/A')}")
-                        with cols[1]:
-                            st.markdown(f"**Assertion Style:** {style.get('assertion_style', 'N/A')}")
-                            st.markdown(f"**Response Handling:** {style.get('response_handling', 'N/A')}")
-                    
-                    if st.button("🗑️ Clear Learned Style", key="clear_rest_style"):
-                        del st.session_state.learned_rest_style
-                        st.rerun()
+            render_rest_assured_sources()
         else:  # Unit Test Specifications
             st.info("📋 Unit Test Specifications will generate detailed documentation for developers to implement unit tests.")
             output_format = st.selectbox(
@@ -3232,83 +2968,96 @@ elif page == "Test Automation":
         # Generate button - different label based on framework
         button_label = "Generate Selenium Code" if "Selenium" in automation_framework else \
                        "Generate REST Assured Code" if "REST Assured" in automation_framework else \
+                       "Generate All (Auto-Routed)" if "Auto" in automation_framework else \
                        "Generate Unit Test Specifications"
         
-        if st.button(f"🚀 {button_label}", key="generate_automation", use_container_width=True):
+        incremental = st.checkbox(
+            "♻️ Only regenerate test cases that changed",
+            value=True,
+            key="incremental_automation",
+            help="Reuse the code of test cases whose title, steps, expected results, options and custom instructions are unchanged since it was generated"
+        )
+        
+        automation_job_id = st.session_state.get('automation_job_id')
+        automation_job_running = bool(automation_job_id) and not getattr(get_job_runner().get(automation_job_id), "finished", True)
+        
+        if st.button(f"🚀 {button_label}", key="generate_automation", use_container_width=True, disabled=automation_job_running):
             custom_prompt_value = st.session_state.get('custom_automation_prompt', '')
+            combined = st.session_state.get('generation_mode') == "Combined Test Suite"
             
-            # Framework-specific generation
+            # Framework-specific generation - runs as a background job
             if "Selenium" in automation_framework:
-                with st.spinner("Generating production-ready Java Selenium code..."):
-                    st.session_state.automation_code = {}
-                    
-                    if st.session_state.get('generation_mode') == "Combined Test Suite":
-                        automation_code = generate_combined_automation_code(
-                            st.session_state.selected_test_cases,
-                            use_pom=use_pom,
-                            use_oop=use_oop,
-                            use_data_driven=use_data_driven,
-                            use_bdd=use_bdd,
-                            use_bot_style=use_bot_style,
-                            custom_prompt=custom_prompt_value
-                        )
-                        if automation_code:
-                            st.session_state.automation_code["combined"] = parse_generated_code(automation_code)
-                            show_toast("✅ Combined Selenium test suite generated successfully!")
-                    else:
-                        for test_case in st.session_state.selected_test_cases:
-                            automation_code = generate_test_case_automation_code(
-                                test_case,
-                                use_pom=use_pom,
-                                use_oop=use_oop,
-                                use_data_driven=use_data_driven,
-                                use_bdd=use_bdd,
-                                use_bot_style=use_bot_style,
-                                custom_prompt=custom_prompt_value
-                            )
-                            st.session_state.automation_code[test_case['id']] = parse_generated_code(automation_code)
-                        show_toast("✅ Selenium automation code generated successfully!")
-            
+                framework = "selenium"
+                options = dict(
+                    use_pom=use_pom,
+                    use_oop=use_oop,
+                    use_data_driven=use_data_driven,
+                    use_bdd=use_bdd,
+                    use_bot_style=use_bot_style,
+                    custom_prompt=custom_prompt_value,
+                    page_index=st.session_state.get('page_index')
+                )
+                job_label = "Combined Selenium test suite" if combined else "Selenium automation code"
             elif "REST Assured" in automation_framework:
-                with st.spinner("Generating production-ready REST Assured API test code..."):
-                    st.session_state.automation_code = {}
-                    
-                    # Get API spec and learned style from session state
-                    api_spec = st.session_state.get('api_spec_content', '')
-                    learned_style = st.session_state.get('learned_rest_style', None)
-                    
-                    if st.session_state.get('generation_mode') == "Combined Test Suite":
-                        automation_code = generate_combined_rest_assured_code(
-                            st.session_state.selected_test_cases,
-                            use_bdd=use_bdd,
-                            custom_prompt=custom_prompt_value,
-                            api_spec=api_spec,
-                            learned_style=learned_style
-                        )
-                        if automation_code:
-                            st.session_state.automation_code["combined"] = parse_generated_code(automation_code)
-                            show_toast("✅ Combined REST Assured test suite generated successfully!")
-                    else:
-                        for test_case in st.session_state.selected_test_cases:
-                            automation_code = generate_rest_assured_code(
-                                test_case,
-                                use_bdd=use_bdd,
-                                custom_prompt=custom_prompt_value,
-                                api_spec=api_spec,
-                                learned_style=learned_style
-                            )
-                            st.session_state.automation_code[test_case['id']] = parse_generated_code(automation_code)
-                        show_toast("✅ REST Assured automation code generated successfully!")
-            
+                framework = "rest_assured"
+                # Get API spec and learned style from session state
+                options = dict(
+                    use_bdd=use_bdd,
+                    custom_prompt=custom_prompt_value,
+                    api_spec=st.session_state.get('api_spec_content', ''),
+                    learned_style=st.session_state.get('learned_rest_style', None)
+                )
+                job_label = "Combined REST Assured test suite" if combined else "REST Assured automation code"
+            elif "Auto" in automation_framework:
+                framework = "auto"
+                options = {
+                    "selenium": dict(use_pom=use_pom, use_oop=use_oop, use_data_driven=use_data_driven, use_bdd=use_bdd,
+                                     use_bot_style=use_bot_style, custom_prompt=custom_prompt_value,
+                                     page_index=st.session_state.get('page_index')),
+                    "rest_assured": dict(use_bdd=st.session_state.get('auto_rest_bdd', True), custom_prompt=custom_prompt_value,
+                                         api_spec=st.session_state.get('api_spec_content', ''),
+                                         learned_style=st.session_state.get('learned_rest_style', None)),
+                }
+                job_label = "Auto-routed automation"
             else:  # Unit Test Specifications
-                with st.spinner("Generating unit test specifications for developers..."):
-                    st.session_state.unit_test_specs = {}
-                    
-                    for test_case in st.session_state.selected_test_cases:
-                        specs = generate_unit_test_specifications(test_case)
-                        st.session_state.unit_test_specs[test_case['id']] = specs
-                    
-                    show_toast(f"✅ Generated specifications for {len(st.session_state.selected_test_cases)} test cases!")
+                framework = "unit_spec"
+                options = {}
+                job_label = "Unit test specifications"
+            
+            # Reuse the code of unchanged test cases (fingerprints of what it was generated from)
+            selected_cases = list(st.session_state.selected_test_cases)
+            fingerprints = generation.suite_fingerprints(framework, selected_cases, combined, options)
+            reuse = {}
+            if incremental:
+                if framework == "unit_spec":
+                    reuse = generation.reusable_results(fingerprints, st.session_state.get('unit_test_specs') or {},
+                                                        st.session_state.get('unit_spec_fingerprints'))
+                else:
+                    reuse = generation.reusable_results(fingerprints, st.session_state.automation_code,
+                                                        st.session_state.automation_fingerprints)
+            unchanged = len(selected_cases) if {"combined", generation.AUTO_KEY} & set(reuse) else \
+                sum(tc['id'] in reuse for tc in selected_cases)
+            if unchanged:
+                job_label += f" ({len(selected_cases) - unchanged} of {len(selected_cases)} test cases changed)"
+            
+            st.session_state.automation_job_id = submit_job(
+                automation_job,
+                framework,
+                selected_cases,
+                combined,
+                options,
+                reuse=reuse,
+                kind="automation",
+                label=job_label,
+                params={"project": st.session_state.active_project, "framework": framework, "fingerprints": fingerprints}
+            )
+            st.rerun()
+        
+        # Attach to the running generation (it keeps going if you switch pages)
+        if automation_job_running:
+            automation_job = get_job_runner().get(automation_job_id)
+            st.info(f"⏳ {automation_job.label} is generating in the background - you can keep working, the result appears here when ready.")
+            st.progress(automation_job.progress, text=automation_job.message)
         
         # Display results based on framework
         if "Unit Test Specifications" in automation_framework and st.session_state.get('unit_test_specs'):
@@ -3343,8 +3092,27 @@ elif page == "Test Automation":
         
         # Display automation code for Selenium/REST Assured
         if st.session_state.get('automation_code'):
+            # Auto-routed View - one download for all frameworks
+            if "Auto" in automation_framework and generation.AUTO_KEY in st.session_state.automation_code:
+                auto_files = st.session_state.automation_code[generation.AUTO_KEY]
+                st.markdown("### 🧭 Auto-Routed Automation")
+                if "ROUTING.md" in auto_files:
+                    with st.expander("Routing", expanded=False):
+                        st.markdown(auto_files["ROUTING.md"])
+                for folder in generation.AUTO_FOLDERS.values():
+                    folder_files = {name: content for name, content in auto_files.items() if name.startswith(folder + "/")}
+                    if folder_files:
+                        st.subheader(f"📁 {folder} ({len(folder_files)} files)")
+                        for file_name, content in folder_files.items():
+                            with st.expander(f"📄 {file_name}"):
+                                if file_name.endswith(".md"):
+                                    st.markdown(content)
+                                else:
+                                    st.code(content, language=code_language(file_name))
+                zip_download_button("📥 Download Everything (.zip)", auto_files, "AutoRoutedAutomation.zip", "dl_auto_suite")
+            
             # Combined Test Suite View
-            if st.session_state.generation_mode == "Combined Test Suite" and "combined" in st.session_state.automation_code:
+            elif st.session_state.generation_mode == "Combined Test Suite" and "combined" in st.session_state.automation_code:
                 st.markdown("### 🧩 Combined Test Suite")
                 
                 # Display automation code
@@ -3352,23 +3120,14 @@ elif page == "Test Automation":
                 
                 for file_name, content in st.session_state.automation_code["combined"].items():
                     with st.expander(f"📄 {file_name}"):
-                        st.code(content, language='java')
+                        if file_name.endswith(".md"):
+                            st.markdown(content)
+                        else:
+                            st.code(content, language=code_language(file_name))
                 
-                # Create a zip file for download
-                zip_buffer = BytesIO()
-                with zipfile.ZipFile(zip_buffer, 'a', zipfile.ZIP_DEFLATED, False) as zip_file:
-                    for file_name, content in st.session_state.automation_code["combined"].items():
-                        zip_file.writestr(file_name, content)
-                
-                zip_buffer.seek(0)
-                st.download_button(
-                    label="📥 Download Combined Test Suite (.zip)",
-                    data=zip_buffer,
-                    file_name="CombinedTestSuite.zip",
-                    mime="application/zip",
-                    use_container_width=True,
-                    key="dl_combined_suite"
-                )
+                # Zip file for download, built on request
+                zip_download_button("📥 Download Combined Test Suite (.zip)", st.session_state.automation_code["combined"],
+                                    "CombinedTestSuite.zip", "dl_combined_suite")
                 
                 # Display test cases in suite
                 st.markdown("### Test Cases in this Suite")
@@ -3385,6 +3144,35 @@ elif page == "Test Automation":
             
             # Separate Files View
             elif st.session_state.generation_mode == "Separate Test Classes":
+                # Shared framework layer, generated once for all selected test cases
+                framework_files = st.session_state.automation_code.get(generation.FRAMEWORK_KEY, {})
+                if framework_files:
+                    st.markdown("### 🧱 Project Skeleton & Shared Framework")
+                    st.caption("Maven/TestNG project files and base classes; every test case below builds on them and each download includes them.")
+                    for file_name, content in framework_files.items():
+                        with st.expander(f"📄 {file_name}"):
+                            if file_name.endswith(".md"):
+                                st.markdown(content)
+                            else:
+                                st.code(content, language=code_language(file_name))
+
+                def case_project_files(framework_files, case_files):
+                    """Skeleton + framework + one test case, with a testng.xml for just that case"""
+                    if not framework_files:
+                        return case_files
+                    project = {**framework_files, **case_files}
+                    project["testng.xml"] = build_testng_xml("rest_assured" if "REST Assured" in automation_framework else "selenium", project)
+                    return project
+
+                # One archive: skeleton + framework at the root, each test case in its own folder
+                generated_cases = [tc for tc in st.session_state.selected_test_cases if tc['id'] in st.session_state.automation_code]
+                if len(generated_cases) > 1:
+                    everything = dict(framework_files)
+                    for tc in generated_cases:
+                        everything.update({f"{tc['id']}/{file_name}": content for file_name, content in st.session_state.automation_code[tc['id']].items()})
+                    zip_download_button(f"📥 Download Everything ({len(generated_cases)} test cases, .zip)", everything,
+                                        "AutomationSuite.zip", "dl_all_cases")
+
                 # Tabs for each test case
                 tabs = st.tabs([f"Test Case: {tc['id']}" for tc in st.session_state.selected_test_cases])
                 
@@ -3411,21 +3199,10 @@ elif page == "Test Automation":
                                 with st.expander(f"📄 {file_name}"):
                                     st.code(content, language='java')
                             
-                            # Create a zip file for download
-                            zip_buffer = BytesIO()
-                            with zipfile.ZipFile(zip_buffer, 'a', zipfile.ZIP_DEFLATED, False) as zip_file:
-                                for file_name, content in st.session_state.automation_code[test_case['id']].items():
-                                    zip_file.writestr(file_name, content)
-                            
-                            zip_buffer.seek(0)
-                            st.download_button(
-                                label=f"📥 Download Code for {test_case['id']} (.zip)",
-                                data=zip_buffer,
-                                file_name=f"{test_case['id']}_automation.zip",
-                                mime="application/zip",
-                                use_container_width=True,
-                                key=f"dl_code_{test_case['id']}"
-                            )
+                            # Zip file for download, built on request
+                            zip_download_button(f"📥 Download Code for {test_case['id']} (.zip)",
+                                                case_project_files(framework_files, st.session_state.automation_code[test_case['id']]),
+                                                f"{test_case['id']}_automation.zip", f"dl_code_{test_case['id']}")
                         else:
                             st.info("Click 'Generate Automation Code' to create Java code")
         else:
@@ -3462,6 +3239,7 @@ elif page == "Test Plan Generator":
             type=['pdf', 'docx', 'txt', 'csv', 'xlsx'],
             key="test_plan_file"
         )
+        test_plan_extract_options = extraction_options_input(uploaded_req_file, key="test_plan_file")
         
         # Or manual input
         st.markdown("**Or enter requirements manually:**")
@@ -3558,102 +3336,45 @@ elif page == "Test Plan Generator":
     
     generate_btn_disabled = not (has_requirements and has_testers)
     
-    if st.button("🚀 Generate Test Plan", use_container_width=True, disabled=generate_btn_disabled, type="primary"):
-        with st.spinner("Generating comprehensive test plan... This may take a moment."):
-            try:
-                # Extract requirements content
-                requirements_content = requirements_text
-                
-                if uploaded_req_file:
-                    file_type = uploaded_req_file.type
-                    if file_type in FILE_PROCESSORS:
-                        requirements_content = FILE_PROCESSORS[file_type](uploaded_req_file)
-                    elif uploaded_req_file.name.endswith('.txt'):
-                        requirements_content = uploaded_req_file.read().decode('utf-8')
-                
-                # Build timeline string
-                timeline_str = "Not specified"
-                if start_date and end_date:
-                    timeline_str = f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}"
-                
-                # Build team string
-                team_str = "\n".join([
-                    f"{t['specialization']} Tester {idx+1}: {t['experience']} years of experience"
-                    for idx, t in enumerate(st.session_state.test_plan_testers)
-                ])
-                
-                # Build prompt
-                prompt = f"""You are an experienced QA Lead. Generate a comprehensive Test Plan based on the following requirements.
-
-REQUIREMENTS DOCUMENT:
-{requirements_content}
-
-EXECUTION TIMELINE:
-{timeline_str}
-
-TEST TEAM:
-{team_str}
-
-Please generate a detailed Test Plan in Markdown format that includes:
-
-1. **Test Plan Overview** - Brief introduction and purpose
-
-2. **Test Scope and Objectives** - What will be tested and goals
-
-3. **Test Strategy** - Overall approach and methodology
-
-4. **Test Environment Requirements** - Infrastructure and setup needs
-
-5. **Test Deliverables** - List of documents and artifacts
-
-6. **Resource Allocation** - Presented as a TABLE with columns:
-   - Tester Name/ID
-   - Years of Experience
-   - Specialization
-   - Assigned Tasks/Modules
-   - Estimated Effort
-   - Responsibilities
-
-7. **Task Allocation** - Presented as a TABLE with columns:
-   - Task ID
-   - Task Description
-   - Assigned Tester
-   - Priority
-   - Status
-   - Dependencies
-   - Estimated Duration
-
-8. **Test Schedule/Timeline** - Presented as a TABLE with columns:
-   - Phase/Milestone
-   - Start Date
-   - End Date
-   - Duration
-   - Responsible Tester
-   - Deliverables
-
-9. **Risk Assessment** - Presented as a TABLE with columns:
-   - Risk ID
-   - Risk Description
-   - Probability (High/Medium/Low)
-   - Impact (High/Medium/Low)
-   - Mitigation Strategy
-   - Owner
-
-10. **Entry and Exit Criteria** - Clear criteria for starting and completing testing
-
-IMPORTANT: Use proper Markdown formatting with tables, headers, and bullet points."""
-
-                # Add custom instructions if provided
-                if custom_instructions:
-                    prompt += f"\n\nADDITIONAL CUSTOM INSTRUCTIONS:\n{custom_instructions}"
-                
-                # Call AI API (auto-fallback between Gemini and OpenAI)
-                response_text = call_ai(prompt)
-                
-                st.session_state.generated_test_plan = response_text
-                
-            except Exception as e:
-                st.error(f"Error generating test plan: {str(e)}")
+    test_plan_job_id = st.session_state.get('test_plan_job_id')
+    test_plan_job_running = bool(test_plan_job_id) and not getattr(get_job_runner().get(test_plan_job_id), "finished", True)
+    
+    if st.button("🚀 Generate Test Plan", use_container_width=True, disabled=generate_btn_disabled or test_plan_job_running, type="primary"):
+        try:
+            # Extract requirements content
+            requirements_content = requirements_text
+            
+            if uploaded_req_file:
+                file_type = uploaded_req_file.type
+                if file_type in FILE_PROCESSORS:
+                    requirements_content = extract_uploaded_file(uploaded_req_file, test_plan_extract_options)
+                elif uploaded_req_file.name.endswith('.txt'):
+                    requirements_content = uploaded_req_file.read().decode('utf-8')
+            
+            # Build timeline string
+            timeline_str = "Not specified"
+            if start_date and end_date:
+                timeline_str = f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}"
+            
+            # Generate in the background (auto-fallback between providers)
+            st.session_state.test_plan_job_id = submit_job(
+                test_plan_job,
+                requirements_content,
+                timeline_str,
+                [dict(t) for t in st.session_state.test_plan_testers],
+                custom_instructions,
+                kind="test_plan",
+                label="Test plan",
+                params={"project": st.session_state.active_project}
+            )
+            st.rerun()
+        except Exception as e:
+            st.error(f"Error generating test plan: {str(e)}")
+    
+    if test_plan_job_running:
+        test_plan_job_state = get_job_runner().get(test_plan_job_id)
+        st.info("⏳ Generating comprehensive test plan in the background - you can keep working, it appears here when ready.")
+        st.progress(test_plan_job_state.progress, text=test_plan_job_state.message)
     
     # Display generated test plan
     if st.session_state.generated_test_plan:
@@ -3718,8 +3439,20 @@ elif page == "Bug Report Generator":
             height=300
         )
         
-        # Screenshot (Visual only for now, unless we verify vision model availability)
-        uploaded_screenshot = st.file_uploader("Upload Screenshot (Optional)", type=['png', 'jpg', 'jpeg'])
+        # Screenshots are downscaled and sent to the model with the notes
+        uploaded_screenshots = st.file_uploader("Upload Screenshots (Optional)", type=['png', 'jpg', 'jpeg', 'webp'], accept_multiple_files=True)
+        screenshots = []
+        if uploaded_screenshots:
+            screenshots = [process_for_vision(shot.getvalue(), shot.type) for shot in uploaded_screenshots]
+            shot_cols = st.columns(min(len(screenshots), 4))
+            for i, (shot, image) in enumerate(zip(uploaded_screenshots, screenshots)):
+                with shot_cols[i % 4]:
+                    st.image(image["data"], caption=shot.name, use_column_width=True)
+            if session_supports_vision():
+                st.caption(f"🖼️ Sent to the AI as {describe_savings(screenshots)}")
+            else:
+                st.warning(f"⚠️ {st.session_state.get('github_model', GITHUB_MODEL)} cannot read images - the report is written from your notes only. Pick a vision model (e.g. openai/gpt-4o) to include the screenshots.")
+                screenshots = []
 
         generate_btn = st.button("🚀 Generate Bug Report", use_container_width=True, disabled=not bug_description)
 
@@ -3730,55 +3463,11 @@ elif page == "Bug Report Generator":
             with st.spinner("Analyzing and formatting bug report..."):
                 try:
                     # Construct Prompt
-                    prompt = f"""
-                    Act as a Senior QA Engineer. Convert this unstructured bug description into a standard, professional Bug Report for JIRA/DevOps.
-                    
-                    CONTEXT:
-                    Environment: {env}
-                    Browser: {browser}
-                    Target Language: {report_lang}
-                    
-                    UNSTRUCTURED INPUT:
-                    {bug_description}
-                    
-                    INSTRUCTIONS:
-                    1. Create a clear, concise Title.
-                    2. Estimate Severity and Priority based on the context.
-                    3. Extract clear Steps to Reproduce.
-                    4. Clearly separate Expected and Actual results.
-                    5. Use professional technical language.
-                    6. LANGUAGE HANDLING:
-                       - If Target Language is English: TRANSLATE any non-English input (like Arabic) into professional English.
-                       - If Target Language is Arabic: Translate content to professional technical Arabic, keeping technical terms in English.
-                    
-                    OUTPUT FORMAT (Markdown):
-                    ### [Bug ID]: [Concise Title in Target Language]
-                    
-                    **Severity**: [Critical/High/Medium/Low] | **Priority**: [High/Medium/Low]
-                    
-                    **Description**:
-                    [Professional summary of the issue]
-                    
-                    **Preconditions**:
-                    [Any implied setup]
-                    
-                    **Steps to Reproduce**:
-                    1. [Step 1]
-                    2. [Step 2]
-                    ...
-                    
-                    **Actual Result**:
-                    [What happened]
-                    
-                    **Expected Result**:
-                    [What should have happened]
-                    
-                    **Environment details**:
-                    {env} | {browser}
-                    """
+                    prompt = generation.build_bug_report_prompt(bug_description, env, browser, report_lang, len(screenshots))
                     
-                    report = call_ai(prompt)
+                    report = call_ai(prompt, images=screenshots)
                     st.session_state.last_bug_report = report
+                    get_project_store().add_bug_report(st.session_state.active_project, report)
                     
                     # Increment counter
                     if 'bug_reports_count' not in st.session_state:
@@ -3896,7 +3585,7 @@ elif page == "AI Chat":
                      file_type = "text/markdown"
                 
                 if file_type in FILE_PROCESSORS:
-                    content = FILE_PROCESSORS[file_type](chat_context_file)
+                    content = extract_uploaded_file(chat_context_file, mime_type=file_type)
                     file_context = f"\n\n--- ATTACHED FILE: {chat_context_file.name} ---\n{content}\n-----------------------------\n"
                 elif file_type.startswith('text/'):
                      # Try treating as text
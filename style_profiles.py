@@ -0,0 +1,52 @@
+"""
+Content-hash cache for learned writing/coding styles.
+
+Learning a style sends every example file to the AI. The result only
+depends on the examples, so it is cached by a hash of their normalized
+contents and persisted in the project store; re-learning the same
+examples costs no API call. Cached styles can be named and reused as
+"style profiles" across sessions.
+"""
+import hashlib
+import unicodedata
+
+TEST_CASE_STYLE = "test_case_rules"       # learned_rules (Learn from Examples)
+REST_ASSURED_STYLE = "rest_assured_style"  # learned_rest_style (Learn from Scripts)
+
+# Bump when a learning prompt changes so previously cached styles are re-learned
+LEARNER_VERSION = 1
+
+
+def normalize_example(text):
+    """Normalize an example so formatting-only differences hash the same"""
+    text = unicodedata.normalize("NFC", text or "").lstrip("\ufeff")
+    lines = [line.rstrip() for line in text.replace("\r\n", "\n").replace("\r", "\n").split("\n")]
+    return "\n".join(lines).strip()
+
+
+def examples_hash(kind, example_contents):
+    """Order-independent hash of a set of examples for one style kind"""
+    file_hashes = sorted(
+        hashlib.sha256(normalize_example(content).encode("utf-8")).hexdigest()
+        for content in example_contents
+    )
+    digest = hashlib.sha256(f"{kind}:v{LEARNER_VERSION}".encode("utf-8"))
+    for file_hash in file_hashes:
+        digest.update(file_hash.encode("ascii"))
+    return digest.hexdigest()
+
+
+def learn_with_cache(store, kind, example_contents, learn_fn):
+    """
+    Return (rules, content_hash, from_cache).
+    learn_fn(example_contents) is only called on a cache miss; failed
+    learning (None) is not cached.
+    """
+    content_hash = examples_hash(kind, example_contents)
+    rules = store.get_learned_style(kind, content_hash)
+    if rules is not None:
+        return rules, content_hash, True
+    rules = learn_fn(example_contents)
+    if rules:
+        store.save_learned_style(kind, content_hash, rules)
+    return rules, content_hash, False
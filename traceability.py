@@ -0,0 +1,282 @@
+"""
+Requirements-to-test traceability.
+
+Requirements text is segmented into numbered items, then every test case
+is linked to the requirements it most likely covers by cosine similarity
+of embeddings. Embeddings come from sentence-transformers when it is
+available (falling back to a NumPy feature-hashing vectorizer), and the
+nearest-requirement search runs in batch through FAISS or NumPy.
+
+The index is incremental: test cases are fingerprinted, so only new or
+edited cases are embedded and searched, and changing the requirements
+re-links the cached case vectors without re-embedding them.
+"""
+import re
+import zlib
+import hashlib
+import threading
+
+import numpy as np
+
+from search_index import normalize_text
+
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+HASHING_DIM = 2048
+TOP_K = 3
+SEARCH_CHUNK = 1024
+
+# "REQ-12:", "FR 3.1 -", "1.2)", "3.", "- ", "* ", "• " and Markdown headings
+REQUIREMENT_MARKER = re.compile(
+    r"^\s*(?:"
+    r"(?P<label>(?:REQ|FR|NFR|BR|US|UC|SRS|AC)[-_ ]?\d+(?:\.\d+)*)\s*[:.)\-–]?"
+    r"|(?P<number>\d+(?:\.\d+)*)[.)]"
+    r"|(?P<bullet>[-*•])"
+    r"|(?P<heading>#{1,6})"
+    r")\s+(?P<text>\S.*)$",
+    re.IGNORECASE
+)
+SENTENCE_END = re.compile(r"(?<=[.!?؟])\s+")
+MIN_ITEM_WORDS = 3
+
+
+def segment_requirements(text):
+    """
+    Split requirements text into numbered items.
+    Returns [{"id": "REQ-001", "label": original numbering or "", "section": heading, "text": ...}]
+    """
+    items = []
+    section = ""
+    current = None
+    paragraphs = []
+    paragraph = []
+
+    for raw_line in (text or "").splitlines():
+        line = raw_line.strip()
+        match = REQUIREMENT_MARKER.match(line) if line else None
+        if match and match.group("heading"):
+            section = match.group("text").strip()
+            current = None
+            continue
+        if match:
+            current = {"label": match.group("label") or match.group("number") or "", "section": section,
+                       "text": match.group("text").strip()}
+            items.append(current)
+        elif not line:
+            current = None
+            if paragraph:
+                paragraphs.append((section, " ".join(paragraph)))
+                paragraph = []
+        elif current is not None:
+            # Continuation line of a numbered/bulleted requirement
+            current["text"] += " " + line
+        else:
+            paragraph.append(line)
+    if paragraph:
+        paragraphs.append((section, " ".join(paragraph)))
+
+    # Free-form documents: fall back to paragraphs, or sentences for a single block
+    if not items:
+        if len(paragraphs) == 1:
+            paragraphs = [(paragraphs[0][0], sentence) for sentence in SENTENCE_END.split(paragraphs[0][1])]
+        items = [{"label": "", "section": sec, "text": body} for sec, body in paragraphs]
+
+    items = [item for item in items if len(item["text"].split()) >= MIN_ITEM_WORDS]
+    for number, item in enumerate(items, start=1):
+        item["id"] = f"REQ-{number:03d}"
+    return items
+
+
+def test_case_text(test_case):
+    """Text used to embed a test case"""
+    return "\n".join([
+        test_case.get("title", ""),
+        *test_case.get("preconditions", []),
+        *test_case.get("test_steps", []),
+        *test_case.get("expected_results", []),
+    ])
+
+
+def _fingerprint(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class HashingEmbedder:
+    """Dependency-free embedder: signed feature hashing of normalized unigrams and bigrams"""
+    name = "hashing"
+    min_score = 0.2
+
+    def __init__(self, dim=HASHING_DIM):
+        self.dim = dim
+
+    def encode(self, texts):
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = normalize_text(text).split()
+            features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+            for feature in features:
+                h = zlib.crc32(feature.encode("utf-8"))
+                vectors[row, h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+        # Sublinear term frequency so repeated boilerplate words do not dominate
+        vectors = np.sign(vectors) * np.log1p(np.abs(vectors))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+
+class SentenceTransformerEmbedder:
+    """Semantic embeddings (multilingual-capable models can be set via EMBEDDING_MODEL)"""
+    name = "sentence-transformers"
+    min_score = 0.45
+
+    def __init__(self, model_name=EMBEDDING_MODEL):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name)
+
+    def encode(self, texts):
+        if not texts:
+            return np.zeros((0, self.model.get_sentence_embedding_dimension()), dtype=np.float32)
+        return self.model.encode(
+            list(texts), batch_size=64, normalize_embeddings=True, convert_to_numpy=True, show_progress_bar=False
+        ).astype(np.float32)
+
+
+_embedder = None
+_embedder_lock = threading.Lock()
+
+
+def get_embedder():
+    """Process-wide embedder; sentence-transformers if it can be loaded, hashing otherwise"""
+    global _embedder
+    with _embedder_lock:
+        if _embedder is None:
+            try:
+                _embedder = SentenceTransformerEmbedder()
+            except Exception:
+                _embedder = HashingEmbedder()
+        return _embedder
+
+
+class TraceabilityIndex:
+    """Incrementally maintained requirement <-> test case links"""
+
+    def __init__(self, embedder=None, top_k=TOP_K, min_score=None):
+        self.embedder = embedder or get_embedder()
+        self.top_k = top_k
+        self.min_score = self.embedder.min_score if min_score is None else min_score
+        self.requirements = []
+        self._req_vectors = None
+        self._req_search = None
+        self._req_cache = {}       # requirement text fingerprint -> vector
+        self._case_vectors = {}    # case id -> vector
+        self._case_prints = {}     # case id -> fingerprint of the embedded text
+        self.links = {}            # case id -> [(requirement index, score)]
+
+    # --- Requirements ---
+    def set_requirements(self, text):
+        """Replace the requirement set; cached case vectors are re-linked in one batch"""
+        self.requirements = segment_requirements(text)
+        prints = [_fingerprint(normalize_text(item["text"])) for item in self.requirements]
+        missing = [i for i, p in enumerate(prints) if p not in self._req_cache]
+        if missing:
+            vectors = self.embedder.encode([self.requirements[i]["text"] for i in missing])
+            for i, vector in zip(missing, vectors):
+                self._req_cache[prints[i]] = vector
+        self._req_vectors = np.vstack([self._req_cache[p] for p in prints]) if prints else None
+        self._req_search = self._build_search(self._req_vectors)
+        self.links = {}
+        if self._case_vectors:
+            case_ids = list(self._case_vectors)
+            self._link(case_ids, np.vstack([self._case_vectors[c] for c in case_ids]))
+        return len(self.requirements)
+
+    def _build_search(self, vectors):
+        if vectors is None:
+            return None
+        try:
+            import faiss
+            index = faiss.IndexFlatIP(vectors.shape[1])
+            index.add(np.ascontiguousarray(vectors, dtype=np.float32))
+            return index
+        except ImportError:
+            return None
+
+    def _nearest(self, query_vectors):
+        """Top-k (scores, requirement indices) for each query row"""
+        k = min(self.top_k, len(self.requirements))
+        if self._req_search is not None:
+            return self._req_search.search(np.ascontiguousarray(query_vectors, dtype=np.float32), k)
+        all_scores, all_indices = [], []
+        for start in range(0, len(query_vectors), SEARCH_CHUNK):
+            scores = query_vectors[start:start + SEARCH_CHUNK] @ self._req_vectors.T
+            indices = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            top = np.take_along_axis(scores, indices, axis=1)
+            order = np.argsort(-top, axis=1)
+            all_indices.append(np.take_along_axis(indices, order, axis=1))
+            all_scores.append(np.take_along_axis(top, order, axis=1))
+        return np.vstack(all_scores), np.vstack(all_indices)
+
+    def _link(self, case_ids, vectors):
+        if not self.requirements or not case_ids:
+            for case_id in case_ids:
+                self.links[case_id] = []
+            return
+        scores, indices = self._nearest(vectors)
+        for case_id, row_scores, row_indices in zip(case_ids, scores, indices):
+            self.links[case_id] = [
+                (int(i), float(s)) for s, i in zip(row_scores, row_indices) if i >= 0 and s >= self.min_score
+            ]
+
+    # --- Test cases ---
+    def update_cases(self, test_cases):
+        """
+        Sync with the current test cases; only new or edited cases are embedded.
+        Returns {"added": n, "updated": n, "removed": n}.
+        """
+        seen = set()
+        changed_ids, changed_texts = [], []
+        stats = {"added": 0, "updated": 0, "removed": 0}
+        for tc in test_cases:
+            case_id = tc.get("id", "")
+            seen.add(case_id)
+            text = test_case_text(tc)
+            fingerprint = _fingerprint(text)
+            if self._case_prints.get(case_id) == fingerprint:
+                continue
+            stats["updated" if case_id in self._case_prints else "added"] += 1
+            self._case_prints[case_id] = fingerprint
+            changed_ids.append(case_id)
+            changed_texts.append(text)
+
+        for case_id in [c for c in self._case_prints if c not in seen]:
+            del self._case_prints[case_id]
+            self._case_vectors.pop(case_id, None)
+            self.links.pop(case_id, None)
+            stats["removed"] += 1
+
+        if changed_ids:
+            vectors = self.embedder.encode(changed_texts)
+            for case_id, vector in zip(changed_ids, vectors):
+                self._case_vectors[case_id] = vector
+            self._link(changed_ids, vectors)
+        return stats
+
+    # --- Views ---
+    def coverage(self):
+        """Per requirement: (requirement, [(case id, score)]) sorted by score"""
+        covered = [[] for _ in self.requirements]
+        for case_id, links in self.links.items():
+            for req_index, score in links:
+                covered[req_index].append((case_id, score))
+        return [(req, sorted(cases, key=lambda c: -c[1])) for req, cases in zip(self.requirements, covered)]
+
+    def uncovered(self):
+        return [req for req, cases in self.coverage() if not cases]
+
+    def link_rows(self):
+        """Flat (requirement id, requirement, case id, score) rows for tables and CSV export"""
+        return [
+            {"Requirement ID": self.requirements[req_index]["id"], "Requirement": self.requirements[req_index]["text"],
+             "Test Case ID": case_id, "Score": round(score, 3)}
+            for case_id, links in self.links.items()
+            for req_index, score in links
+        ]
@@ -0,0 +1,317 @@
+"""
+Test type classifier used to route test cases to Selenium, REST Assured or
+unit specifications.
+
+Text is normalized like the search index (case and Arabic spelling variants)
+and a whole batch is scanned with one compiled alternation of every surface
+form of weighted English and Arabic keywords (plurals, Arabic with the
+definite article), longest phrase first, matched on word boundaries - so
+"get" no longer matches "target" nor "ui" "build". classify_test_types scores
+the batch into one numpy matrix; classify_test_type scores a single case
+without numpy.
+
+Run `python type_classifier.py [COPIES]` for accuracy on the labeled examples
+and a throughput comparison with the substring matcher it replaced.
+"""
+import re
+import time
+
+import numpy as np
+
+from search_index import ARABIC_CHAR_MAP, ARABIC_DIACRITICS, ARABIC_TATWEEL
+
+TEST_TYPES = ("api", "unit_spec", "ui")  # also the tie-break order
+DEFAULT_TYPE = "ui"
+TITLE_WEIGHT = 1.5  # a keyword in the title counts more than one in the steps
+MIXED_MIN_SCORE = 4.0  # UI and API both at least this strong (and close) -> "mixed"
+MIXED_RATIO = 0.75
+
+# keyword -> weight; multi-word phrases are matched as such. English nouns also match their plural.
+KEYWORDS = {
+    "api": {
+        "api": 3, "endpoint": 3, "status code": 3, "payload": 2.5, "json": 2, "xml": 1, "http": 2, "https": 1,
+        "rest": 1.5, "graphql": 3, "request": 1.5, "response": 1.5, "header": 1.5, "bearer": 2, "token": 1,
+        "webhook": 2.5, "swagger": 3, "postman": 3, "query parameter": 2, "request body": 3, "response body": 3,
+        "201": 1, "400": 1, "401": 1, "404": 1, "500": 1,
+        # Arabic
+        "واجهه برمجه": 3, "واجهه برمجيه": 3, "نقطه نهايه": 3, "طلب": 1.5, "استجابه": 2, "رمز حاله": 3,
+        "حموله": 2.5, "خادم": 1, "ترويسه": 1.5,
+    },
+    "unit_spec": {
+        "function": 2, "method": 1.5, "class": 1.5, "unit test": 3, "unit": 1.5, "module": 1, "service": 1,
+        "repository": 2, "controller": 1, "calculate": 1.5, "calculation": 1.5, "parse": 1.5, "parser": 1.5,
+        "return": 1.5, "returns": 1.5, "return value": 2.5, "mock": 2, "stub": 2, "exception": 1.5, "throws": 2,
+        "null": 1, "algorithm": 2, "utility": 1.5, "helper": 1, "constructor": 2, "argument": 1.5,
+        "validate": 0.5, "component": 0.5,
+        # Arabic
+        "داله": 2, "وظيفه": 1, "اختبار وحده": 3, "وحده": 1, "فئه": 1, "صنف": 1.5, "طريقه": 1, "حساب": 1,
+        "احسب": 1.5, "تحليل": 1, "قيمه مرجعه": 2.5, "ترجع": 1.5, "استثناء": 1.5, "خوارزميه": 2,
+    },
+    "ui": {
+        "click": 2, "navigate": 2, "button": 2, "page": 1.5, "screen": 1.5, "form": 1.5, "field": 1.5,
+        "dropdown": 2, "checkbox": 2, "radio button": 2, "input": 1, "login": 1, "log in": 1, "submit": 1.5,
+        "display": 1, "displayed": 1, "browser": 2, "link": 1, "menu": 1.5, "tab": 1, "modal": 2, "popup": 2,
+        "dialog": 1.5, "scroll": 2, "ui": 2, "enter": 1, "select": 1, "hover": 2, "tooltip": 2, "toast": 1.5,
+        "textbox": 2, "label": 1, "icon": 1.5, "homepage": 2, "dashboard": 1, "upload": 0.5, "type": 0.5,
+        # Arabic
+        "انقر": 2, "اضغط": 2, "نقر": 2, "زر": 2, "صفحه": 1.5, "شاشه": 1.5, "نموذج": 1.5, "حقل": 1.5,
+        "قائمه منسدله": 2, "قائمه": 1, "تسجيل دخول": 1, "ادخل": 1, "اختر": 1, "متصفح": 2, "رابط": 1,
+        "نافذه": 1.5, "عرض": 0.5, "ايقونه": 1.5, "مربع اختيار": 2,
+    },
+}
+
+# "GET /orders", "POST https://..." - case-sensitive, on the raw text
+HTTP_CALL_PATTERN = re.compile(r"\b(?:GET|POST|PUT|PATCH|DELETE|HEAD|OPTIONS)\s+(?:/|https?:)")
+HTTP_CALL_WEIGHT = 4
+
+TOKEN_PATTERN = re.compile(r"\w+")
+ARABIC_LETTERS = re.compile(r"[\u0600-\u06FF]")
+# Definite article and its proclitic forms (ال، وال، بال، كال، فال، لل) a keyword word may carry
+ARABIC_ARTICLES = ("ال", "وال", "بال", "كال", "فال", "لل")
+
+
+def normalize(text):
+    """Case and Arabic spelling variants, as in the search index"""
+    return ARABIC_DIACRITICS.sub("", text).replace(ARABIC_TATWEEL, "").translate(ARABIC_CHAR_MAP).casefold()
+
+
+def _word_forms(word):
+    """Surface forms of a keyword word: Arabic with the article, English plurals"""
+    if ARABIC_LETTERS.match(word):
+        return [word] + [article + word for article in ARABIC_ARTICLES]
+    return [word, word + "s", word + "es"]
+
+
+def _trie_pattern(phrases):
+    """
+    Regex for a set of phrases (tuples of words) as a character trie, so the engine follows one
+    branch per character instead of trying every alternative; word gaps are PHRASE_GAP
+    """
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for char in " ".join(phrase):
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node):
+        ends = "" in node
+        branches = [(PHRASE_GAP if char == " " else re.escape(char)) + build(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if ends else body
+
+    return build(trie)
+
+
+def _compile(keywords):
+    """
+    Keyword tables for one regex scan: the pattern (every surface form of every keyword),
+    {surface form, words joined by a space: key index} and the weight matrix (keys x TEST_TYPES).
+    """
+    weights = {}
+    for column, test_type in enumerate(TEST_TYPES):
+        for keyword, weight in keywords[test_type].items():
+            vector = weights.setdefault(tuple(normalize(keyword).split()), [0.0] * len(TEST_TYPES))
+            vector[column] = max(vector[column], weight)
+    keys = sorted(weights, key=lambda key: (-len(key), key))
+    words = {word for key in keys for word in key}
+    forms = {word: word for word in words}  # a keyword word is never read as another word's form
+    for word in words:
+        for form in _word_forms(word):
+            forms.setdefault(form, word)
+    by_word = {}
+    for form, word in forms.items():
+        by_word.setdefault(word, []).append(form)
+    surfaces = {}
+    for index, key in enumerate(keys):
+        # Every combination of the surface forms of the phrase's words
+        combinations = [()]
+        for word in key:
+            combinations = [combination + (form,) for combination in combinations for form in by_word[word]]
+        for combination in combinations:
+            surfaces.setdefault(" ".join(combination), index)
+    pattern = re.compile(r"(?<!\w)" + _trie_pattern(word.split() for word in surfaces) + r"(?!\w)")
+    return pattern, surfaces, np.array([weights[key] for key in keys])
+
+
+SEGMENT_SEPARATOR = "\x1f"
+# Between the words of a phrase: what separates tokens, but never a SEGMENT_SEPARATOR
+PHRASE_GAP = r"[^\w\x1f]+"
+KEYWORD_PATTERN, KEYWORD_SURFACES, KEYWORD_WEIGHTS = _compile(KEYWORDS)
+KEYWORD_VECTORS = KEYWORD_WEIGHTS.tolist()
+
+
+def _join(value):
+    if isinstance(value, (list, tuple)):
+        return "\n".join(map(str, value))
+    return str(value or "")
+
+
+def _case_texts(test_case):
+    """(title, body) raw texts; body covers steps, expected results and test data"""
+    get = test_case.get
+    body = f"{_join(get('test_steps'))}\n{_join(get('expected_results'))}\n{_join(get('test_data'))}"
+    return str(get('title') or ''), body
+
+
+def _normalize_segment(text):
+    # Arabic normalization only where needed (str.translate is the costly step)
+    return text.lower() if text.isascii() else normalize(text)
+
+
+def _keyword_matches(text):
+    """(offset, key index) of every keyword in normalized text, one regex scan"""
+    surfaces = KEYWORD_SURFACES
+    matches = []
+    for match in KEYWORD_PATTERN.finditer(text):
+        found = match.group()
+        # Phrases written with other separators ("status-code") map through their words
+        key = surfaces.get(found)
+        matches.append((match.start(), key if key is not None else surfaces[" ".join(TOKEN_PATTERN.findall(found))]))
+    return matches
+
+
+def score_test_cases(test_cases):
+    """Score matrix (cases x TEST_TYPES): one regex scan over the joined batch, one numpy accumulation"""
+    segments = [text for test_case in test_cases for text in _case_texts(test_case)]
+    joined = SEGMENT_SEPARATOR.join(segments)
+    # Segment start offsets in the joined texts (one separator character between segments)
+    starts = np.cumsum([0] + [len(segment) + 1 for segment in segments[:-1]])
+    if joined.isascii():
+        normalized, normalized_starts = joined.lower(), starts
+    else:
+        # Arabic normalization changes lengths, so it goes segment by segment (and only where needed)
+        parts = [_normalize_segment(segment) for segment in segments]
+        normalized = SEGMENT_SEPARATOR.join(parts)
+        normalized_starts = np.cumsum([0] + [len(part) + 1 for part in parts[:-1]])
+
+    scores = np.zeros((len(test_cases), len(TEST_TYPES)))
+    matches = _keyword_matches(normalized)
+    if matches:
+        offsets, keys = zip(*matches)
+        segment_ids = np.searchsorted(normalized_starts, offsets, side="right") - 1
+        factors = np.where(segment_ids % 2, 1.0, TITLE_WEIGHT)
+        np.add.at(scores, segment_ids // 2, KEYWORD_WEIGHTS[list(keys)] * factors[:, None])
+    calls = [match.start() for match in HTTP_CALL_PATTERN.finditer(joined)]
+    if calls:
+        np.add.at(scores[:, TEST_TYPES.index("api")], (np.searchsorted(starts, calls, side="right") - 1) // 2, HTTP_CALL_WEIGHT)
+    return scores
+
+
+def _decide(scores):
+    """Test type of one case from its TEST_TYPES scores"""
+    api, ui = scores[TEST_TYPES.index("api")], scores[TEST_TYPES.index("ui")]
+    if min(api, ui) >= MIXED_MIN_SCORE and min(api, ui) >= MIXED_RATIO * max(api, ui):
+        return "mixed"
+    best = max(scores)
+    return TEST_TYPES[scores.index(best)] if best > 0 else DEFAULT_TYPE  # first maximum -> TEST_TYPES order breaks ties
+
+
+def classify_test_types(test_cases):
+    """'ui', 'api', 'unit_spec' or 'mixed' for each test case (batch)"""
+    if not test_cases:
+        return []
+    return [_decide(row) for row in score_test_cases(test_cases).tolist()]
+
+
+def classify_test_type(test_case):
+    """One test case, scored in plain Python (no numpy round-trip)"""
+    scores = [0.0] * len(TEST_TYPES)
+    for text, weight in zip(_case_texts(test_case), (TITLE_WEIGHT, 1.0)):
+        for _, key in _keyword_matches(_normalize_segment(text)):
+            for column, value in enumerate(KEYWORD_VECTORS[key]):
+                scores[column] += value * weight
+        scores[TEST_TYPES.index("api")] += HTTP_CALL_WEIGHT * len(HTTP_CALL_PATTERN.findall(text))
+    return _decide(scores)
+
+
+# --- Labeled examples and benchmark ---
+# (title, steps, expected type): typical generator output plus the substring matcher's false positives
+LABELED_EXAMPLES = [
+    ("Login with valid credentials", ["Navigate to the login page", "Enter username and password", "Click the Login button"], "ui"),
+    ("Forgot password link", ["Open the login page", "Click 'Forgot password'", "Verify the reset form is displayed"], "ui"),
+    ("Add item to cart", ["Open a product page", "Select size from the dropdown", "Click Add to cart"], "ui"),
+    ("Target audience banner", ["Open the homepage", "Verify the banner for the target audience is displayed"], "ui"),
+    ("Build number in footer", ["Scroll to the footer", "Check the build number text"], "ui"),
+    ("Search suggestions", ["Type 'sho' in the search box", "Verify suggestions appear under the field"], "ui"),
+    ("Checkout address form", ["Fill in the shipping form", "Leave postcode empty", "Submit the form"], "ui"),
+    ("Sort products by price", ["Open category page", "Choose 'Price: low to high'", "Verify order of items"], "ui"),
+    ("Dark mode toggle", ["Open settings", "Switch the dark mode toggle", "Verify colours change on every screen"], "ui"),
+    ("Session timeout dialog", ["Stay idle for 15 minutes", "Verify the timeout dialog is shown"], "ui"),
+    ("Upload profile picture", ["Open profile", "Upload a JPG image", "Verify the avatar icon is updated"], "ui"),
+    ("Pagination on orders page", ["Open My Orders", "Click page 2", "Verify 10 orders per page"], "ui"),
+    ("Tooltip on disabled button", ["Hover over the disabled Save button", "Verify the tooltip text"], "ui"),
+    ("Get a budget widget report", ["Open dashboard", "Click the budget widget", "Verify chart is displayed"], "ui"),
+    ("Create order via API", ["Send POST /api/orders with a valid payload", "Check the response"], "api"),
+    ("Get user by id", ["Send GET /users/42", "Verify status code 200", "Verify JSON body contains the email"], "api"),
+    ("Unauthorized request", ["Call the endpoint without a bearer token"], "api"),
+    ("Delete product", ["DELETE /products/7 with admin token", "Verify 204 and that GET returns 404"], "api"),
+    ("Invalid payload rejected", ["Submit request body with missing required fields", "Verify 400 response"], "api"),
+    ("Rate limiting", ["Send 100 requests within a minute to the search endpoint", "Verify 429 response header Retry-After"], "api"),
+    ("Webhook retry", ["Configure webhook URL", "Return 500 from the receiver", "Verify webhook is retried"], "api"),
+    ("Pagination parameters", ["Call GET /orders?page=2&size=10", "Verify response contains 10 items"], "api"),
+    ("GraphQL product query", ["Send a GraphQL query for product fields", "Verify the response data"], "api"),
+    ("Update profile via PUT", ["PUT /profile with new phone number", "Verify status code 200 and updated JSON"], "api"),
+    ("Calculate order total", ["Call calculateTotal() with 3 items and a discount", "Verify the returned value"], "unit_spec"),
+    ("Parse date strings", ["Pass '2024-02-30' to the date parser", "Verify it throws an exception"], "unit_spec"),
+    ("Password strength function", ["Call the function with 'abc'", "Verify it returns WEAK"], "unit_spec"),
+    ("Repository saves entity", ["Mock the database", "Call repository.save(user)", "Verify the insert is executed once"], "unit_spec"),
+    ("Discount service edge case", ["Invoke the service method with a null coupon", "Verify no exception and zero discount"], "unit_spec"),
+    ("Tax calculation rounding", ["Calculate tax for 10.005", "Verify the helper rounds half up"], "unit_spec"),
+    ("Email validator utility", ["Pass an address without '@' to the validator utility", "Verify it returns false"], "unit_spec"),
+    ("Sorting algorithm stability", ["Sort records with equal keys", "Verify the algorithm keeps their order"], "unit_spec"),
+    ("تسجيل الدخول ببيانات صحيحة", ["افتح صفحة تسجيل الدخول", "أدخل اسم المستخدم وكلمة المرور", "اضغط على زر الدخول"], "ui"),
+    ("إضافة منتج إلى السلة", ["افتح صفحة المنتج", "اختر المقاس من القائمة المنسدلة", "انقر على زر الإضافة"], "ui"),
+    ("رسالة خطأ في النموذج", ["اترك حقل البريد فارغاً", "اضغط إرسال", "تحقق من ظهور الرسالة على الشاشة"], "ui"),
+    ("إنشاء طلب عبر واجهة برمجة التطبيقات", ["أرسل POST /api/orders مع حمولة صحيحة", "تحقق من رمز الحالة 201"], "api"),
+    ("جلب المستخدم", ["أرسل طلب GET /users/5", "تحقق من أن الاستجابة تحتوي على البريد"], "api"),
+    ("رفض الطلب بدون رمز", ["استدعاء نقطة النهاية بدون ترويسة التفويض", "تحقق من رمز الحالة 401"], "api"),
+    ("دالة حساب الخصم", ["استدعاء الدالة بقيمة 100 وخصم 10%", "تحقق من أن القيمة المرجعة 90"], "unit_spec"),
+    ("تحليل التاريخ", ["مرر نصاً غير صالح إلى دالة التحليل", "تحقق من رمي استثناء"], "unit_spec"),
+]
+
+
+def _substring_test_type(test_case):
+    """The substring matcher classify_test_type replaced (kept for the benchmark)"""
+    text = (test_case.get('title', '') + ' ' + ' '.join(test_case.get('test_steps', []))).lower()
+    if any(w in text for w in ['api', 'endpoint', 'request', 'response', 'json', 'rest', 'http', 'post', 'get', 'put', 'delete', 'status code', 'payload']):
+        return 'api'
+    if any(w in text for w in ['function', 'method', 'class', 'unit', 'component', 'module', 'service', 'repository', 'controller', 'calculate', 'validate', 'parse']):
+        return 'unit_spec'
+    return 'ui'
+
+
+def labeled_test_cases():
+    return [{"title": title, "test_steps": steps, "expected_results": []} for title, steps, _ in LABELED_EXAMPLES]
+
+
+def accuracy(predicted):
+    labels = [label for _, _, label in LABELED_EXAMPLES]
+    # "mixed" is routed like UI
+    hits = sum(p == label or (p == "mixed" and label == "ui") for p, label in zip(predicted, labels))
+    return hits / len(labels)
+
+
+def bench(copies=100):
+    cases = labeled_test_cases()
+    print(f"Accuracy on {len(cases)} labeled examples: "
+          f"classifier {accuracy(classify_test_types(cases)):.0%}, substring {accuracy([_substring_test_type(tc) for tc in cases]):.0%}")
+    for tc, (title, _, label), predicted in zip(cases, LABELED_EXAMPLES, classify_test_types(cases)):
+        if predicted != label and not (predicted == "mixed" and label == "ui"):
+            print(f"  miss: {title!r} -> {predicted} (expected {label})")
+    bulk = cases * copies
+    for name, run in (("substring", lambda: [_substring_test_type(tc) for tc in bulk]),
+                      ("classifier, one by one", lambda: [classify_test_type(tc) for tc in bulk]),
+                      ("classifier, batch", lambda: classify_test_types(bulk))):
+        started = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - started
+        print(f"{name:>24}: {len(bulk)} cases in {elapsed * 1000:.0f} ms ({len(bulk) / elapsed:,.0f}/s)")
+
+
+if __name__ == "__main__":
+    import sys
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 100)